@@ -0,0 +1,110 @@
+"""Fixtures for the benchmarks of the overhead of pytask-julia.
+
+The benchmarks do not need Julia. A fake ``julia`` which only creates the product of the
+task is put on the PATH so that only the costs of the plugin are measured.
+
+The largest size takes minutes and only runs with ``--large``.
+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytask import build
+from pytask import mark
+
+SIZES = [100, 10_000, pytest.param(100_000, marks=pytest.mark.large)]
+"""list: The numbers of tasks for which the costs of the plugin are measured."""
+
+# The fake julia finds the product in the serialized arguments and creates it.
+_FAKE_JULIA = """#!/bin/sh
+for last; do :; done
+product=$(sed -n 's/.*"produces": *"\\([^"]*\\)".*/\\1/p' "$last")
+if [ -n "$product" ]; then : > "$product"; fi
+"""
+
+
+needs_posix_shell = pytest.mark.skipif(
+    sys.platform == "win32", reason="Uses a shell script as a fake julia."
+)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--large", action="store_true", help="Run the benchmarks with the largest size."
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "large: Benchmarks which take minutes.")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--large"):
+        return
+    skip = pytest.mark.skip(reason="Needs --large to run.")
+    for item in items:
+        if "large" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fake_julia(tmp_path_factory):
+    """Put a fake julia executable on the PATH which only creates the product."""
+    path = tmp_path_factory.mktemp("bin").joinpath("julia")
+    path.write_text(_FAKE_JULIA)
+    path.chmod(0o755)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("PATH", f"{path.parent}{os.pathsep}{os.environ['PATH']}")
+        yield
+
+
+@pytest.fixture(scope="session")
+def session(tmp_path_factory):
+    """A session which is configured like for a build and provides the hooks."""
+    return build(paths=tmp_path_factory.mktemp("empty"))
+
+
+def create_task_functions(n_tasks: int) -> list[Any]:
+    """Create functions of Julia tasks with one dependency and one product each.
+
+    The functions are created anew for every round because the collection removes the
+    marks from the functions.
+
+    """
+    functions = []
+    for i in range(n_tasks):
+
+        def task_example(produces: Path = Path(f"out_{i}.csv"), i: int = i) -> None:
+            pass
+
+        functions.append(mark.julia(script=Path("script.jl"))(task_example))
+    return functions
+
+
+def create_task_module(path: Path, n_tasks: int) -> Path:
+    """Create a task module with a repeated Julia task and its script."""
+    path.joinpath("script.jl").touch()
+    source = f"""
+    import pytask
+    from pathlib import Path
+    from pytask import task
+
+    for i in range({n_tasks}):
+
+        @task(id=str(i))
+        @pytask.mark.julia(script=Path("script.jl"))
+        def task_example(produces=Path(f"out_{{i}}.csv"), i=i):
+            pass
+    """
+    task_module = path.joinpath("task_example.py")
+    task_module.write_text(textwrap.dedent(source))
+    return task_module
@@ -0,0 +1,320 @@
+"""Measure the latency and throughput of Julia tasks end to end with a real Julia.
+
+The harness runs pytask on generated projects for every combination of a workload and
+an execution configuration and reports
+
+- the time to the first task, the seconds from starting pytask until the first task
+  finished.
+- the throughput, the number of tasks finished per minute.
+
+The first repetition of every combination is reported as cold and the median of the
+remaining repetitions as warm. Run it with
+
+.. code-block:: console
+
+    $ just benchmark-latency --n-tasks 20 --repetitions 3
+
+The packages of the workloads are installed into ``benchmarks/environment`` on the first
+run. The results are written to ``latency.json`` and ``latency.md``.
+
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import click
+
+import pytask_julia
+
+ENVIRONMENT: Path = Path(__file__).parent / "environment"
+"""Path: The Julia project with the packages of the workloads."""
+
+_READ_CONFIG = "import JSON; config = JSON.parse(read(ARGS[1], String))"
+
+WORKLOADS: dict[str, str] = {
+    # A raw string keeps the escaped quotes of the Julia regex.
+    "trivial": r"""
+    product = match(r"\"produces\": *\"([^\"]+)\"", read(ARGS[1], String))[1]
+    write(product, string(time()))
+    """,
+    "json": f"""
+    {_READ_CONFIG}
+    write(config["produces"], string(time()))
+    """,
+    "dataframes": f"""
+    {_READ_CONFIG}
+    using CSV, DataFrames
+    df = DataFrame(a = 1:1_000, b = rand(1_000))
+    CSV.write(IOBuffer(), combine(groupby(df, :a), :b => sum))
+    write(config["produces"], string(time()))
+    """,
+}
+"""dict[str, str]: Julia scripts of the workloads which write the time when they end."""
+
+
+@dataclass(frozen=True)
+class Configuration:
+    """An execution configuration of pytask-julia."""
+
+    options: tuple[str, ...] = ()
+    project_in_mark: bool = False
+    n_workers: int = 1
+
+
+CONFIGURATIONS: dict[str, Configuration] = {
+    "subprocess": Configuration(),
+    "options": Configuration(options=("--startup-file=no", "--compile=min")),
+    "project-per-task": Configuration(project_in_mark=True),
+    "parallel-2": Configuration(n_workers=2),
+    "parallel-4": Configuration(n_workers=4),
+}
+"""dict[str, Configuration]: The execution configurations which are compared."""
+
+
+@dataclass
+class Measurement:
+    """The measurement of one run of pytask."""
+
+    workload: str
+    configuration: str
+    repetition: int
+    n_tasks: int
+    wall_time: float
+    time_to_first_task: float
+    throughput: float
+
+
+def create_project(
+    path: Path, workload: str, configuration: Configuration, n_tasks: int
+) -> None:
+    """Create a project with repeated tasks of a workload."""
+    project = repr(ENVIRONMENT.as_posix())
+    mark_kwargs = f", project={project}" if configuration.project_in_mark else ""
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+    from pytask import task
+
+    for i in range({n_tasks}):
+
+        @task(id=str(i))
+        @pytask.mark.julia(script=Path("script.jl"){mark_kwargs})
+        def task_workload(produces=Path(f"out_{{i}}.txt")):
+            pass
+    """
+    path.joinpath("task_workload.py").write_text(textwrap.dedent(task_source))
+    path.joinpath("script.jl").write_text(textwrap.dedent(WORKLOADS[workload]))
+
+    config = ["[tool.pytask.ini_options]"]
+    if not configuration.project_in_mark:
+        config.append(f"julia_project = {project}")
+    if configuration.options:
+        config.append(f"julia_options = {json.dumps(list(configuration.options))}")
+    path.joinpath("pyproject.toml").write_text("\n".join(config) + "\n")
+
+
+def run_pytask(
+    workload: str, name: str, configuration: Configuration, n_tasks: int
+) -> tuple[float, list[float]]:
+    """Run pytask on a fresh project and return the start and the ends of tasks."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder)
+        create_project(path, workload, configuration, n_tasks)
+        cmd = [sys.executable, "-m", "pytask", path.as_posix()]
+        if configuration.n_workers > 1:
+            cmd += ["-n", str(configuration.n_workers)]
+
+        start = time.time()
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)  # noqa: S603
+        if result.returncode != 0:
+            msg = f"Running {workload!r} with {name!r} failed.\n\n{result.stdout}"
+            raise RuntimeError(msg)
+
+        ends = sorted(
+            float(path.joinpath(f"out_{i}.txt").read_text()) for i in range(n_tasks)
+        )
+    return start, ends
+
+
+def measure(
+    workload: str,
+    name: str,
+    configuration: Configuration,
+    n_tasks: int,
+    repetition: int,
+) -> Measurement:
+    """Measure one run of pytask."""
+    start, ends = run_pytask(workload, name, configuration, n_tasks)
+    wall_time = ends[-1] - start
+    return Measurement(
+        workload=workload,
+        configuration=name,
+        repetition=repetition,
+        n_tasks=n_tasks,
+        wall_time=wall_time,
+        time_to_first_task=ends[0] - start,
+        throughput=n_tasks / wall_time * 60,
+    )
+
+
+def summarize(measurements: list[Measurement]) -> list[dict[str, Any]]:
+    """Summarize the cold and warm runs of every workload and configuration."""
+    groups: dict[tuple[str, str], list[Measurement]] = {}
+    for measurement in measurements:
+        key = (measurement.workload, measurement.configuration)
+        groups.setdefault(key, []).append(measurement)
+
+    summary = []
+    for (workload, configuration), group in groups.items():
+        cold, *warm = sorted(group, key=lambda m: m.repetition)
+        summary.append(
+            {
+                "workload": workload,
+                "configuration": configuration,
+                "cold_time_to_first_task": cold.time_to_first_task,
+                "warm_time_to_first_task": statistics.median(
+                    m.time_to_first_task for m in warm
+                )
+                if warm
+                else None,
+                "cold_throughput": cold.throughput,
+                "warm_throughput": statistics.median(m.throughput for m in warm)
+                if warm
+                else None,
+            }
+        )
+    return summary
+
+
+def format_markdown(metadata: dict[str, Any], summary: list[dict[str, Any]]) -> str:
+    """Format the summary as a markdown report."""
+
+    def _format(value: float | None, unit: str) -> str:
+        return "-" if value is None else f"{value:.2f} {unit}"
+
+    lines = [
+        "# Latency of Julia tasks",
+        "",
+        *(f"- {key}: {value}" for key, value in metadata.items()),
+        "",
+        (
+            "| Workload | Configuration | Time to first task (cold / warm) "
+            "| Throughput (cold / warm) |"
+        ),
+        "| --- | --- | --- | --- |",
+    ]
+    lines.extend(
+        f"| {row['workload']} | {row['configuration']} "
+        f"| {_format(row['cold_time_to_first_task'], 's')} / "
+        f"{_format(row['warm_time_to_first_task'], 's')} "
+        f"| {_format(row['cold_throughput'], 'tasks/min')} / "
+        f"{_format(row['warm_throughput'], 'tasks/min')} |"
+        for row in summary
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _get_julia_version() -> str:
+    result = subprocess.run(
+        ["julia", "--version"],  # noqa: S607
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+@click.command()
+@click.option("--n-tasks", default=20, show_default=True, help="Tasks per run.")
+@click.option(
+    "--repetitions", default=3, show_default=True, help="Runs per combination."
+)
+@click.option(
+    "--workload",
+    "workloads",
+    multiple=True,
+    type=click.Choice(list(WORKLOADS)),
+    help="Workloads to run. Defaults to all.",
+)
+@click.option(
+    "--configuration",
+    "configurations",
+    multiple=True,
+    type=click.Choice(list(CONFIGURATIONS)),
+    help="Configurations to run. Defaults to all.",
+)
+@click.option(
+    "--output",
+    type=click.Path(path_type=Path),
+    default=Path("latency"),
+    show_default=True,
+    help="Path of the reports without the suffix.",
+)
+def main(
+    n_tasks: int,
+    repetitions: int,
+    workloads: tuple[str, ...],
+    configurations: tuple[str, ...],
+    output: Path,
+) -> None:
+    """Measure the latency and throughput of Julia tasks."""
+    subprocess.run(  # noqa: S603
+        [  # noqa: S607
+            "julia",
+            f"--project={ENVIRONMENT.as_posix()}",
+            "--eval",
+            "import Pkg; Pkg.instantiate()",
+        ],
+        check=True,
+    )
+
+    measurements = []
+    for workload in workloads or WORKLOADS:
+        for name in configurations or CONFIGURATIONS:
+            for repetition in range(repetitions):
+                measurement = measure(
+                    workload, name, CONFIGURATIONS[name], n_tasks, repetition
+                )
+                click.echo(
+                    f"{workload} {name} #{repetition}: "
+                    f"{measurement.time_to_first_task:.2f}s to first task, "
+                    f"{measurement.throughput:.1f} tasks/min"
+                )
+                measurements.append(measurement)
+
+    metadata = {
+        "julia": _get_julia_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pytask-julia": pytask_julia.__version__,
+        "n_tasks": n_tasks,
+        "repetitions": repetitions,
+    }
+    summary = summarize(measurements)
+    output.with_suffix(".json").write_text(
+        json.dumps(
+            {
+                "metadata": metadata,
+                "summary": summary,
+                "measurements": [asdict(m) for m in measurements],
+            },
+            indent=2,
+        )
+    )
+    output.with_suffix(".md").write_text(format_markdown(metadata, summary))
+
+
+if __name__ == "__main__":
+    main()
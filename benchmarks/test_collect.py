@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+from pytask import Mark
+
+from benchmarks.conftest import SIZES
+from benchmarks.conftest import create_task_functions
+from pytask_julia.collect import pytask_collect_task
+from pytask_julia.shared import parse_julia_mark
+from pytask_julia.tables import collect_task_table
+
+
+@pytest.mark.parametrize("n_tasks", SIZES)
+def test_collect_task(benchmark, session, tmp_path, n_tasks):
+    path = tmp_path.joinpath("task_example.py")
+
+    def collect(functions):
+        for function in functions:
+            pytask_collect_task(session, path, "task_example", function)
+
+    benchmark.pedantic(
+        collect, setup=lambda: ((create_task_functions(n_tasks),), {}), rounds=3
+    )
+
+
+@pytest.mark.parametrize("n_tasks", SIZES)
+def test_parse_julia_mark(benchmark, n_tasks):
+    marks = [
+        Mark("julia", (), {"script": f"script_{i}.jl", "project": "environment"})
+        for i in range(n_tasks)
+    ]
+
+    def parse():
+        for mark in marks:
+            parse_julia_mark(mark, ["--threads=2"], "json", ".json", None)
+
+    benchmark.pedantic(parse, rounds=3)
+
+
+@pytest.mark.parametrize("n_tasks", SIZES)
+def test_collect_task_table(benchmark, session, tmp_path, n_tasks):
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("parameters.csv").write_text(
+        "id,alpha\n" + "".join(f"{i},{i / n_tasks}\n" for i in range(n_tasks))
+    )
+    path = tmp_path.joinpath("task_sweep.toml")
+    path.write_text(
+        'script = "script.jl"\nparameters = "parameters.csv"\n\n'
+        '[produces]\nresult = "out_{id}.csv"\n'
+    )
+
+    benchmark.pedantic(collect_task_table, args=(session, path), rounds=3)
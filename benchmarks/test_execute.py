@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import shutil
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+
+from benchmarks.conftest import SIZES
+from benchmarks.conftest import create_task_functions
+from benchmarks.conftest import create_task_module
+from benchmarks.conftest import needs_posix_shell
+from pytask_julia.collect import pytask_collect_task
+from pytask_julia.execute import collect_keyword_arguments
+from pytask_julia.execute import pytask_execute_task_setup
+from pytask_julia.serialization import SERIALIZERS
+
+
+@pytest.fixture(scope="module")
+def collected_tasks(session, tmp_path_factory):
+    """Collect tasks once per size and share them between the benchmarks."""
+    path = tmp_path_factory.mktemp("tasks").joinpath("task_example.py")
+    cache = {}
+
+    def _collected_tasks(n_tasks):
+        if n_tasks not in cache:
+            cache[n_tasks] = [
+                pytask_collect_task(session, path, "task_example", function)
+                for function in create_task_functions(n_tasks)
+            ]
+        return cache[n_tasks]
+
+    return _collected_tasks
+
+
+@pytest.mark.parametrize("n_tasks", SIZES)
+def test_collect_keyword_arguments(benchmark, collected_tasks, n_tasks):
+    tasks = collected_tasks(n_tasks)
+
+    def collect():
+        for task in tasks:
+            collect_keyword_arguments(task)
+
+    benchmark.pedantic(collect, rounds=3)
+
+
+@pytest.mark.parametrize("serializer", list(SERIALIZERS))
+@pytest.mark.parametrize("n_tasks", SIZES)
+def test_serializer(benchmark, collected_tasks, serializer, n_tasks):
+    all_kwargs = [collect_keyword_arguments(task) for task in collected_tasks(n_tasks)]
+    serialize = SERIALIZERS[serializer]["serializer"]
+
+    def run():
+        for kwargs in all_kwargs:
+            serialize(kwargs)
+
+    benchmark.pedantic(run, rounds=3)
+
+
+@needs_posix_shell
+@pytest.mark.parametrize("n_tasks", SIZES)
+def test_execute_task_setup(benchmark, session, collected_tasks, n_tasks):
+    """Measure the costs of the setup which touches the file system for every task."""
+    tasks = collected_tasks(n_tasks)
+
+    def setup():
+        for task in tasks:
+            pytask_execute_task_setup(session, task)
+
+    def remove_serialized():
+        path = tasks[0].depends_on["_serialized"].value.parent
+        shutil.rmtree(path, ignore_errors=True)
+        return (), {}
+
+    benchmark.pedantic(setup, setup=remove_serialized, rounds=3)
+
+
+@needs_posix_shell
+@pytest.mark.parametrize("n_tasks", [100])
+def test_build(benchmark, tmp_path, n_tasks):
+    """Measure a whole build where the fake julia exits immediately.
+
+    The size is small because the build is dominated by starting a process per task.
+
+    """
+    create_task_module(tmp_path, n_tasks)
+
+    def run():
+        session = build(paths=tmp_path, force=True)
+        assert session.exit_code == ExitCode.OK
+
+    benchmark.pedantic(run, rounds=3)
@@ -2,6 +2,14 @@
 
 from __future__ import annotations
 
+# pytask loads the plugin of this package through its entry point when it is imported.
+# It must be imported before any module of this package, or the plugin imports modules
+# which are still initialized.
+import pytask  # noqa: F401
+
+from pytask_julia.arrow import ArrowNode
+from pytask_julia.nodes import JuliaObjectNode
+
 try:
     from ._version import version as __version__  # ty: ignore[unresolved-import]
 except ImportError:  # pragma: no cover
@@ -10,4 +18,4 @@ except ImportError:  # pragma: no cover
     __version__ = "unknown"
 
 
-__all__ = ["__version__"]
+__all__ = ["ArrowNode", "JuliaObjectNode", "__version__"]
@@ -0,0 +1,223 @@
+"""Contains code to pin parallel Julia tasks to disjoint sets of cores.
+
+On machines with multiple sockets, Julia processes which are executed in parallel
+migrate between the sockets and lose memory bandwidth. With ``julia_cores_per_task``,
+the available cores of every NUMA node are split into sets of this size, and every Julia
+process runs pinned to a set which no other running process uses. The number of threads
+of the process is set to the number of its cores.
+
+Like the writable depots in :mod:`pytask_julia.depots`, the sets are slots which are
+locked while a process uses them, so that the main process and the workers of
+pytask-parallel coordinate without communicating. If all sets are in use, the next task
+waits until one is released.
+
+Pinning is only available on platforms with :func:`os.sched_setaffinity` like Linux.
+Elsewhere, tasks are executed without pinning.
+
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytask_julia.shared import get_path_to_temporary_folder
+from pytask_julia.shared import try_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = [
+    "acquire_cores",
+    "add_threads_option",
+    "format_cpu_list",
+    "get_numa_nodes",
+    "parse_cpu_list",
+    "pin_command",
+    "pin_process",
+    "split_into_core_sets",
+]
+
+_NUMA_ROOT: Path = Path("/sys/devices/system/node")
+"""Path: The folder where Linux describes the NUMA nodes of the machine."""
+
+_POLL_INTERVAL: float = 0.1
+"""float: Seconds between two attempts to acquire a set of cores if all are used."""
+
+
+def parse_cpu_list(value: str) -> list[int]:
+    """Parse a list of CPUs like ``"0-3,8,10-11"`` as used by Linux."""
+    cpus: list[int] = []
+    for part in value.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def format_cpu_list(cpus: list[int]) -> str:
+    """Format CPUs as a list with ranges like ``"0-3,8"``."""
+    parts = []
+    for _, group in itertools.groupby(enumerate(sorted(cpus)), lambda x: x[1] - x[0]):
+        values = [cpu for _, cpu in group]
+        first, last = values[0], values[-1]
+        parts.append(str(first) if first == last else f"{first}-{last}")
+    return ",".join(parts)
+
+
+def get_numa_nodes(root: Path = _NUMA_ROOT) -> list[list[int]]:
+    """Get the available CPUs per NUMA node.
+
+    Only CPUs on which the current process may run are returned. If the machine does not
+    describe its NUMA nodes, all available CPUs belong to a single node.
+
+    """
+    available = os.sched_getaffinity(0)
+    nodes = [
+        sorted(set(parse_cpu_list(path.read_text())) & available)
+        for path in sorted(
+            root.glob("node*/cpulist"), key=lambda p: int(p.parent.name[4:])
+        )
+    ]
+    nodes = [node for node in nodes if node]
+    return nodes or [sorted(available)]
+
+
+def split_into_core_sets(nodes: list[list[int]], n_cores: int) -> list[list[int]]:
+    """Split the CPUs of every NUMA node into sets of ``n_cores``.
+
+    Sets never span two nodes. Remaining CPUs of a node are not used, unless the node
+    has fewer CPUs than ``n_cores`` and becomes a single, smaller set.
+
+    """
+    sets = []
+    for cpus in nodes:
+        node_sets = [
+            cpus[i : i + n_cores] for i in range(0, len(cpus) - n_cores + 1, n_cores)
+        ]
+        sets.extend(node_sets or [cpus])
+    return sets
+
+
+def get_path_to_cores() -> Path:
+    """Get the folder with the locks of the sets of cores.
+
+    The locks are private to the user, so processes of other users cannot block cores.
+
+    """
+    return get_path_to_temporary_folder() / "cores"
+
+
+@contextmanager
+def acquire_cores(
+    n_cores: int, nodes: list[list[int]] | None = None
+) -> Generator[list[int] | None, None, None]:
+    """Acquire a set of cores which no other Julia process uses at the same time.
+
+    Yields ``None`` if the platform does not support pinning processes to cores.
+
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        yield None
+        return
+
+    sets = split_into_core_sets(nodes or get_numa_nodes(), n_cores)
+    root = get_path_to_cores()
+    root.mkdir(parents=True, exist_ok=True)
+    while True:
+        for cores in sets:
+            lock = root.joinpath(f"cores-{format_cpu_list(cores)}.lock").open("ab")
+            if try_lock(lock):
+                break
+            lock.close()
+        else:
+            time.sleep(_POLL_INTERVAL)
+            continue
+        break
+
+    try:
+        yield cores
+    finally:
+        lock.close()
+
+
+_OPTIONS_WITH_VALUE: tuple[str, ...] = (
+    "-t",
+    "--threads",
+    "-p",
+    "--procs",
+    "-e",
+    "--eval",
+    "-E",
+    "--print",
+    "-L",
+    "--load",
+    "-J",
+    "--sysimage",
+    "-C",
+    "--cpu-target",
+    "-m",
+    "--module",
+    "--machine-file",
+)
+"""tuple[str, ...]: Options of Julia whose value may follow as a separate argument."""
+
+
+def _get_julia_options(args: list[str]) -> list[str]:
+    """Get the options of Julia in front of the script and its arguments.
+
+    Julia stops parsing options at ``--`` or at the first argument which is neither an
+    option nor the value of the option before it.
+
+    """
+    options: list[str] = []
+    expects_value = False
+    for arg in args:
+        if arg == "--" or not (expects_value or arg.startswith("-")):
+            break
+        options.append(arg)
+        expects_value = not expects_value and arg in _OPTIONS_WITH_VALUE
+    return options
+
+
+def add_threads_option(cmd: list[str], n_threads: int) -> list[str]:
+    """Add ``--threads`` to the command unless the options already set the threads."""
+    executable, *rest = cmd
+    if any(
+        option.startswith(("-t", "--threads")) for option in _get_julia_options(rest)
+    ):
+        return cmd
+    return [executable, f"--threads={n_threads}", *rest]
+
+
+def pin_command(cmd: list[str], cores: list[int]) -> list[str]:
+    """Start the command with taskset so that the process is pinned from the start.
+
+    Julia starts threads while it initializes, which are only pinned if the affinity is
+    set before. Without taskset, the command is returned as it is, and the process has
+    to be pinned after it started.
+
+    """
+    taskset = shutil.which("taskset")
+    if taskset is None:
+        return cmd
+    return [taskset, "--cpu-list", format_cpu_list(cores), *cmd]
+
+
+def pin_process(pid: int, cores: list[int] | None) -> None:
+    """Pin a started process to the cores unless they are ``None``.
+
+    The command should be started with :func:`pin_command` as well, since threads which
+    Julia started before are not pinned.
+
+    """
+    if cores is not None:
+        with suppress(ProcessLookupError):
+            os.sched_setaffinity(pid, cores)
@@ -0,0 +1,147 @@
+"""Contains code to exchange tables between Julia and Python in the Arrow IPC format.
+
+Julia scripts write products declared with :class:`ArrowNode` with Arrow.jl. Python
+tasks receive them as memory-mapped :class:`pyarrow.Table` objects, so nothing is copied
+and only the pages of columns which are accessed are read from disk.
+
+pyarrow is an optional dependency which is only needed to load, save and check tables
+in Python.
+
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import PathNode
+from pytask import PTask
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+__all__ = ["ArrowNode", "check_schema", "read_table", "write_table"]
+
+
+@dataclass(kw_only=True)
+class ArrowNode(PathNode):
+    """A node for a table in the Arrow IPC format.
+
+    Julia scripts receive the path and the schema of the table as a dictionary like
+    ``{"path": "...", "schema": {"a": "int64"}}`` in the serialized arguments. Python
+    tasks receive a memory-mapped :class:`pyarrow.Table`.
+
+    Attributes
+    ----------
+    name
+        Name of the node which makes it identifiable in the DAG.
+    path
+        The path to the table.
+    schema
+        An optional mapping from column names to Arrow types like ``"int64"``,
+        ``"double"`` or ``"string"``. Produced tables are checked against it if pyarrow
+        is installed.
+
+    """
+
+    schema: dict[str, str] | None = None
+
+    def load(self, is_product: bool = False) -> Any:  # noqa: FBT001, FBT002
+        """Load the table or the path if the node is a product."""
+        if is_product:
+            return self.path
+        return read_table(str(self.path))
+
+    def save(self, value: Any) -> None:
+        """Save a table which pyarrow can convert."""
+        write_table(str(self.path), value)
+
+
+def _import_pyarrow() -> ModuleType:
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.ipc  # noqa: PLC0415
+    except ImportError:
+        msg = "pyarrow is needed to load and save tables of an 'ArrowNode'."
+        raise ImportError(msg) from None
+    return pa
+
+
+def read_table(path: str | Path) -> Any:
+    """Read an Arrow IPC file or stream as a memory-mapped table."""
+    pa = _import_pyarrow()
+    source = pa.memory_map(str(path))
+    try:
+        return pa.ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        # Arrow.jl writes streams with ``Arrow.write(path, table; file = false)``.
+        source.seek(0)
+        return pa.ipc.open_stream(source).read_all()
+
+
+def _read_schema(path: str | Path) -> Any:
+    """Read only the schema of an Arrow IPC file or stream."""
+    pa = _import_pyarrow()
+    with pa.memory_map(str(path)) as source:
+        try:
+            return pa.ipc.open_file(source).schema
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source).schema
+
+
+def write_table(path: str | Path, table: Any) -> None:
+    """Write a table as an Arrow IPC file."""
+    pa = _import_pyarrow()
+    table = pa.table(table)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as f:
+        f.write_table(table)
+
+
+def check_schema(path: Path, schema: dict[str, str]) -> list[str]:
+    """Check the columns of a table against a schema and return the problems.
+
+    Only the schema of the file is read. Columns which are not in the schema are
+    allowed.
+
+    """
+    pa = _import_pyarrow()
+    actual = _read_schema(path)
+    problems = []
+    for name, alias in schema.items():
+        expected = pa.type_for_alias(alias)
+        index = actual.get_field_index(name)
+        if index == -1:
+            problems.append(f"The column {name!r} is missing.")
+        elif actual.field(index).type != expected:
+            problems.append(
+                f"The column {name!r} has type {actual.field(index).type}, but "
+                f"{expected} is expected."
+            )
+    return problems
+
+
+@hookimpl(trylast=True)
+def pytask_execute_task_teardown(task: PTask) -> None:
+    """Check the schemas of Arrow tables produced by a task."""
+    if importlib.util.find_spec("pyarrow") is None:
+        return
+
+    for node in tree_leaves(task.produces):  # ty: ignore[invalid-argument-type]
+        if (
+            isinstance(node, ArrowNode)
+            and node.schema
+            and isinstance(node.path, Path)
+            and node.path.exists()
+        ):
+            problems = check_schema(node.path, node.schema)
+            if problems:
+                msg = f"The table {node.path} does not match its schema.\n\n" + (
+                    "\n".join(f"- {problem}" for problem in problems)
+                )
+                raise ValueError(msg)
@@ -0,0 +1,49 @@
+"""Extend the build command."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import click
+from pytask import hookimpl
+
+
+@hookimpl
+def pytask_extend_command_line_interface(cli: click.Group) -> None:
+    """Extend the command line interface."""
+    additional_parameters = [
+        click.Option(
+            ["--julia-profile"],
+            is_flag=True,
+            default=False,
+            help=(
+                "Run Julia scripts under Julia's sampling profiler and write a profile "
+                "of folded stacks per task."
+            ),
+        ),
+        click.Option(
+            ["--julia-metrics"],
+            is_flag=True,
+            default=False,
+            help=(
+                "Record the compilation time, garbage collection and allocations of "
+                "Julia scripts and report tasks dominated by compilation or GC."
+            ),
+        ),
+        click.Option(
+            ["--julia-track-allocation"],
+            is_flag=True,
+            default=False,
+            help="Run Julia scripts with '--track-allocation=user'.",
+        ),
+        click.Option(
+            ["--julia-trace"],
+            type=click.Path(dir_okay=False, path_type=Path),
+            default=None,
+            help=(
+                "Write spans of the phases of Julia tasks to a file in the JSON "
+                "encoding of OpenTelemetry."
+            ),
+        ),
+    ]
+    cli.commands["build"].params.extend(additional_parameters)
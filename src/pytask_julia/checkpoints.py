@@ -0,0 +1,81 @@
+"""Contains code to provide Julia tasks with directories for checkpoints.
+
+With ``julia_checkpoints``, every Julia task receives the path to a directory under
+``_checkpoint`` in the serialized arguments. A long-running script saves its progress
+there and, when it is executed again after it was killed or failed, it continues from
+the last checkpoint.
+
+The directory is kept while a task fails. It is deleted when the task succeeds, and it
+is replaced by an empty directory when the task or its dependencies change, since
+checkpoints computed from other inputs are invalid.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import shutil
+from typing import TYPE_CHECKING
+
+from pytask import ExecutionReport
+from pytask import PTask
+from pytask import Session
+from pytask import TaskOutcome
+from pytask import has_mark
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ["get_path_to_checkpoints", "prepare_checkpoint"]
+
+
+def get_path_to_checkpoints(root: Path, task: PTask) -> Path:
+    """Get the folder which holds the checkpoint directories of a task."""
+    return root / ".pytask" / "pytask-julia" / "checkpoints" / task.signature[:32]
+
+
+def _hash_inputs(task: PTask) -> str:
+    """Hash the states of a task and its dependencies."""
+    states = [
+        f"{node.name}={node.state()}"
+        for node in tree_leaves(task.depends_on)  # ty: ignore[invalid-argument-type]
+        if hasattr(node, "state")
+    ]
+    states.append(f"{task.name}={task.state()}")
+    return hashlib.sha256("\n".join(sorted(states)).encode()).hexdigest()[:32]
+
+
+def prepare_checkpoint(root: Path, task: PTask) -> Path:
+    """Create the checkpoint directory of a task and remove outdated ones."""
+    folder = get_path_to_checkpoints(root, task)
+    path = folder / _hash_inputs(task)
+    if folder.exists():
+        for other in folder.iterdir():
+            if other != path:
+                shutil.rmtree(other, ignore_errors=True)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@hookimpl
+def pytask_execute_task_process_report(
+    session: Session, report: ExecutionReport
+) -> None:
+    """Delete the checkpoints of a Julia task which succeeded.
+
+    The report is only final after the teardown, which checks the products of the task.
+    A task whose script succeeded but which did not create its products keeps its
+    checkpoints.
+
+    """
+    task = report.task
+    if (
+        session.config["julia_checkpoints"]
+        and has_mark(task, "julia")
+        and report.outcome == TaskOutcome.SUCCESS
+    ):
+        shutil.rmtree(
+            get_path_to_checkpoints(session.config["root"], task), ignore_errors=True
+        )
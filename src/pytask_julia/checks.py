@@ -0,0 +1,202 @@
+"""Contains code to check Julia scripts before any task is executed.
+
+All scripts are parsed in a single Julia process after the collection so that a typo
+in a script fails the build before upstream tasks spent hours on their work.
+Optionally, the packages which scripts load with ``using`` or ``import`` are looked up
+in the projects of the tasks.
+
+Scripts without problems are remembered with a hash of their content in a cache, and
+they are only checked again after they changed.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytask import PathNode
+from pytask import PythonNode
+from pytask import has_mark
+from pytask import hookimpl
+
+from pytask_julia.executable import get_julia_version
+from pytask_julia.executable import resolve_executable
+from pytask_julia.shared import JULIA_FOLDER
+from pytask_julia.shared import create_environment
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pytask import PTask
+    from pytask import Session
+
+__all__ = ["ScriptCheck", "check_scripts", "get_path_to_cache"]
+
+
+_CHECKER: Path = JULIA_FOLDER / "check.jl"
+"""Path: The Julia script which checks other scripts."""
+
+_PROJECT_FILES: tuple[str, ...] = ("Project.toml", "Manifest.toml")
+"""tuple[str, ...]: Files of a project which determine the available packages."""
+
+
+@dataclass(frozen=True)
+class ScriptCheck:
+    """A script which is checked in the environment of a project."""
+
+    path: Path
+    project: str = ""
+    check_packages: bool = False
+
+    @property
+    def id_(self) -> str:
+        """The identifier of the check in the cache."""
+        return f"{self.path.as_posix()}\t{self.project}"
+
+    def compute_key(self, julia_version: str) -> str:
+        """Compute a key which changes whenever the result of the check might change.
+
+        If packages are checked, the key includes the files of the project.
+
+        """
+        hash_ = hashlib.sha256(self.path.read_bytes())
+        hash_.update(f"\0{julia_version}".encode())
+        hash_.update(b"\0packages" if self.check_packages else b"\0syntax")
+        if self.check_packages and self.project:
+            project = Path(self.project)
+            paths = (
+                [project]
+                if project.is_file()
+                else [project / name for name in _PROJECT_FILES]
+            )
+            for path in paths:
+                if path.exists():
+                    hash_.update(b"\0" + path.read_bytes())
+        return hash_.hexdigest()
+
+
+def get_path_to_cache(root: Path) -> Path:
+    """Get the path to the cache of checked scripts."""
+    return root / ".pytask" / "pytask-julia" / "checks.json"
+
+
+def check_scripts(
+    scripts: Iterable[ScriptCheck], path_to_cache: Path, executable: str = "julia"
+) -> dict[ScriptCheck, str]:
+    """Check scripts and return the problems per script.
+
+    Only scripts which changed since they were checked successfully with the same
+    version of Julia are passed to Julia.
+
+    """
+    cache = _read_cache(path_to_cache)
+    julia_version = get_julia_version(executable)
+    keys = {script: script.compute_key(julia_version) for script in scripts}
+    unchecked = [script for script, key in keys.items() if cache.get(script.id_) != key]
+    if not unchecked:
+        return {}
+
+    problems = _run_checker(unchecked, executable)
+    for script in unchecked:
+        if script.id_ not in problems:
+            cache[script.id_] = keys[script]
+    path_to_cache.parent.mkdir(parents=True, exist_ok=True)
+    path_to_cache.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    return {
+        script: problems[script.id_] for script in unchecked if script.id_ in problems
+    }
+
+
+def _read_cache(path: Path) -> dict[str, str]:
+    try:
+        cache = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _run_checker(scripts: list[ScriptCheck], executable: str) -> dict[str, str]:
+    """Check all scripts in one Julia process."""
+    with tempfile.TemporaryDirectory() as folder:
+        path_to_scripts = Path(folder, "scripts.txt")
+        path_to_results = Path(folder, "results.txt")
+        path_to_scripts.write_text(
+            "".join(
+                f"{script.path}\t{script.project}\t{int(script.check_packages)}\n"
+                for script in scripts
+            )
+        )
+        cmd = [
+            executable,
+            "--startup-file=no",
+            str(_CHECKER),
+            str(path_to_scripts),
+            str(path_to_results),
+        ]
+        result = subprocess.run(  # noqa: S603
+            cmd, env=create_environment(), capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            msg = f"Checking the Julia scripts failed.\n\n{result.stderr}"
+            raise RuntimeError(msg)
+        fields = path_to_results.read_text().split("\0")[:-1]
+
+    return {
+        ScriptCheck(Path(path), project).id_: problem
+        for path, project, problem in zip(
+            fields[::3], fields[1::3], fields[2::3], strict=True
+        )
+    }
+
+
+def _get_script_check(task: PTask, check_packages: bool) -> ScriptCheck | None:  # noqa: FBT001
+    script_node = task.depends_on.get("_script")
+    project_node = task.depends_on.get("_project")
+    if not (
+        isinstance(script_node, PathNode)
+        and isinstance(script_node.path, Path)
+        and script_node.path.exists()
+    ):
+        return None
+    project = project_node.load() if isinstance(project_node, PythonNode) else []
+    return ScriptCheck(
+        path=script_node.path,
+        project=project[0].removeprefix("--project=") if project else "",
+        check_packages=check_packages,
+    )
+
+
+@hookimpl
+def pytask_collect_modify_tasks(session: Session, tasks: list[PTask]) -> None:
+    """Check the scripts of all Julia tasks."""
+    __tracebackhide__ = True
+
+    check_packages = session.config["julia_check_packages"]
+    if not (session.config["julia_check_syntax"] or check_packages):
+        return
+
+    scripts = {
+        script
+        for task in tasks
+        if has_mark(task, "julia")
+        and (script := _get_script_check(task, check_packages)) is not None
+    }
+    if not scripts:
+        return
+    problems = check_scripts(
+        sorted(scripts, key=lambda script: script.id_),
+        get_path_to_cache(session.config["root"]),
+        resolve_executable(session.config["julia_executable"]),
+    )
+    if problems:
+        formatted = "\n\n".join(
+            f"{script.path}:\n{problem}" for script, problem in problems.items()
+        )
+        msg = f"Some Julia scripts have problems.\n\n{formatted}"
+        raise ValueError(msg)
@@ -0,0 +1,292 @@
+"""Contains code to reuse checksums of products computed by Julia.
+
+pytask determines the state of a file by its SHA-256 hash which it caches by path and
+modification time. For large products, reading the files again in Python after Julia
+wrote them takes a lot of time.
+
+With ``julia_checksums``, the runner computes the hashes of the products right after a
+script finished while the files are likely still in the page cache, and writes them to a
+small file next to the serialized arguments. The hashes are put into pytask's cache
+before pytask determines the states of the products, so the files are not read again.
+
+The hashes are verified lazily in a background thread during the build, once pytask
+stored the states of the task. If a hash is wrong, the cache receives the correct one,
+and the affected tasks are executed again in the next run.
+
+pytask has no public interface to its cache of hashes. All access to the internals of
+pytask is confined to :func:`_get_cache_key` and :func:`_is_cache_supported`. If the
+internals change, checksums are turned off with a warning, and pytask hashes the
+products itself.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import queue
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import ExecutionReport
+from pytask import PathNode
+from pytask import PTask
+from pytask import PythonNode
+from pytask import Session
+from pytask import console
+from pytask import has_mark
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+
+try:
+    from _pytask.cache import _make_memoize_key
+    from _pytask.path import HashPathCache
+    from _pytask.path import hash_path
+except ImportError:  # pragma: no cover
+    _HAS_CACHE = False
+else:
+    _HAS_CACHE = True
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = [
+    "get_hashed_products",
+    "get_path_to_checksums",
+    "get_path_to_products",
+    "read_checksums",
+    "use_checksums",
+]
+
+_TOLERANCE: float = 1e-6
+"""float: Seconds by which modification times seen by Julia and Python may differ."""
+
+_CHUNK_SIZE: int = 1024 * 1024
+"""int: Number of bytes which are read at once to verify a checksum."""
+
+
+def get_path_to_products(path_to_serialized: Path) -> Path:
+    """Get the path to the list of products which are hashed by Julia."""
+    return path_to_serialized.with_suffix(".products")
+
+
+def get_path_to_checksums(path_to_serialized: Path) -> Path:
+    """Get the path to the checksums of products computed by Julia."""
+    return path_to_serialized.with_suffix(".checksums")
+
+
+def get_hashed_products(task: PTask) -> list[Path]:
+    """Get the paths of products whose state is the hash of the file."""
+    return [
+        node.path
+        for node in tree_leaves(task.produces)  # ty: ignore[invalid-argument-type]
+        if isinstance(node, PathNode)
+        and isinstance(node.path, Path)
+        and type(node).state is PathNode.state
+    ]
+
+
+@dataclass(frozen=True)
+class Checksum:
+    """The checksum of a product computed by Julia."""
+
+    index: int
+    size: int
+    modification_time: float
+    digest: str
+
+
+def read_checksums(path: Path) -> list[Checksum]:
+    """Read the checksums written by the runner."""
+    checksums = []
+    for line in path.read_text().splitlines():
+        index, size, modification_time, digest = line.split("\t")
+        checksums.append(
+            Checksum(int(index), int(size), float(modification_time), digest)
+        )
+    return checksums
+
+
+def _get_cache_key(path: Path, modification_time: float) -> str:
+    """Get the key of a hash in the cache of :func:`_pytask.path.hash_path`."""
+    return _make_memoize_key(
+        (path, modification_time),
+        {},
+        typed=False,
+        argspec=inspect.getfullargspec(hash_path.__wrapped__),
+        prefix=f"{hash_path.__module__}.{hash_path.__name__}:",
+    )
+
+
+def _is_cache_supported() -> bool:
+    """Check whether hashes can be put into the cache of pytask.
+
+    The cache is an internal of pytask. Only versions of pytask are supported in which
+    :func:`_pytask.path.hash_path` is memoized by ``HashPathCache`` and which compute
+    the keys of the cache like :func:`_get_cache_key`.
+
+    """
+    if not _HAS_CACHE:
+        return False
+    if getattr(hash_path, "cache", None) is not HashPathCache or not hasattr(
+        hash_path, "__wrapped__"
+    ):
+        return False
+    try:
+        _get_cache_key(Path("product"), 0.0)
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
+@dataclass
+class ChecksumVerifier:
+    """Verify checksums of products in a background thread."""
+
+    mismatches: list[Path] = field(default_factory=list)
+    _queue: queue.Queue[tuple[Path, float, str] | None] = field(
+        default_factory=queue.Queue
+    )
+    _thread: threading.Thread | None = None
+
+    def add(self, path: Path, modification_time: float, digest: str) -> None:
+        """Add a checksum to verify."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._queue.put((path, modification_time, digest))
+
+    def finish(self) -> None:
+        """Wait until all checksums are verified."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            path, modification_time, digest = item
+            actual = _compute_digest(path)
+            if actual != digest:
+                if actual is not None:
+                    HashPathCache.add(_get_cache_key(path, modification_time), actual)
+                self.mismatches.append(path)
+
+
+def _compute_digest(path: Path) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def use_checksums(
+    task: PTask, path_to_checksums: Path
+) -> list[tuple[Path, float, str]]:
+    """Put checksums computed by Julia into the cache of pytask.
+
+    A checksum is only used if the size and the modification time of the file are still
+    the same as when Julia computed it.
+
+    Returns
+    -------
+    list[tuple[Path, float, str]]
+        The paths, modification times and hashes of the used checksums.
+
+    """
+    products = get_hashed_products(task)
+    used = []
+    for checksum in read_checksums(path_to_checksums):
+        path = products[checksum.index]
+        stat = path.stat()
+        if (
+            stat.st_size == checksum.size
+            and abs(stat.st_mtime - checksum.modification_time) < _TOLERANCE
+        ):
+            HashPathCache.add(_get_cache_key(path, stat.st_mtime), checksum.digest)
+            used.append((path, stat.st_mtime, checksum.digest))
+    return used
+
+
+@hookimpl
+def pytask_post_parse(config: dict[str, Any]) -> None:
+    """Turn off checksums if the cache of pytask is not supported."""
+    if config["julia_checksums"] and not _is_cache_supported():
+        config["julia_checksums"] = False
+        console.print(
+            "[warning]'julia_checksums' is turned off since this version of pytask "
+            "stores hashes of files differently. pytask hashes the products itself.[/]"
+        )
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build(session: Session) -> Generator[None, None, None]:
+    """Verify the checksums computed by Julia during the build."""
+    if not session.config["julia_checksums"]:
+        return (yield)
+
+    verifier = session.config["_julia_checksum_verifier"] = ChecksumVerifier()
+    try:
+        return (yield)
+    finally:
+        verifier.finish()
+        session.config.pop("_julia_checksum_verifier")
+        if verifier.mismatches:
+            paths = "\n".join(f"- {path}" for path in verifier.mismatches)
+            console.print(
+                "[warning]The checksums computed by Julia for some products are wrong. "
+                f"Their tasks are executed again in the next run.[/]\n\n{paths}"
+            )
+
+
+@hookimpl(trylast=True)
+def pytask_execute_task_teardown(session: Session, task: PTask) -> None:
+    """Use checksums computed by Julia before pytask determines states of products."""
+    if not session.config["julia_checksums"] or not has_mark(task, "julia"):
+        return
+
+    serialized_node = task.depends_on.get("_serialized")
+    if not isinstance(serialized_node, PythonNode) or not isinstance(
+        serialized_node.value, Path
+    ):
+        return
+
+    path = get_path_to_checksums(serialized_node.value)
+    if not path.exists():
+        return
+
+    used = use_checksums(task, path)
+    path.unlink()
+    verifier = session.config.get("_julia_checksum_verifier")
+    if verifier is not None and used:
+        session.config.setdefault("_julia_checksums_to_verify", {})[task.signature] = (
+            used
+        )
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_task_process_report(
+    session: Session, report: ExecutionReport
+) -> Generator[bool | None, None, bool | None]:
+    """Verify checksums once pytask stored the states of the task.
+
+    If the checksums were verified earlier, a wrong hash might be corrected before
+    pytask stores it, and a mismatch would not cause the task to be executed again.
+
+    """
+    result = yield
+    to_verify = session.config.get("_julia_checksums_to_verify", {})
+    used = to_verify.pop(report.task.signature, [])
+    verifier = session.config.get("_julia_checksum_verifier")
+    if verifier is not None:
+        for product, modification_time, digest in used:
+            verifier.add(product, modification_time, digest)
+    return result
@@ -0,0 +1,196 @@
+"""Contains code to run Julia tasks on a cluster of Distributed.jl workers.
+
+With ``julia_cluster``, pytask-julia starts a manager process at the beginning of the
+build which adds workers with the cluster managers of Distributed.jl, local workers or
+workers on other machines via SSH. Instead of starting Julia itself,
+:func:`~pytask_julia.collect.run_jl_script` sends the script and the serialized
+arguments of a task to the manager which runs them in a new Julia process on a free
+worker.
+
+The manager listens on a Unix socket in the private temporary folder of the user, so
+that tasks can be dispatched from pytask's main process as well as from workers of
+pytask-parallel, but not by other users. Requests never contain a command. The manager
+builds the command itself from the Julia of the worker and the runner of pytask-julia.
+Serialized arguments, scripts and products are exchanged via a shared file system.
+
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import Session
+from pytask import hookimpl
+
+from pytask_julia.executable import resolve_executable
+from pytask_julia.shared import JULIA_FOLDER
+from pytask_julia.shared import create_environment
+from pytask_julia.shared import get_path_to_temporary_folder
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+__all__ = [
+    "get_path_to_address",
+    "parse_machines",
+    "run_on_cluster",
+    "start_cluster",
+    "stop_cluster",
+]
+
+_MANAGER_SCRIPT: Path = JULIA_FOLDER / "cluster.jl"
+"""Path: The Julia script which starts the workers and dispatches commands."""
+
+_POLL_INTERVAL: float = 0.1
+"""float: Seconds between two checks whether the workers of the cluster are started."""
+
+
+def get_path_to_address() -> Path:
+    """Get the path to the socket of the manager of this build."""
+    return get_path_to_temporary_folder() / f"cluster-{os.getpid()}.sock"
+
+
+def parse_machines(value: Any) -> list[str] | None:
+    """Parse the machines of the cluster into arguments of the manager.
+
+    The value is either a number of local workers or a list of machine specifications
+    for the SSH cluster manager like ``"user@host"`` or ``["user@host", 8]``.
+
+    """
+    if value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return [str(value)]
+    if isinstance(value, list) and value:
+        machines = []
+        for machine in value:
+            if isinstance(machine, str):
+                machines.append(machine)
+            elif (
+                isinstance(machine, list)
+                and len(machine) == 2  # noqa: PLR2004
+                and isinstance(machine[0], str)
+                and isinstance(machine[1], int)
+                and machine[1] > 0
+            ):
+                machines.append(f"{machine[0]}={machine[1]}")
+            else:
+                break
+        else:
+            return machines
+    msg = (
+        f"'julia_cluster' is {value} and neither a positive number of local workers "
+        "nor a list of machines like 'user@host' or ['user@host', 8]."
+    )
+    raise ValueError(msg)
+
+
+def start_cluster(
+    executable: str,
+    remote_executable: str,
+    machines: list[str],
+    path_to_address: Path,
+) -> subprocess.Popen[bytes]:
+    """Start the manager and wait until the workers are started.
+
+    The manager runs with ``executable`` which is resolved on this machine. Workers on
+    other machines are started with ``remote_executable``, the executable as configured,
+    since the resolved path may not exist there.
+
+    Raises
+    ------
+    RuntimeError
+        If the manager exits before the workers are started.
+
+    """
+    path_to_address.unlink(missing_ok=True)
+    process = subprocess.Popen(  # noqa: S603
+        [
+            executable,
+            "--",
+            str(_MANAGER_SCRIPT),
+            str(path_to_address),
+            remote_executable,
+            *machines,
+        ],
+        env=create_environment(),
+        stdin=subprocess.PIPE,
+    )
+    while not path_to_address.exists():
+        if process.poll() is not None:
+            msg = f"The manager of the Julia cluster {process.args} failed to start."
+            raise RuntimeError(msg)
+        time.sleep(_POLL_INTERVAL)
+    return process
+
+
+def stop_cluster(process: subprocess.Popen[bytes], path_to_address: Path) -> None:
+    """Stop the manager which also stops all workers."""
+    if process.stdin is not None:
+        process.stdin.close()
+    process.wait()
+    path_to_address.unlink(missing_ok=True)
+
+
+def run_on_cluster(
+    path_to_address: Path,
+    script: Path,
+    serialized: Path,
+    options: list[str],
+    settings: list[str],
+) -> None:
+    """Run the script of a task on a free worker of the cluster.
+
+    The request consists of the script, the serialized arguments, the number of Julia
+    options followed by the options, and the settings of the runner.
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If the script exits with a non-zero exit code.
+    RuntimeError
+        If the manager cannot run the script.
+
+    """
+    fields = [str(script), str(serialized), str(len(options)), *options, *settings]
+    with socket.socket(socket.AF_UNIX) as connection:
+        connection.connect(str(path_to_address))
+        connection.sendall(("\t".join(fields) + "\n").encode())
+        with connection.makefile() as f:
+            response = f.readline()
+
+    status, *values = response.rstrip("\n").split("\t")
+    if status == "ok":
+        return
+    if values and values[0].isdigit():
+        raise subprocess.CalledProcessError(int(values[0]), [str(script)])
+    msg = f"The Julia cluster failed to run {script}." + "".join(
+        f"\n\n{value}" for value in values
+    )
+    raise RuntimeError(msg)
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build(session: Session) -> Generator[None, None, None]:
+    """Start the cluster before and stop it after the tasks are executed."""
+    machines = session.config["julia_cluster"]
+    if machines is None:
+        return (yield)
+
+    path_to_address = get_path_to_address()
+    process = start_cluster(
+        resolve_executable(session.config["julia_executable"]),
+        session.config["julia_executable"],
+        machines,
+        path_to_address,
+    )
+    try:
+        return (yield)
+    finally:
+        stop_cluster(process, path_to_address)
@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import subprocess
+import sys
 import warnings
+from contextlib import ExitStack
 from pathlib import Path
-from typing import TYPE_CHECKING
 from typing import Any
 
-from pytask import Mark
 from pytask import NodeInfo
 from pytask import PathNode
 from pytask import PTask
@@ -23,29 +23,181 @@ from pytask import parse_dependencies_from_task_function
 from pytask import parse_products_from_task_function
 from pytask import remove_marks
 
-from pytask_julia.serialization import SERIALIZERS
+from pytask_julia.affinity import acquire_cores
+from pytask_julia.affinity import add_threads_option
+from pytask_julia.affinity import format_cpu_list
+from pytask_julia.affinity import pin_command
+from pytask_julia.affinity import pin_process
+from pytask_julia.checksums import get_path_to_checksums
+from pytask_julia.checksums import get_path_to_products
+from pytask_julia.cluster import get_path_to_address
+from pytask_julia.cluster import run_on_cluster
+from pytask_julia.daemon import get_daemon_setting
+from pytask_julia.daemon import submit_to_daemon
+from pytask_julia.depots import acquire_depot
+from pytask_julia.depots import create_depot_path
+from pytask_julia.executable import resolve_executable
+from pytask_julia.logs import capture_log
+from pytask_julia.logs import get_path_to_log
+from pytask_julia.metrics import get_path_to_metrics
+from pytask_julia.prewarm import run_prewarmed
+from pytask_julia.profiling import get_path_to_profile
+from pytask_julia.progress import get_path_to_channel
+from pytask_julia.progress import is_stalled
+from pytask_julia.results import check_return_annotation
 from pytask_julia.serialization import create_path_to_serialized
+from pytask_julia.sessions import get_session
+from pytask_julia.sessions import spill_objects_from_other_sessions
+from pytask_julia.shared import JULIA_FOLDER
+from pytask_julia.shared import create_environment
 from pytask_julia.shared import julia
-from pytask_julia.shared import parse_relative_path
-
-if TYPE_CHECKING:
-    from collections.abc import Callable
+from pytask_julia.shared import needs_own_process
+from pytask_julia.shared import parse_executable
+from pytask_julia.shared import parse_julia_mark
+from pytask_julia.shared import parse_project
 
 _SEPARATOR: str = "--"
 """str: Separates options for the Julia executable and arguments to the file."""
 
+_RUNNER: Path = JULIA_FOLDER / "runner.jl"
+"""Path: The Julia script which runs task scripts with instrumentation."""
+
+_POLL_INTERVAL: float = 1.0
+"""float: Seconds between two checks whether a running script has stalled."""
+
 
 def run_jl_script(
+    *,
     _script: Path,
     _options: list[str],
     _serialized: Path,
     _project: list[str],
-    **kwargs: Any,  # noqa: ARG001
+    _settings: dict[str, Any],
+    **kwargs: Any,
 ) -> None:
-    """Run a Julia script."""
-    cmd = ["julia", *_options, *_project, _SEPARATOR, str(_script), str(_serialized)]
+    """Run a Julia script.
+
+    ``_settings`` holds the settings from :func:`get_execution_settings` and the Julia
+    executable under ``"executable"``.
+
+    """
+    executable = _settings["executable"]
+    if _settings["session"]:
+        session = get_session(
+            [executable, *_options, *_project], revise=_settings["revise"]
+        )
+        spill_objects_from_other_sessions(session, kwargs)
+        session.run(_script, _serialized)
+        return
+
+    if submit_to_daemon(
+        _settings["daemon"], executable, [*_options, *_project], _script, _serialized
+    ) or run_prewarmed([executable, *_options, *_project], _script, _serialized):
+        return
+
+    args = [str(_script), str(_serialized)]
+    runner_settings = _get_runner_settings(
+        _serialized,
+        profile=_settings["profile"],
+        metrics=_settings["metrics"],
+        checksums=_settings["checksums"],
+    )
+    if runner_settings:
+        args = [str(_RUNNER), *args, *runner_settings]
+    cmd = [executable, *_options, *_project, _SEPARATOR, *args]
     print("Executing " + " ".join(cmd) + ".")  # noqa: T201
-    subprocess.run(cmd, check=True)  # noqa: S603
+
+    if _settings["cluster"] is not None:
+        run_on_cluster(
+            Path(_settings["cluster"]),
+            _script,
+            _serialized,
+            [*_options, *_project],
+            runner_settings,
+        )
+        return
+
+    log_tail = _settings["log_tail"]
+    channel = get_path_to_channel(_serialized)
+    with ExitStack() as stack:
+        cores = (
+            None
+            if _settings["cores"] is None
+            else stack.enter_context(acquire_cores(_settings["cores"]))
+        )
+        if cores is not None:
+            cmd = pin_command(add_threads_option(cmd, len(cores)), cores)
+            print(f"Pinned to the cores {format_cpu_list(cores)}.")  # noqa: T201
+        depot_path = None
+        if _settings["depot"] is not None:
+            local_root, shared = _settings["depot"]
+            local = stack.enter_context(acquire_depot(Path(local_root)))
+            depot_path = create_depot_path(local, shared)
+        process = stack.enter_context(
+            subprocess.Popen(  # noqa: S603
+                cmd,
+                env=create_environment(depot_path),
+                stdout=None if log_tail is None else subprocess.PIPE,
+                stderr=None if log_tail is None else subprocess.STDOUT,
+            )
+        )
+        pin_process(process.pid, cores)
+        capture = (
+            None
+            if process.stdout is None or log_tail is None
+            else stack.enter_context(
+                capture_log(process.stdout, get_path_to_log(_serialized), log_tail)
+            )
+        )
+        try:
+            _wait_for_process(process, channel, _settings["stall_timeout"])
+        except BaseException:
+            process.kill()
+            raise
+
+    if process.returncode != 0:
+        if capture is not None:
+            sys.stderr.write(capture.format_tail())
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+
+
+def _get_runner_settings(
+    serialized: Path, *, profile: bool, metrics: bool, checksums: bool
+) -> list[str]:
+    """Get the settings of the runner which instruments scripts."""
+    settings = []
+    if profile:
+        settings.append(f"profile={get_path_to_profile(serialized)}")
+    if metrics:
+        settings.append(f"metrics={get_path_to_metrics(serialized)}")
+    if checksums:
+        settings.extend(
+            (
+                f"products={get_path_to_products(serialized)}",
+                f"checksums={get_path_to_checksums(serialized)}",
+            )
+        )
+    return settings
+
+
+def _wait_for_process(
+    process: subprocess.Popen[bytes], channel: Path, stall_timeout: float | None
+) -> None:
+    """Wait for the process and raise an error if the script stalls."""
+    while True:
+        try:
+            process.wait(timeout=_POLL_INTERVAL)
+        except subprocess.TimeoutExpired:
+            pass
+        else:
+            return
+
+        if is_stalled(channel, stall_timeout):
+            msg = (
+                f"The Julia process {process.args} did not send any message for more "
+                f"than {stall_timeout} seconds and was stopped."
+            )
+            raise RuntimeError(msg)
 
 
 @hookimpl
@@ -74,14 +226,15 @@ def pytask_collect_task(
                 msg,
             )
 
-        mark = _parse_julia_mark(
+        mark = parse_julia_mark(
             mark=marks[0],
             default_options=session.config["julia_options"],
             default_serializer=session.config["julia_serializer"],
             default_suffix=session.config["julia_suffix"],
             default_project=session.config["julia_project"],
+            default_executable=session.config["julia_executable"],
         )
-        script, options, _, suffix, project = julia(**mark.kwargs)
+        script, options, _, suffix, project, _, _, executable = julia(**mark.kwargs)
         if suffix is None:
             msg = "No file suffix configured for serialized arguments."
             raise ValueError(msg)
@@ -116,6 +269,14 @@ def pytask_collect_task(
             )
             raise ValueError(msg)
 
+        # Fail during the collection and not for every task if Julia is missing.
+        executable = resolve_executable(
+            parse_executable(executable or "julia", path_nodes)
+        )
+
+        if session.config["julia_track_allocation"]:
+            options = [*(options or []), "--track-allocation=user"]
+
         options_node = session.hook.pytask_collect_node(
             session=session,
             path=path_nodes,
@@ -128,7 +289,7 @@ def pytask_collect_task(
             ),
         )
 
-        parsed_project = _parse_project(project, path_nodes)
+        parsed_project = parse_project(project, path_nodes)
         project_node = session.hook.pytask_collect_node(
             session=session,
             path=path_nodes,
@@ -147,12 +308,28 @@ def pytask_collect_task(
         products = parse_products_from_task_function(
             session, path, name, path_nodes, obj
         )
+        check_return_annotation(name, products)
 
         # Add script
         dependencies["_script"] = script_node
         dependencies["_options"] = options_node
         dependencies["_project"] = project_node
 
+        # Add the settings which control how the script is executed.
+        dependencies["_settings"] = session.hook.pytask_collect_node(
+            session=session,
+            path=path_nodes,
+            node_info=NodeInfo(
+                arg_name="_settings",
+                path=(),
+                value=PythonNode(
+                    value={"executable": executable, **get_execution_settings(session)}
+                ),
+                task_path=path,
+                task_name=name,
+            ),
+        )
+
         markers = pytask_meta.markers if pytask_meta is not None else []
 
         task: PTask
@@ -193,46 +370,36 @@ def pytask_collect_task(
     return None
 
 
-def _parse_julia_mark(
-    mark: Mark,
-    default_options: list[str] | None,
-    default_serializer: Callable[..., str] | str | None,
-    default_suffix: str | None,
-    default_project: str | None,
-) -> Mark:
-    """Parse a Julia mark."""
-    script, options, serializer, suffix, project = julia(**mark.kwargs)
-
-    parsed_kwargs = {}
-    for arg_name, value, default in (
-        ("script", script, None),
-        ("options", options, default_options),
-        ("serializer", serializer, default_serializer),
-    ):
-        parsed_kwargs[arg_name] = value or default
-
-    proposed_suffix = (
-        SERIALIZERS[parsed_kwargs["serializer"]]["suffix"]
-        if isinstance(parsed_kwargs["serializer"], str)
-        and parsed_kwargs["serializer"] in SERIALIZERS
-        else default_suffix
-    )
-    parsed_suffix = suffix or proposed_suffix
-    if parsed_suffix is None:
-        msg = "No file suffix configured for serialized arguments."
-        raise ValueError(msg)
-    parsed_kwargs["suffix"] = parsed_suffix
-
-    if isinstance(project, (str, Path)):
-        parsed_kwargs["project"] = project
-    else:
-        parsed_kwargs["project"] = default_project
-
-    return Mark("julia", (), parsed_kwargs)
-
-
-def _parse_project(project: str | Path | None, root: Path) -> list[str]:
-    if project is None:
-        return []
-    project = parse_relative_path(project, root)
-    return ["--project=" + project.as_posix()]
+def get_execution_settings(session: Session) -> dict[str, Any]:
+    """Get the settings which control how scripts are executed.
+
+    The settings are passed in a single dependency to :func:`run_jl_script` so that
+    they reach the function even if it is executed in another process.
+
+    """
+    return {
+        "profile": session.config["julia_profile"],
+        "metrics": session.config["julia_metrics"],
+        "stall_timeout": session.config["julia_stall_timeout"],
+        "log_tail": session.config["julia_log_tail"]
+        if session.config["julia_capture_logs"]
+        else None,
+        "session": session.config["julia_session"]
+        and not needs_own_process(session.config)
+        and session.config.get("n_workers", 1) == 1,
+        "revise": session.config["julia_revise"],
+        "checksums": session.config["julia_checksums"],
+        "depot": None
+        if session.config["julia_shared_depot"] is None
+        else [
+            session.config["julia_local_depot"].as_posix(),
+            session.config["julia_shared_depot"].as_posix(),
+        ],
+        "cluster": None
+        if session.config["julia_cluster"] is None
+        else get_path_to_address().as_posix(),
+        "daemon": get_daemon_setting(session.config),
+        "cores": None
+        if session.config["julia_cluster"] is not None
+        else session.config["julia_cores_per_task"],
+    }
@@ -6,9 +6,28 @@ from typing import Any
 
 from pytask import hookimpl
 
+from pytask_julia.cluster import parse_machines
 from pytask_julia.serialization import SERIALIZERS
+from pytask_julia.shared import get_path_to_temporary_folder
+from pytask_julia.shared import parse_executable
 from pytask_julia.shared import parse_relative_path
 
+_DEFAULT_LOG_TAIL: int = 64 * 1024
+"""int: Number of bytes of the output which are shown for failed tasks."""
+
+_DEFAULT_SCRATCH_MAX_SIZE: int = 10 * 1024**3
+"""int: Number of bytes of dependencies which are copied to the scratch disk."""
+
+_DEFAULT_CACHE_MAX_SIZE: int = 10 * 1024**3
+"""int: Number of bytes of memoized function calls which are kept after a build."""
+
+_DEFAULT_TASK_TABLES: tuple[str, ...] = ()
+"""tuple[str, ...]: Patterns of files which are collected as task tables.
+
+Task tables are opt-in so that TOML files of other tools are never collected.
+
+"""
+
 
 @hookimpl
 def pytask_parse_config(config: dict[str, Any]) -> None:
@@ -32,9 +51,78 @@ def pytask_parse_config(config: dict[str, Any]) -> None:
         config["julia_project"] = project
     else:
         config["julia_project"] = parse_relative_path(project, config["root"])
+    config["julia_executable"] = parse_executable(
+        config.get("julia_executable", "julia"), config["root"]
+    )
+    config["julia_profile"] = bool(config.get("julia_profile", False))
+    config["julia_metrics"] = bool(config.get("julia_metrics", False))
+    trace = config.get("julia_trace")
+    config["julia_trace"] = (
+        None if trace is None else parse_relative_path(trace, config["root"])
+    )
+    config["julia_track_allocation"] = bool(config.get("julia_track_allocation", False))
+    config["julia_stall_timeout"] = _parse_positive_number_option(
+        "julia_stall_timeout", config.get("julia_stall_timeout")
+    )
+    config["julia_check_syntax"] = bool(config.get("julia_check_syntax", False))
+    config["julia_check_packages"] = bool(config.get("julia_check_packages", False))
+    config["julia_capture_logs"] = bool(config.get("julia_capture_logs", False))
+    log_tail = _parse_positive_number_option(
+        "julia_log_tail", config.get("julia_log_tail", _DEFAULT_LOG_TAIL)
+    )
+    config["julia_log_tail"] = int(log_tail or _DEFAULT_LOG_TAIL)
+    shared_depot = config.get("julia_shared_depot")
+    config["julia_shared_depot"] = (
+        None
+        if shared_depot is None
+        else parse_relative_path(shared_depot, config["root"])
+    )
+    local_depot = config.get("julia_local_depot")
+    # The private temporary folder is only created if a depot is used.
+    config["julia_local_depot"] = (
+        parse_relative_path(local_depot, config["root"])
+        if local_depot is not None
+        else get_path_to_temporary_folder() / "depots"
+        if shared_depot is not None
+        else None
+    )
+    # While Julia tasks are watched, they always run in sessions with Revise.jl.
+    is_watched = bool(config.get("_julia_watch", False))
+    config["julia_session"] = is_watched or bool(config.get("julia_session", False))
+    config["julia_revise"] = is_watched or bool(config.get("julia_revise", False))
+    config["julia_checkpoints"] = bool(config.get("julia_checkpoints", False))
+    config["julia_cache_max_size"] = _parse_positive_number_option(
+        "julia_cache_max_size",
+        config.get("julia_cache_max_size", _DEFAULT_CACHE_MAX_SIZE),
+    )
+    config["julia_checksums"] = bool(config.get("julia_checksums", False))
+    config["julia_daemon"] = bool(config.get("julia_daemon", False))
+    config["julia_prewarm"] = int(
+        _parse_positive_number_option("julia_prewarm", config.get("julia_prewarm")) or 0
+    )
+    config["julia_cluster"] = parse_machines(config.get("julia_cluster"))
+    cores_per_task = _parse_positive_number_option(
+        "julia_cores_per_task", config.get("julia_cores_per_task")
+    )
+    config["julia_cores_per_task"] = (
+        None if cores_per_task is None else int(cores_per_task)
+    )
+    scratch = config.get("julia_scratch")
+    config["julia_scratch"] = (
+        None if scratch is None else parse_relative_path(scratch, config["root"])
+    )
+    task_tables = config.get("julia_task_tables", list(_DEFAULT_TASK_TABLES))
+    if not isinstance(task_tables, list):
+        msg = f"'julia_task_tables' is {task_tables} and not a list."
+        raise TypeError(msg)
+    config["julia_task_tables"] = list(map(str, task_tables))
+    config["julia_scratch_max_size"] = _parse_positive_number_option(
+        "julia_scratch_max_size",
+        config.get("julia_scratch_max_size", _DEFAULT_SCRATCH_MAX_SIZE),
+    )
 
 
-def _parse_value_or_whitespace_option(value: Any) -> None | list[str]:
+def _parse_value_or_whitespace_option(value: Any) -> list[str] | None:
     """Parse option which can hold a single value or values separated by new lines."""
     if value is None:
         return None
@@ -42,3 +130,13 @@ def _parse_value_or_whitespace_option(value: Any) -> None | list[str]:
         return list(map(str, value))
     msg = f"'julia_options' is {value} and not a list."
     raise ValueError(msg)
+
+
+def _parse_positive_number_option(name: str, value: Any) -> float | None:
+    """Parse option which can be a positive number or missing."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    msg = f"{name!r} is {value} and not a positive number."
+    raise ValueError(msg)
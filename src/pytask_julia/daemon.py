@@ -0,0 +1,545 @@
+"""Contains code to keep Julia sessions warm between invocations of pytask.
+
+``pytask julia-daemon start`` starts a daemon in the background which listens on a Unix
+socket. With ``julia_daemon``, :func:`~pytask_julia.collect.run_jl_script` submits the
+scripts of tasks to the daemon, and the daemon runs them in Julia sessions which stay
+alive between builds. Sessions are started with the Julia executable of the daemon and
+shared by tasks with the same options, working directory and environment. If the daemon
+is not running or uses another executable, tasks are executed in new Julia processes.
+
+The socket is in a folder which only the user can access, and the daemon only answers
+connections of processes of the same user. Requests are JSON objects on one line and
+never contain a command. Every request is answered with one tab-separated line which
+starts with "ok" or "error".
+
+- ``run`` runs a ``script`` with its ``serialized`` arguments in a session with the
+  Julia ``options`` of the task, started in the ``cwd`` and with the ``env`` of the
+  submitting build.
+- ``ping`` returns the process id and the executable of the daemon.
+- ``stop`` stops the daemon.
+
+Sessions are stopped when they were idle for longer than the idle timeout, when they
+use more memory than the memory limit, or when the manifest of their project changes.
+The daemon stops itself when it was idle for longer than the idle timeout.
+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import cast
+
+import click
+from pytask import hookimpl
+
+from pytask_julia.executable import resolve_executable
+from pytask_julia.sessions import JuliaSession
+from pytask_julia.shared import create_environment
+from pytask_julia.shared import get_path_to_temporary_folder
+from pytask_julia.shared import needs_own_process
+from pytask_julia.watch import take_snapshot
+
+__all__ = [
+    "get_daemon_setting",
+    "get_path_to_socket",
+    "request_daemon",
+    "serve",
+    "submit_to_daemon",
+]
+
+_POLL_INTERVAL: float = 0.5
+"""float: Seconds between two checks for idle sessions or whether the daemon runs."""
+
+_START_TIMEOUT: float = 30.0
+"""float: Seconds to wait until the daemon accepts connections."""
+
+_MANIFESTS: tuple[str, ...] = (
+    "Manifest.toml",
+    "JuliaManifest.toml",
+    "Project.toml",
+    "JuliaProject.toml",
+)
+"""tuple[str, ...]: Files of a project which restart its sessions when they change."""
+
+
+def get_path_to_socket() -> Path:
+    """Get the path to the socket of the daemon of the current user.
+
+    The socket is in ``$XDG_RUNTIME_DIR`` if it is set or else in the private temporary
+    folder of the user.
+
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and Path(runtime).is_dir():
+        folder = Path(runtime, "pytask-julia")
+        folder.mkdir(mode=0o700, exist_ok=True)
+    else:
+        folder = get_path_to_temporary_folder()
+    return folder / "daemon.sock"
+
+
+def get_daemon_setting(config: dict[str, Any]) -> str | None:
+    """Get the path to the socket if tasks are submitted to the daemon.
+
+    Tasks which need their own process are not submitted to the daemon.
+
+    """
+    if not config["julia_daemon"] or needs_own_process(config):
+        return None
+    return get_path_to_socket().as_posix()
+
+
+def request_daemon(path: Path, command: str, **fields: Any) -> list[str] | None:
+    """Send a request to the daemon and return the fields of the response.
+
+    Returns ``None`` if the daemon is not running.
+
+    Raises
+    ------
+    RuntimeError
+        If the daemon cannot answer the request.
+
+    """
+    connection = _connect(path)
+    if connection is None:
+        return None
+    return _exchange(connection, {"command": command, **fields})
+
+
+def _connect(path: Path) -> socket.socket | None:
+    """Connect to the daemon or return ``None`` if it is not running."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def _exchange(connection: socket.socket, request: dict[str, Any]) -> list[str]:
+    """Send a request over a connection and return the fields of the response."""
+    with connection:
+        connection.sendall((json.dumps(request) + "\n").encode())
+        with connection.makefile(encoding="utf-8") as f:
+            response = f.readline()
+
+    command = request["command"]
+    if not response:
+        msg = f"The Julia daemon closed the connection during {command!r}."
+        raise RuntimeError(msg)
+
+    status, *values = response.rstrip("\n").split("\t")
+    if status != "ok":
+        target = f" {request['script']}" if "script" in request else ""
+        msg = f"The Julia daemon failed to {command}{target}." + "".join(
+            f"\n\n{value}" for value in values
+        )
+        raise RuntimeError(msg)
+    return values
+
+
+def submit_to_daemon(
+    path: str | None,
+    executable: str,
+    options: list[str],
+    script: Path,
+    serialized: Path,
+) -> bool:
+    """Run a script in the daemon and return whether the daemon was available.
+
+    ``path`` is the path to the socket or ``None`` if the daemon is not used. The
+    working directory and the environment of this process are sent with the script, so
+    it runs like in a new process.
+
+    """
+    if path is None:
+        return False
+    response = request_daemon(Path(path), "ping")
+    if response is None or response[1:] != [executable]:
+        return False
+    print(  # noqa: T201
+        "Executing " + " ".join([executable, *options, str(script)]) + " in the "
+        "Julia daemon."
+    )
+    connection = _connect(Path(path))
+    if connection is None:
+        return False
+    _exchange(
+        connection,
+        {
+            "command": "run",
+            "script": str(script),
+            "serialized": str(serialized),
+            "options": options,
+            "cwd": str(Path.cwd()),
+            "env": create_environment(),
+        },
+    )
+    return True
+
+
+@dataclass
+class _DaemonSession:
+    """A session of the daemon with the state of the manifests of its project."""
+
+    session: JuliaSession
+    snapshot: dict[Path, int | None]
+    last_used: float = field(default_factory=time.monotonic)
+
+
+def _get_manifests(options: list[str], cwd: str) -> list[Path]:
+    """Get the files of the project of a session which restart it when they change."""
+    for option in options:
+        if option.startswith("--project="):
+            project = Path(cwd, option.removeprefix("--project="))
+            return [project / name for name in _MANIFESTS]
+    return []
+
+
+def _get_memory(pid: int) -> int | None:
+    """Get the resident memory of a process in bytes."""
+    result = subprocess.run(  # noqa: S603
+        ["ps", "-o", "rss=", "-p", str(pid)],  # noqa: S607
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    rss = result.stdout.strip()
+    return int(rss) * 1024 if rss.isdigit() else None
+
+
+def _stop(daemon_session: _DaemonSession) -> None:
+    daemon_session.session.process.kill()
+    daemon_session.session.process.wait()
+
+
+_SessionKey = tuple[tuple[str, ...], str, tuple[tuple[str, str], ...]]
+"""type: Sessions are shared by tasks with the same options, cwd and environment."""
+
+
+class _Daemon:
+    """The sessions of the daemon."""
+
+    def __init__(
+        self, executable: str, idle_timeout: float, memory_limit: int | None
+    ) -> None:
+        self.executable = executable
+        self.idle_timeout = idle_timeout
+        self.memory_limit = memory_limit
+        self.lock = threading.Lock()
+        self.idle: dict[_SessionKey, list[_DaemonSession]] = {}
+        self.busy = 0
+        self.last_activity = time.monotonic()
+        self.stopped = False
+
+    def run(
+        self,
+        script: str,
+        serialized: str,
+        options: list[str],
+        cwd: str,
+        env: dict[str, str],
+    ) -> None:
+        """Run a script in an idle session for the options or start one."""
+        key = (tuple(options), cwd, tuple(sorted(env.items())))
+        daemon_session = self._take(key)
+        try:
+            daemon_session.session.run(Path(script), Path(serialized))
+        finally:
+            self._give_back(key, daemon_session)
+
+    def _take(self, key: _SessionKey) -> _DaemonSession:
+        options, cwd, env = key
+        manifests = _get_manifests(list(options), cwd)
+        with self.lock:
+            self.busy += 1
+            self.last_activity = time.monotonic()
+            sessions = self.idle.get(key, [])
+            while sessions:
+                daemon_session = sessions.pop()
+                if daemon_session.snapshot == take_snapshot(manifests):
+                    return daemon_session
+                _stop(daemon_session)
+        return _DaemonSession(
+            session=JuliaSession(
+                [self.executable, *options],
+                transient=True,
+                cwd=Path(cwd),
+                env=dict(env),
+            ),
+            snapshot=take_snapshot(manifests),
+        )
+
+    def _give_back(self, key: _SessionKey, daemon_session: _DaemonSession) -> None:
+        process = daemon_session.session.process
+        memory = None if self.memory_limit is None else _get_memory(process.pid)
+        is_healthy = process.poll() is None and (
+            memory is None or self.memory_limit is None or memory <= self.memory_limit
+        )
+        with self.lock:
+            self.busy -= 1
+            self.last_activity = time.monotonic()
+            if is_healthy:
+                daemon_session.last_used = self.last_activity
+                self.idle.setdefault(key, []).append(daemon_session)
+        if not is_healthy:
+            _stop(daemon_session)
+
+    def stop_idle_sessions(self) -> None:
+        """Stop sessions which were idle for longer than the idle timeout."""
+        now = time.monotonic()
+        with self.lock:
+            expired = [
+                daemon_session
+                for sessions in self.idle.values()
+                for daemon_session in sessions
+                if now - daemon_session.last_used > self.idle_timeout
+            ]
+            for sessions in self.idle.values():
+                sessions[:] = [s for s in sessions if s not in expired]
+        for daemon_session in expired:
+            _stop(daemon_session)
+
+    def is_idle(self) -> bool:
+        """Return whether the daemon was idle for longer than the idle timeout."""
+        with self.lock:
+            return (
+                self.busy == 0
+                and time.monotonic() - self.last_activity > self.idle_timeout
+            )
+
+    def close(self) -> None:
+        """Stop all sessions."""
+        with self.lock:
+            sessions = [s for sessions in self.idle.values() for s in sessions]
+            self.idle.clear()
+        for daemon_session in sessions:
+            _stop(daemon_session)
+
+
+def _is_same_user(connection: socket.socket) -> bool:
+    """Check whether the peer of a connection runs as the current user.
+
+    Without ``SO_PEERCRED``, which is only available on Linux, the socket is protected
+    by the permissions of its folder alone.
+
+    """
+    if not hasattr(socket, "SO_PEERCRED"):  # pragma: no cover
+        return True
+    credentials = connection.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid == os.getuid()
+
+
+def _parse_run_request(request: dict[str, Any]) -> dict[str, Any]:
+    """Parse the fields of a request to run a script.
+
+    Raises
+    ------
+    ValueError
+        If a field is missing or has the wrong type.
+
+    """
+    fields = {
+        "script": request.get("script"),
+        "serialized": request.get("serialized"),
+        "options": request.get("options"),
+        "cwd": request.get("cwd"),
+        "env": request.get("env"),
+    }
+    if not (
+        all(isinstance(fields[name], str) for name in ("script", "serialized", "cwd"))
+        and isinstance(fields["options"], list)
+        and all(isinstance(option, str) for option in fields["options"])
+        and isinstance(fields["env"], dict)
+        and all(isinstance(v, str) for v in (*fields["env"], *fields["env"].values()))
+    ):
+        msg = f"The request to run a script is malformed: {request}."
+        raise ValueError(msg)
+    return fields
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer a request to the daemon."""
+
+    def handle(self) -> None:
+        daemon = cast("_Server", self.server).daemon
+        try:
+            if not _is_same_user(self.request):
+                msg = "The Julia daemon only answers requests of its user."
+                raise PermissionError(msg)  # noqa: TRY301
+            request = json.loads(self.rfile.readline())
+            command = request.get("command") if isinstance(request, dict) else None
+            if command == "run":
+                daemon.run(**_parse_run_request(request))
+                response = ["ok"]
+            elif command == "ping":
+                response = ["ok", str(os.getpid()), daemon.executable]
+            elif command == "stop":
+                daemon.stopped = True
+                response = ["ok"]
+            else:
+                response = ["error", f"Unknown request {command!r}."]
+        except Exception as e:  # noqa: BLE001
+            response = ["error", str(e).replace("\n", " ").replace("\t", " ")]
+        self.wfile.write(("\t".join(response) + "\n").encode())
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _Server(socketserver.ThreadingUnixStreamServer):
+        """A server which answers every request in its own thread."""
+
+        daemon_threads = True
+        daemon: _Daemon
+
+
+def serve(
+    path: Path, executable: str, idle_timeout: float, memory_limit: int | None
+) -> None:
+    """Serve requests on the socket until the daemon is stopped or idle."""
+    path.unlink(missing_ok=True)
+    daemon = _Daemon(executable, idle_timeout, memory_limit)
+    with _Server(str(path), _Handler) as server:
+        server.daemon = daemon
+        server.timeout = _POLL_INTERVAL
+        try:
+            while not daemon.stopped and not daemon.is_idle():
+                server.handle_request()
+                daemon.stop_idle_sessions()
+        finally:
+            daemon.close()
+            path.unlink(missing_ok=True)
+
+
+@click.group(name="julia-daemon")
+def julia_daemon() -> None:
+    """Manage the daemon which keeps Julia sessions warm between builds."""
+
+
+@julia_daemon.command()
+@click.option(
+    "--executable",
+    default="julia",
+    show_default=True,
+    help="The name of or the path to the Julia executable which runs the sessions.",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=3600,
+    show_default=True,
+    help="Seconds after which idle sessions and the idle daemon are stopped.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Megabytes of memory after which a session is restarted.",
+)
+def start(executable: str, idle_timeout: float, memory_limit: int | None) -> None:
+    """Start the daemon in the background."""
+    if not hasattr(socket, "AF_UNIX"):
+        msg = "The Julia daemon needs Unix sockets which are not available."
+        raise click.ClickException(msg)
+    try:
+        executable = resolve_executable(executable)
+    except RuntimeError as e:
+        raise click.ClickException(str(e)) from None
+    path = get_path_to_socket()
+    if request_daemon(path, "ping") is not None:
+        click.echo(f"The Julia daemon is already running on {path}.")
+        return
+
+    log = path.with_suffix(".log")
+    with log.open("ab") as f:
+        process = subprocess.Popen(  # noqa: S603
+            [
+                sys.executable,
+                "-m",
+                "pytask",
+                "julia-daemon",
+                "serve",
+                str(path),
+                f"--executable={executable}",
+                f"--idle-timeout={idle_timeout}",
+                *([] if memory_limit is None else [f"--memory-limit={memory_limit}"]),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=f,
+            stderr=f,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + _START_TIMEOUT
+    while request_daemon(path, "ping") is None:
+        if process.poll() is not None or time.monotonic() > deadline:
+            msg = f"The Julia daemon failed to start. See {log}."
+            raise click.ClickException(msg)
+        time.sleep(_POLL_INTERVAL)
+    click.echo(
+        f"Started the Julia daemon on {path}. Scripts write their output to {log}."
+    )
+
+
+@julia_daemon.command(name="serve", hidden=True)
+@click.argument("path", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--executable", required=True)
+@click.option("--idle-timeout", type=float, required=True)
+@click.option("--memory-limit", type=int, default=None)
+def serve_command(
+    path: Path, executable: str, idle_timeout: float, memory_limit: int | None
+) -> None:
+    """Serve requests in the foreground."""
+    serve(
+        path,
+        executable,
+        idle_timeout,
+        None if memory_limit is None else memory_limit * 1024**2,
+    )
+
+
+@julia_daemon.command()
+def stop() -> None:
+    """Stop the daemon and all of its sessions."""
+    path = get_path_to_socket()
+    if request_daemon(path, "stop") is None:
+        click.echo("The Julia daemon is not running.")
+    else:
+        click.echo("Stopped the Julia daemon.")
+
+
+@julia_daemon.command()
+def status() -> None:
+    """Show whether the daemon is running."""
+    path = get_path_to_socket()
+    response = request_daemon(path, "ping")
+    if response is None:
+        click.echo("The Julia daemon is not running.")
+    else:
+        click.echo(
+            f"The Julia daemon is running on {path} with pid {response[0]} and "
+            f"{response[1]}."
+        )
+
+
+@hookimpl
+def pytask_extend_command_line_interface(cli: click.Group) -> None:
+    """Extend the command line interface."""
+    cli.add_command(julia_daemon)
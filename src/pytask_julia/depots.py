@@ -0,0 +1,109 @@
+"""Contains code to stack a shared read-only depot under writable depots per worker.
+
+When many Julia processes share one depot, they contend on the pidfiles of the compile
+cache and stat the same registries over and over, which is slow on shared file systems
+of clusters. With ``julia_shared_depot``, every Julia process receives a depot path of
+
+1. a writable depot on the local disk which no other running process uses,
+2. the shared depot with installed and precompiled packages which is only read,
+3. the default depots of Julia without the depot of the user.
+
+Writable depots are numbered slots which are locked while a process uses them. Slots are
+reused by later processes so that code compiled once stays available.
+
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from pytask import hookimpl
+
+from pytask_julia.executable import resolve_executable
+from pytask_julia.shared import try_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = ["acquire_depot", "create_depot_path", "prime_julia_depot"]
+
+
+def create_depot_path(*depots: str | Path) -> str:
+    """Create the value of ``JULIA_DEPOT_PATH`` for stacked depots.
+
+    The trailing separator appends the default depots of Julia without the depot of the
+    user, so that the compiled standard library is still found.
+
+    """
+    return os.pathsep.join([*map(str, depots), ""])
+
+
+@contextmanager
+def acquire_depot(root: Path) -> Generator[Path, None, None]:
+    """Acquire a writable depot which no other process uses at the same time.
+
+    The lock of the depot is released by the operating system even if the process
+    crashes.
+
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    for slot in itertools.count():
+        path = root / f"worker-{slot}"
+        lock = path.with_suffix(".lock").open("ab")
+        if try_lock(lock):
+            break
+        lock.close()
+
+    try:
+        yield path
+    finally:
+        lock.close()
+
+
+@click.command(name="prime-julia-depot")
+@click.argument("depot", type=click.Path(file_okay=False, path_type=Path))
+@click.option(
+    "--project",
+    type=click.Path(exists=True, path_type=Path),
+    default=Path(),
+    show_default=True,
+    help="The Julia project whose packages are installed.",
+)
+@click.option(
+    "--executable",
+    default="julia",
+    show_default=True,
+    help="The Julia executable which installs the packages.",
+)
+def prime_julia_depot(depot: Path, project: Path, executable: str) -> None:
+    """Install and precompile the packages of a project into a shared depot.
+
+    Point ``julia_shared_depot`` to the depot afterwards and make it read-only.
+
+    """
+    depot.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        resolve_executable(executable),
+        "--startup-file=no",
+        f"--project={project.resolve().as_posix()}",
+        "--eval",
+        "import Pkg; Pkg.instantiate(); Pkg.precompile()",
+    ]
+    env = {**os.environ, "JULIA_DEPOT_PATH": create_depot_path(depot.resolve())}
+    result = subprocess.run(cmd, env=env, check=False)  # noqa: S603
+    if result.returncode != 0:
+        msg = f"Priming the depot {depot} failed."
+        raise click.ClickException(msg)
+    click.echo(f"Primed the depot {depot} with the packages of {project}.")
+
+
+@hookimpl
+def pytask_extend_command_line_interface(cli: click.Group) -> None:
+    """Extend the command line interface."""
+    cli.add_command(prime_julia_depot)
@@ -0,0 +1,73 @@
+"""Contains code to resolve Julia executables and to probe their versions.
+
+Both are cached so that the PATH is scanned and ``julia --version`` runs only once per
+executable, no matter how many tasks use it.
+
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+__all__ = ["get_julia_version", "resolve_executable"]
+
+
+def resolve_executable(executable: str | Path) -> str:
+    """Resolve the path to a Julia executable.
+
+    Parameters
+    ----------
+    executable : str | Path
+        The name of an executable on the PATH like ``"julia"`` or a path to an
+        executable like ``"~/.juliaup/bin/julia"``.
+
+    Returns
+    -------
+    str
+        The absolute path to the executable.
+
+    Raises
+    ------
+    RuntimeError
+        If the executable cannot be found.
+
+    """
+    resolved = _which(str(executable), os.environ.get("PATH"))
+    if resolved is None:
+        msg = (
+            f"julia is needed to run Julia scripts, but the executable {executable!r} "
+            "is not found. Install Julia, add it to your PATH, or point "
+            "'julia_executable' in the configuration or 'executable' in "
+            "@pytask.mark.julia to it."
+        )
+        raise RuntimeError(msg)
+    return resolved
+
+
+@functools.cache
+def _which(executable: str, path: str | None) -> str | None:
+    """Find an executable. The PATH is part of the key since it might change."""
+    resolved = shutil.which(str(Path(executable).expanduser()), path=path)
+    return None if resolved is None else str(Path(resolved).absolute())
+
+
+@functools.cache
+def get_julia_version(executable: str) -> str:
+    """Get the version of a Julia executable like ``"1.10.4"``.
+
+    If the version cannot be determined, ``"unknown"`` is returned.
+
+    """
+    try:
+        result = subprocess.run(  # noqa: S603
+            [executable, "--version"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    # The output looks like "julia version 1.10.4".
+    *_, version = result.stdout.split() or ["unknown"]
+    return version
@@ -2,36 +2,48 @@
 
 from __future__ import annotations
 
-import shutil
 from pathlib import Path
 from typing import Any
 
 from pytask import PPathNode
 from pytask import PTask
 from pytask import PythonNode
+from pytask import Session
 from pytask import get_marks
 from pytask import hookimpl
 from pytask.tree_util import tree_map
+from pytask.tree_util import tree_map_with_path
 
+from pytask_julia.arrow import ArrowNode
+from pytask_julia.checkpoints import prepare_checkpoint
+from pytask_julia.checksums import get_hashed_products
+from pytask_julia.checksums import get_path_to_checksums
+from pytask_julia.checksums import get_path_to_products
+from pytask_julia.memoization import get_path_to_memoized
+from pytask_julia.metrics import get_path_to_metrics
+from pytask_julia.progress import get_path_to_channel
+from pytask_julia.results import get_path_to_results
+from pytask_julia.results import get_result_name
 from pytask_julia.serialization import serialize_keyword_arguments
+from pytask_julia.shards import SHARD_SETTINGS
 from pytask_julia.shared import julia
+from pytask_julia.staging import stage_task
+from pytask_julia.tracing import span
 
 
 @hookimpl
-def pytask_execute_task_setup(task: PTask) -> None:
-    """Check whether environment allows executing Julia files."""
+def pytask_execute_task_setup(session: Session, task: PTask) -> None:
+    """Serialize the arguments of Julia tasks before they are executed.
+
+    If ``julia_scratch`` is set, files are staged first, and the serialized arguments
+    point to the staged files. The path to the cache of memoized function calls is
+    passed under ``_cache`` and, with ``julia_checkpoints``, the path to the checkpoint
+    directory of the task under ``_checkpoint``.
+
+    """
     marks = get_marks(task, "julia")
     if marks:
-        if shutil.which("julia") is None:
-            msg = (
-                "julia is needed to run Julia scripts, but it is not found on your "
-                "PATH."
-            )
-            raise RuntimeError(
-                msg,
-            )
-
-        _, _, serializer, _, _ = julia(**marks[0].kwargs)
+        _, _, serializer, *_ = julia(**marks[0].kwargs)
 
         serialized_node = task.depends_on["_serialized"]
         if not isinstance(serialized_node, PythonNode) or not isinstance(
@@ -45,24 +57,80 @@ def pytask_execute_task_setup(task: PTask) -> None:
 
         path = serialized_node.value
         path.parent.mkdir(parents=True, exist_ok=True)
-        kwargs = collect_keyword_arguments(task)
-        serialize_keyword_arguments(serializer, path, kwargs)
+        get_path_to_channel(path).unlink(missing_ok=True)
+        get_path_to_checksums(path).unlink(missing_ok=True)
+        get_path_to_results(path).unlink(missing_ok=True)
+        get_path_to_metrics(path).unlink(missing_ok=True)
+        staged = (
+            {}
+            if session.config["julia_scratch"] is None
+            else stage_task(
+                task,
+                path,
+                session.config["julia_scratch"],
+                session.config["julia_scratch_max_size"],
+            )
+        )
+        with span("pytask_julia.serialize") as current:
+            kwargs = collect_keyword_arguments(task, staged)
+            kwargs["_cache"] = str(get_path_to_memoized(session.config["root"]))
+            if session.config["julia_checkpoints"]:
+                checkpoint = prepare_checkpoint(session.config["root"], task)
+                kwargs["_checkpoint"] = str(checkpoint)
+            serialize_keyword_arguments(serializer, path, kwargs)
+            if current.is_recording():
+                current.set_attribute("pytask_julia.payload_size", path.stat().st_size)
+
+        if session.config["julia_checksums"]:
+            get_path_to_products(path).write_text(
+                "".join(f"{staged.get(p, p)}\n" for p in get_hashed_products(task))
+            )
+
+
+def collect_keyword_arguments(
+    task: PTask, staged: dict[Path, Path] | None = None
+) -> dict[str, Any]:
+    """Collect keyword arguments for function.
+
+    Paths in ``staged`` are replaced with the paths to their staged copies. Tables of
+    :class:`~pytask_julia.arrow.ArrowNode` are passed with their schemas, and the
+    parameters of tasks from task tables are passed with their original types. Products
+    which are :class:`~pytask.PythonNode` are passed with the names under which Julia
+    scripts store their results.
+
+    """
+    staged = staged or {}
+
+    def _to_str(node: Any) -> str | dict[str, Any]:
+        if isinstance(node, ArrowNode):
+            path = str(staged.get(node.path, node.path))
+            return {"path": path, "schema": node.schema or {}}
+        if isinstance(node, PPathNode):
+            return str(staged.get(node.path, node.path))
+        return str(node.value)
 
+    def _to_product(path: tuple[Any, ...], node: Any) -> str | dict[str, Any]:
+        if isinstance(node, PythonNode):
+            return get_result_name(path)
+        return _to_str(node)
 
-def collect_keyword_arguments(task: PTask) -> dict[str, Any]:
-    """Collect keyword arguments for function."""
     kwargs: dict[str, Any] = {
-        **tree_map(
-            lambda x: str(x.path) if isinstance(x, PPathNode) else str(x.value),
-            task.depends_on,  # ty: ignore[invalid-argument-type]
-        ),
-        **tree_map(
-            lambda x: str(x.path) if isinstance(x, PPathNode) else str(x.value),
-            task.produces,  # ty: ignore[invalid-argument-type]
-        ),
+        **tree_map(_to_str, task.depends_on),  # ty: ignore[invalid-argument-type]
+        **tree_map_with_path(_to_product, task.produces),  # ty: ignore[invalid-argument-type]
     }
     kwargs.pop("_script")
     kwargs.pop("_options")
     kwargs.pop("_project")
-    kwargs.pop("_serialized")
+    kwargs.pop("_settings")
+    for name in SHARD_SETTINGS:
+        node = task.depends_on.get(name)
+        if isinstance(node, PythonNode):
+            kwargs[name] = node.value
+    parameters = task.depends_on.get("_parameters")
+    if isinstance(parameters, PythonNode) and isinstance(parameters.value, dict):
+        kwargs.pop("_parameters")
+        kwargs.update(parameters.value)
+    serialized = kwargs.pop("_serialized")
+    kwargs["_channel"] = str(get_path_to_channel(Path(serialized)))
+    kwargs["_results"] = str(get_path_to_results(Path(serialized)))
     return kwargs
@@ -0,0 +1,365 @@
+"""
+Helpers for Julia scripts executed by pytask-julia.
+
+pytask-julia puts this module on the load path of every task, so scripts can load it
+with `using PytaskJulia` without installing anything.
+
+Scripts report progress, heartbeats and metrics to pytask through the channel whose
+path is stored under `_channel` in the serialized arguments.
+
+```julia
+using PytaskJulia
+
+for (i, seed) in enumerate(seeds)
+    simulate(seed)
+    progress(config, i / length(seeds); message = "seed \$seed")
+end
+```
+
+Arguments serialized with `serializer = "toml"` are read with `load_config` which only
+needs Julia's standard library.
+
+```julia
+using PytaskJulia
+
+config = load_config()
+```
+
+Messages are appended to the channel as tab-separated lines and flushed at most every
+`FLUSH_INTERVAL` seconds, so even thousands of messages per second are cheap. Messages
+which are sent within the interval are flushed by a timer when it ends.
+
+Values of products declared with `PythonNode` are returned with `result` and reach
+downstream Python tasks without a file.
+
+```julia
+result(config, "fit", Dict("loglikelihood" => ll, "converged" => converged))
+```
+
+Expensive function calls which are repeated with the same arguments, for example, by
+parametrized tasks, are memoized on disk with `@pytask_cache`.
+
+```julia
+data = @pytask_cache preprocess(config["depends_on"]; years = 2000:2020)
+```
+
+Objects of products declared with `JuliaObjectNode` are passed with `keep` and `take`.
+In a Julia session, they stay in memory and are handed to later tasks by reference.
+"""
+module PytaskJulia
+
+using Serialization
+import SHA
+import TOML
+
+export @pytask_cache, heartbeat, keep, load_config, metric, progress, result, shard, take
+
+const FLUSH_INTERVAL = 0.1
+
+"""
+    load_config(path = ARGS[1])
+
+Load the arguments of a task serialized with `serializer = "toml"`.
+"""
+function load_config(path = ARGS[1])
+    if !endswith(path, ".toml")
+        error("load_config reads TOML files, but the arguments are in $path.")
+    end
+    return TOML.parsefile(path)
+end
+
+mutable struct MessageChannel
+    io::IOStream
+    last_flush::Float64
+    timer::Union{Timer,Nothing}
+end
+
+const CHANNELS = Dict{String,MessageChannel}()
+const CHANNELS_LOCK = ReentrantLock()
+
+_sanitize(field) = replace(string(field), r"[\t\r\n]" => " ")
+
+function _send(config, kind, fields...)
+    path = String(config["_channel"])
+    lock(CHANNELS_LOCK) do
+        channel = get!(() -> MessageChannel(open(path, "a"), 0.0, nothing), CHANNELS, path)
+        now = time()
+        print(channel.io, now, '\t', kind)
+        for field in fields
+            print(channel.io, '\t', _sanitize(field))
+        end
+        print(channel.io, '\n')
+        if now - channel.last_flush >= FLUSH_INTERVAL
+            _flush(channel, now)
+        elseif channel.timer === nothing
+            # Otherwise, the last messages stay in the buffer until the next message or
+            # the end of the script.
+            delay = FLUSH_INTERVAL - (now - channel.last_flush)
+            channel.timer = Timer(_ -> _flush_pending(channel), delay)
+        end
+    end
+    return nothing
+end
+
+function _flush(channel, now = time())
+    flush(channel.io)
+    channel.last_flush = now
+    if channel.timer !== nothing
+        close(channel.timer)
+        channel.timer = nothing
+    end
+    return nothing
+end
+
+function _flush_pending(channel)
+    lock(CHANNELS_LOCK) do
+        isopen(channel.io) && _flush(channel)
+    end
+    return nothing
+end
+
+"""
+    progress(config, fraction; message = "")
+
+Report the fraction of completed work, a number between 0 and 1.
+"""
+progress(config, fraction::Real; message = "") =
+    _send(config, "progress", Float64(fraction), message)
+
+"""
+    heartbeat(config)
+
+Signal that the script is alive without reporting progress.
+"""
+heartbeat(config) = _send(config, "heartbeat")
+
+"""
+    metric(config, name, value)
+
+Report the current value of a named metric like a loss or the number of iterations.
+"""
+metric(config, name, value) = _send(config, "metric", name, value)
+
+"""
+    shard(config, items)
+
+Select the items which belong to a shard of a task split with `shards = n`. The items
+are distributed round-robin so that all shards receive a similar amount of work.
+"""
+shard(config, items) = items[(Int(config["_shard"]) + 1):Int(config["_n_shards"]):end]
+
+const RESULTS_LOCK = ReentrantLock()
+
+"""
+    result(config, name, value)
+
+Return the value of the product `name` declared with `PythonNode`. Use `"return"` for the
+return annotation and join keys with dots for products in containers like
+`"produces.mean"`.
+
+The value is written as TOML, so it must be a number, a string, a boolean, a date, or an
+array or dictionary of them.
+"""
+function result(config, name, value)
+    path = String(config["_results"])
+    lock(RESULTS_LOCK) do
+        results = isfile(path) ? TOML.parsefile(path) : Dict{String,Any}()
+        results[String(name)] = value
+        _write_atomically(path, results) do temporary, results
+            open(io -> TOML.print(io, results), temporary, "w")
+        end
+    end
+    return value
+end
+
+"""
+    @pytask_cache f(args...; kwargs...)
+    @pytask_cache config f(args...; kwargs...)
+
+Memoize the result of a function call in the cache under `config["_cache"]`. Without
+`config`, the macro uses the variable `config` of the script.
+
+The result is reused by later calls with the same Julia version, environment, script,
+call and arguments, also from other tasks and builds. It is serialized with
+`Serialization`, so it must be serializable, and the arguments are hashed by their
+serialized bytes.
+"""
+macro pytask_cache(call)
+    return _memoize(:config, call, __source__)
+end
+
+macro pytask_cache(config, call)
+    return _memoize(config, call, __source__)
+end
+
+function _memoize(config, call, source)
+    if !Meta.isexpr(call, :call)
+        throw(ArgumentError("@pytask_cache expects a function call like `f(x)`."))
+    end
+    f, args = call.args[1], call.args[2:end]
+    parameters = filter(arg -> Meta.isexpr(arg, :parameters), args)
+    positional = filter(arg -> !Meta.isexpr(arg, :parameters), args)
+    file = source.file === nothing ? "" : String(source.file)
+    return esc(
+        Expr(
+            :call,
+            GlobalRef(@__MODULE__, :memoize),
+            parameters...,
+            config,
+            file,
+            string(call),
+            f,
+            positional...,
+        ),
+    )
+end
+
+"""
+    memoize(config, file, expr, f, args...; kwargs...)
+
+Call `f(args...; kwargs...)` or load its result from the cache. The script `file` and
+the call `expr` are part of the key. Use `@pytask_cache` instead of calling it directly.
+"""
+function memoize(config, file, expr, f, args...; kwargs...)
+    key = _digest(
+        string(VERSION),
+        _read_environment(),
+        isfile(file) ? read(file) : UInt8[],
+        expr,
+        args,
+        collect(pairs(kwargs)),
+    )
+    path = joinpath(String(config["_cache"]), key[1:2], key * ".jls")
+    if isfile(path)
+        try
+            value = deserialize(path)
+            # The modification time marks the last use for the eviction.
+            touch(path)
+            return value
+        catch
+            # The entry was evicted in the meantime, so the call is evaluated again.
+        end
+    end
+    value = f(args...; kwargs...)
+    _write_atomically(serialize, path, value)
+    return value
+end
+
+function _digest(parts...)
+    io = IOBuffer()
+    serialize(io, parts)
+    return bytes2hex(SHA.sha256(take!(io)))
+end
+
+function _read_environment()
+    project = Base.active_project()
+    project === nothing && return UInt8[]
+    folder = dirname(project)
+    manifests = (
+        "JuliaManifest.toml",
+        "Manifest.toml",
+        "Manifest-v$(VERSION.major).$(VERSION.minor).toml",
+    )
+    files = filter(isfile, [project; [joinpath(folder, name) for name in manifests]])
+    return reduce(vcat, (read(file) for file in files); init = UInt8[])
+end
+
+"""
+    find_packages(expr)
+
+Find the names of the packages which are imported with `using` or `import` in the
+parsed code of a script.
+"""
+function find_packages(expr, packages = Set{String}())
+    expr isa Expr || return packages
+    if Meta.isexpr(expr, (:using, :import))
+        for arg in expr.args
+            # Handle `using A: f` and `import A as B`.
+            Meta.isexpr(arg, :(:)) && (arg = arg.args[1])
+            Meta.isexpr(arg, :as) && (arg = arg.args[1])
+            # Relative imports like `using .Module` start with a dot.
+            if Meta.isexpr(arg, :.) && !isempty(arg.args) && arg.args[1] !== :.
+                push!(packages, string(arg.args[1]))
+            end
+        end
+    else
+        foreach(arg -> find_packages(arg, packages), expr.args)
+    end
+    return packages
+end
+
+const SESSION = Ref(false)
+const OBJECTS = Dict{String,Tuple{Any,Any}}()
+const KEPT = String[]
+
+"""
+    keep(config, name, object; write = Serialization.serialize)
+
+Keep the object of the product `name` declared with `JuliaObjectNode`.
+
+In a Julia session, the object stays in memory and is written to the path of the product
+with `write(path, object)` only when a task outside of Julia needs it or the session
+ends. Otherwise, it is written immediately.
+"""
+function keep(config, name, object; write = Serialization.serialize)
+    path = String(config[name])
+    if SESSION[]
+        OBJECTS[path] = (object, write)
+        push!(KEPT, path)
+    else
+        _write_atomically(write, path, object)
+    end
+    return object
+end
+
+"""
+    take(config, name; read = Serialization.deserialize)
+
+Take the object of the dependency `name` declared with `JuliaObjectNode`.
+
+The object is returned by reference if it is kept in the Julia session. Otherwise, it is
+read from the path of the dependency with `read(path)`.
+"""
+function take(config, name; read = Serialization.deserialize)
+    path = String(config[name])
+    return haskey(OBJECTS, path) ? first(OBJECTS[path]) : read(path)
+end
+
+"""
+    spill(path)
+
+Write a kept object to its path.
+"""
+function spill(path)
+    object, write = OBJECTS[path]
+    _write_atomically(write, path, object)
+    return nothing
+end
+
+function _write_atomically(write, path, object)
+    mkpath(dirname(path))
+    temporary = tempname(dirname(path); cleanup = false)
+    write(temporary, object)
+    mv(temporary, path; force = true)
+    return nothing
+end
+
+"""
+    close_channels()
+
+Flush and close all open channels. It is called automatically when Julia exits.
+"""
+function close_channels()
+    lock(CHANNELS_LOCK) do
+        for channel in values(CHANNELS)
+            _flush(channel)
+            close(channel.io)
+        end
+        empty!(CHANNELS)
+    end
+    return nothing
+end
+
+__init__() = atexit(close_channels)
+
+end
@@ -0,0 +1,73 @@
+# Check Julia scripts before pytask-julia executes them.
+#
+#     julia check.jl <scripts> <results>
+#
+# <scripts> lists one script per line with the path, the project which may be empty
+# and whether the packages loaded by the script should be checked ("1") or not ("0"),
+# separated by tabs. For each script with a problem, the path, the project and the
+# error are written to <results>, each terminated by a null byte.
+
+using PytaskJulia: find_packages
+
+const SCRIPTS, RESULTS = ARGS
+
+# Modules which are always available and no packages of a project.
+const BUILTIN_MODULES = ("Base", "Core", "Main")
+
+function find_error(expr, line = 0)
+    expr isa Expr || return nothing
+    for arg in expr.args
+        if arg isa LineNumberNode
+            line = arg.line
+        elseif Meta.isexpr(arg, (:error, :incomplete))
+            return "line $line: " * join(map(string, arg.args), " ")
+        else
+            problem = find_error(arg, line)
+            problem === nothing || return problem
+        end
+    end
+    return nothing
+end
+
+function find_missing_packages(packages, project)
+    default_project = Base.ACTIVE_PROJECT[]
+    isempty(project) || (Base.ACTIVE_PROJECT[] = project)
+    try
+        return sort!([
+            package for package in packages if
+            !(package in BUILTIN_MODULES) && Base.identify_package(package) === nothing
+        ])
+    finally
+        Base.ACTIVE_PROJECT[] = default_project
+    end
+end
+
+function check_script(path, project, check_packages)
+    expr = try
+        Meta.parseall(read(path, String); filename = path)
+    catch exception
+        return sprint(showerror, exception)
+    end
+
+    problem = find_error(expr)
+    problem === nothing || return problem
+
+    if check_packages
+        missing_packages = find_missing_packages(find_packages(expr), project)
+        if !isempty(missing_packages)
+            return "packages not found in the project: " * join(missing_packages, ", ")
+        end
+    end
+    return nothing
+end
+
+open(RESULTS, "w") do io
+    for line in eachline(SCRIPTS)
+        isempty(line) && continue
+        path, project, check_packages = split(line, '\t')
+        problem = check_script(String(path), String(project), check_packages == "1")
+        if problem !== nothing
+            foreach(field -> print(io, field, '\0'), (path, project, problem))
+        end
+    end
+end
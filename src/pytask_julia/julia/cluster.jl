@@ -0,0 +1,98 @@
+# Run the scripts of Julia tasks on a cluster of Distributed.jl workers.
+#
+#     julia -- cluster.jl <socket> <executable> <machine> [<machine> ...]
+#
+# A machine is either a number of local workers like "4", a machine specification for
+# the SSH cluster manager like "user@host", or a specification with a number of workers
+# like "user@host=8". Workers on other machines are started with <executable> and the
+# JULIA_LOAD_PATH of the manager, so that they find PytaskJulia.jl.
+#
+# After the workers are started, the manager listens on the Unix socket <socket>, which
+# is only accessible by the user. Every connection sends one tab-separated request
+#
+#     <script> <serialized> <n_options> [<option> ...] [<setting>=<value> ...]
+#
+# The manager never runs a command from a request. It runs runner.jl with the script,
+# the serialized arguments and the settings as a new process of the Julia of a free
+# worker, and answers with "ok" or "error" followed by the exit code or the error
+# message. The manager stops when stdin is closed.
+
+using Distributed
+using Sockets
+
+
+function parse_machine(machine)
+    spec, count = occursin('=', machine) ? split(machine, '='; limit = 2) : (machine, "1")
+    return String(spec), parse(Int, count)
+end
+
+
+function start_workers(executable, machines)
+    load_path = get(ENV, "JULIA_LOAD_PATH", "")
+    for machine in machines
+        if all(isdigit, machine)
+            addprocs(parse(Int, machine))
+        else
+            addprocs(
+                [parse_machine(machine)];
+                exename = executable,
+                env = ["JULIA_LOAD_PATH" => load_path],
+            )
+        end
+    end
+    return nothing
+end
+
+
+const RUNNER = joinpath(@__DIR__, "runner.jl")
+const SETTINGS = ("profile", "metrics", "products", "checksums")
+
+start_workers(ARGS[2], ARGS[3:end])
+
+@everywhere function run_script(options::Vector{String}, args::Vector{String})
+    julia = joinpath(Sys.BINDIR, Base.julia_exename())
+    return run(ignorestatus(`$julia $options -- $args`)).exitcode
+end
+
+
+"""Parse a request into the options of Julia and the arguments of the runner."""
+function parse_request(request)
+    fields = String.(split(request, '\t'))
+    script, serialized, n = fields[1], fields[2], parse(Int, fields[3])
+    options, settings = fields[4:3+n], fields[4+n:end]
+    for setting in settings
+        first(split(setting, '='; limit = 2)) in SETTINGS ||
+            error("The request has the unknown setting $(repr(setting)).")
+    end
+    return options, [RUNNER, script, serialized, settings...]
+end
+
+
+sanitize(message) = replace(message, r"[\t\n\r]+" => " ")
+
+
+function serve(socket)
+    try
+        options, args = parse_request(readline(socket))
+        exitcode = remotecall_fetch(run_script, default_worker_pool(), options, args)
+        println(socket, exitcode == 0 ? "ok" : "error\t$exitcode")
+    catch exception
+        println(socket, "error\t", sanitize(sprint(showerror, exception)))
+    finally
+        close(socket)
+    end
+    return nothing
+end
+
+
+const SERVER = listen(ARGS[1])
+
+@async while isopen(SERVER)
+    socket = accept(SERVER)
+    @async serve(socket)
+end
+
+while !eof(stdin)
+    readline(stdin)
+end
+close(SERVER)
@@ -0,0 +1,165 @@
+# Run a task script on behalf of pytask-julia.
+#
+#     julia [options] -- runner.jl <script> <serialized> [<setting>=<value> ...]
+#
+# The script is included into Main after ARGS is reset to the path of the serialized
+# arguments, so scripts cannot tell whether they were started directly or through the
+# runner. Settings switch on instrumentation around the script.
+#
+# - profile=<path>    Run the script under the sampling profiler and write the samples
+#                     as folded stacks to <path>.
+# - metrics=<path>    Write the runtime, compilation and GC time, the number of
+#                     collections, allocated bytes and packages whose caches were
+#                     compiled while the script ran as tab-separated lines to <path>.
+# - products=<path>   A file with the paths of products, one per line.
+# - checksums=<path>  After the script succeeded, write the index, size, modification
+#                     time and SHA-256 of every existing product to <path>.
+
+import Profile
+
+const RUNNER = @__FILE__
+const SCRIPT = abspath(ARGS[1])
+const SERIALIZED = ARGS[2]
+const SETTINGS = Dict{String,String}(
+    String(key) => String(value) for (key, value) in
+    (split(setting, "="; limit = 2) for setting in ARGS[3:end])
+)
+
+empty!(ARGS)
+push!(ARGS, SERIALIZED)
+isconst(Base, :PROGRAM_FILE) || Core.eval(Base, :(PROGRAM_FILE = $SCRIPT))
+
+if haskey(SETTINGS, "checksums")
+    import SHA
+end
+
+
+function format_frame(frame)
+    name = string(frame.func, " (", basename(string(frame.file)), ":", frame.line, ")")
+    return replace(name, ";" => ",")
+end
+
+
+"""Write the collected samples as folded stacks, one ``root;...;leaf count`` per line.
+
+Frames of the runner and everything above it are dropped so that stacks start at the
+top level of the script.
+"""
+function write_folded_stacks(path)
+    data, lidict = Profile.retrieve()
+    if isdefined(Profile, :has_meta) && Profile.has_meta(data)
+        data = Profile.strip_meta(data)
+    end
+
+    counts = Dict{String,Int}()
+    frames = Base.StackTraces.StackFrame[]
+    for ip in data
+        if ip != 0
+            for frame in lidict[ip]
+                frame.from_c || push!(frames, frame)
+            end
+            continue
+        end
+
+        cut = findfirst(frame -> string(frame.file) == RUNNER, frames)
+        kept = cut === nothing ? frames : frames[1:cut - 1]
+        if !isempty(kept)
+            stack = join((format_frame(frame) for frame in Iterators.reverse(kept)), ";")
+            counts[stack] = get(counts, stack, 0) + 1
+        end
+        empty!(frames)
+    end
+
+    mkpath(dirname(path))
+    open(path, "w") do io
+        for (stack, count) in counts
+            println(io, stack, " ", count)
+        end
+    end
+end
+
+
+"""Write the checksums of products as tab-separated lines."""
+function write_checksums(path, products)
+    open(path, "w") do io
+        for (index, product) in enumerate(readlines(products))
+            isfile(product) || continue
+            info = stat(product)
+            digest = open(file -> bytes2hex(SHA.sha256(file)), product)
+            println(io, join((index - 1, info.size, info.mtime, digest), '\t'))
+        end
+    end
+end
+
+
+"""Check whether the cache of a package was compiled after `start`."""
+function was_compiled_since(pkg, start)
+    pkg.uuid === nothing && return false
+    return any(path -> mtime(path) >= start, Base.find_all_in_cache_path(pkg))
+end
+
+
+"""Run `f` and write the runtime metrics of Julia as tab-separated lines to `path`.
+
+The metrics are written even if `f` fails, so that failed tasks can be diagnosed.
+"""
+function write_metrics(f, path)
+    loaded = Set(keys(Base.loaded_modules))
+    Base.cumulative_compile_timing(true)
+    compile_before = Base.cumulative_compile_time_ns()
+    gc_before = Base.gc_num()
+    bytes_before = Base.gc_bytes()
+    start = time()
+    try
+        f()
+    finally
+        elapsed = time() - start
+        Base.cumulative_compile_timing(false)
+        compile_after = Base.cumulative_compile_time_ns()
+        gc = Base.GC_Diff(Base.gc_num(), gc_before)
+        compiled = count(
+            pkg -> was_compiled_since(pkg, start),
+            setdiff(keys(Base.loaded_modules), loaded),
+        )
+        metrics = (
+            elapsed = elapsed,
+            compile_time = (compile_after[1] - compile_before[1]) / 1e9,
+            recompile_time = (compile_after[2] - compile_before[2]) / 1e9,
+            gc_time = gc.total_time / 1e9,
+            gc_count = gc.pause,
+            allocated = Base.gc_bytes() - bytes_before,
+            compiled_packages = compiled,
+        )
+        mkpath(dirname(path))
+        open(path, "w") do io
+            for (name, value) in pairs(metrics)
+                println(io, name, '\t', value)
+            end
+        end
+    end
+end
+
+
+function run_script()
+    if haskey(SETTINGS, "profile")
+        Profile.init(n = 5_000_000, delay = 0.01)
+        try
+            Profile.@profile Base.include(Main, SCRIPT)
+        finally
+            write_folded_stacks(SETTINGS["profile"])
+        end
+    else
+        Base.include(Main, SCRIPT)
+    end
+end
+
+
+if haskey(SETTINGS, "metrics")
+    write_metrics(run_script, SETTINGS["metrics"])
+else
+    run_script()
+end
+
+if haskey(SETTINGS, "checksums")
+    write_checksums(SETTINGS["checksums"], SETTINGS["products"])
+end
@@ -0,0 +1,109 @@
+# Run the scripts of Julia tasks one after another in a persistent Julia process.
+#
+#     julia [options] -- session.jl [revise] [transient]
+#
+# Requests arrive as tab-separated lines on stdin and every request is answered with one
+# line on stdout which starts with "ok" or "error". The output of scripts is redirected
+# to stderr so that it cannot interfere with the responses.
+#
+# - run <script> <serialized>  Include the script into a fresh module after ARGS is reset
+#                              to the path of the serialized arguments and PROGRAM_FILE
+#                              to the path of the script. The response lists the paths
+#                              of the objects kept by the script.
+# - spill <path>               Write a kept object to its path.
+# - load <script>              Load the packages which the script imports.
+#
+# Unlike with runner.jl, scripts do not run in Main. Definitions do not leak into later
+# scripts, and `@__MODULE__ == Main` is false, so scripts which only run their code when
+# they are executed directly should check `abspath(PROGRAM_FILE) == @__FILE__` instead.
+#
+# With "revise", Revise.jl is loaded if it is available, and changes to the code of
+# packages and files tracked by Revise.jl are applied before every script.
+#
+# With "transient", scripts run like in fresh Julia processes, so objects are written
+# when they are kept.
+
+using PytaskJulia
+
+const RESPONSES = stdout
+redirect_stdout(stderr)
+
+PytaskJulia.SESSION[] = !("transient" in ARGS)
+
+if "revise" in ARGS
+    try
+        @eval using Revise
+    catch
+        @warn "Revise.jl is not available in the session. Add it to your environment."
+    end
+end
+
+
+function respond(status, fields = String[])
+    println(RESPONSES, join([status; fields], '\t'))
+    flush(RESPONSES)
+    return nothing
+end
+
+
+function load_packages(script)
+    expr = Meta.parseall(read(script, String); filename = script)
+    for package in PytaskJulia.find_packages(expr)
+        # Packages which are missing are reported when the script imports them.
+        try
+            Base.require(Main, Symbol(package))
+        catch
+        end
+    end
+    return String[]
+end
+
+
+# Like modules defined with `module`, the module of a script has its own `eval` and
+# `include`, which a bare `Module` lacks.
+function create_module()
+    mod = Module(:PytaskTask)
+    Core.eval(mod, :(eval(x) = Core.eval($mod, x)))
+    Core.eval(mod, :(include(path) = Base.include($mod, path)))
+    Core.eval(
+        mod, :(include(mapexpr::Function, path) = Base.include(mapexpr, $mod, path))
+    )
+    return mod
+end
+
+
+function run_script(script, serialized)
+    script = abspath(script)
+    empty!(ARGS)
+    push!(ARGS, serialized)
+    isconst(Base, :PROGRAM_FILE) || Core.eval(Base, :(PROGRAM_FILE = $script))
+    empty!(PytaskJulia.KEPT)
+    isdefined(Main, :Revise) && Base.invokelatest(Main.Revise.revise)
+    try
+        Base.include(create_module(), script)
+    finally
+        PytaskJulia.close_channels()
+    end
+    return copy(PytaskJulia.KEPT)
+end
+
+
+while !eof(stdin)
+    command, arguments... = String.(split(readline(stdin), '\t'))
+    try
+        if command == "run"
+            respond("ok", run_script(arguments...))
+        elseif command == "load"
+            respond("ok", load_packages(only(arguments)))
+        elseif command == "spill"
+            PytaskJulia.spill(only(arguments))
+            respond("ok")
+        else
+            error("Unknown request $(repr(command)).")
+        end
+    catch exception
+        showerror(stderr, exception, catch_backtrace())
+        println(stderr)
+        respond("error", [PytaskJulia._sanitize(sprint(showerror, exception))])
+    end
+end
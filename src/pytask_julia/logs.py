@@ -0,0 +1,109 @@
+"""Contains code to capture the output of Julia processes."""
+
+from __future__ import annotations
+
+import gzip
+import threading
+from contextlib import contextmanager
+from typing import IO
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+__all__ = ["LogCapture", "RingBuffer", "capture_log", "get_path_to_log"]
+
+
+_CHUNK_SIZE: int = 64 * 1024
+"""int: The maximum number of bytes read from the output in one go."""
+
+
+def get_path_to_log(path_to_serialized: Path) -> Path:
+    """Get the path to the compressed log of a task.
+
+    Logs are stored in a ``logs`` folder next to the serialized arguments. Since the
+    path to the serialized arguments is the same for every run of a task, only the log
+    of the latest run is kept.
+
+    """
+    return path_to_serialized.parent / "logs" / f"{path_to_serialized.stem}.log.gz"
+
+
+class RingBuffer:
+    """Keep the last bytes written to the buffer.
+
+    The buffer is trimmed only when it has grown to twice its size which keeps the
+    costs of copying low while the memory stays bounded.
+
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._buffer = bytearray()
+        self.is_truncated = False
+
+    def write(self, data: bytes) -> None:
+        """Write data to the buffer."""
+        self._buffer += data
+        if len(self._buffer) > 2 * self.max_size:
+            del self._buffer[: -self.max_size]
+            self.is_truncated = True
+
+    def getvalue(self) -> bytes:
+        """Get the last bytes which were written to the buffer."""
+        if len(self._buffer) > self.max_size:
+            return bytes(self._buffer[-self.max_size :])
+        return bytes(self._buffer)
+
+    def get_tail(self) -> str:
+        """Get the tail as text starting with the first complete line."""
+        value = self.getvalue()
+        if self.is_truncated or len(self._buffer) > self.max_size:
+            _, _, value = value.partition(b"\n")
+        return value.decode(errors="replace")
+
+
+class LogCapture:
+    """Stream the output of a process into a compressed log and a ring buffer."""
+
+    def __init__(self, stream: IO[bytes], path: Path, max_size: int) -> None:
+        self.path = path
+        self.tail = RingBuffer(max_size)
+        self._stream = stream
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Start streaming the output in a background thread."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+
+    def join(self) -> None:
+        """Wait until the stream is closed and the log is written."""
+        self._thread.join()
+
+    def _run(self) -> None:
+        with gzip.open(self.path, "wb", compresslevel=1) as log:
+            while chunk := self._stream.read1(_CHUNK_SIZE):  # ty: ignore[unresolved-attribute]
+                log.write(chunk)
+                self.tail.write(chunk)
+
+    def format_tail(self) -> str:
+        """Format the tail of the output for the report of a failed task."""
+        return (
+            "The last lines of the output of the Julia process follow. The full output "
+            f"is stored in {self.path.as_posix()}.\n\n{self.tail.get_tail()}"
+        )
+
+
+@contextmanager
+def capture_log(
+    stream: IO[bytes], path: Path, max_size: int
+) -> Generator[LogCapture, None, None]:
+    """Capture the output of a process while the context is active."""
+    capture = LogCapture(stream, path, max_size)
+    capture.start()
+    try:
+        yield capture
+    finally:
+        capture.join()
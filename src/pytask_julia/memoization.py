@@ -0,0 +1,71 @@
+"""Contains code to manage the cache of memoized Julia function calls.
+
+Scripts memoize expensive function calls with ``@pytask_cache f(x)`` from the helper
+module ``PytaskJulia``. Results are serialized into a cache which is shared by all tasks
+of a project and whose path is passed under ``_cache`` in the serialized arguments.
+Entries are keyed on the Julia version, the active environment, the script, the call
+and its arguments, and they are written atomically, so parallel tasks can share them.
+
+Julia updates the modification time of an entry whenever it is used. After every build,
+the least recently used entries are evicted until the cache is smaller than
+``julia_cache_max_size``.
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytask import hookimpl
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from pytask import Session
+
+__all__ = ["evict_memoized", "get_path_to_memoized"]
+
+
+def get_path_to_memoized(root: Path) -> Path:
+    """Get the path to the cache of memoized function calls."""
+    return root / ".pytask" / "pytask-julia" / "cache"
+
+
+def evict_memoized(path: Path, max_size: float) -> list[Path]:
+    """Evict the least recently used entries until the cache is small enough.
+
+    Returns the paths of the evicted entries. Entries which are removed concurrently
+    are skipped. Temporary files which Julia writes next to an entry before it renames
+    them into place do not have the suffix of entries and are never evicted.
+
+    """
+    entries = []
+    for file in path.glob("*/*.jls"):
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, file))
+
+    size = sum(entry_size for _, entry_size, _ in entries)
+    evicted = []
+    for _, entry_size, file in sorted(entries):
+        if size <= max_size:
+            break
+        file.unlink(missing_ok=True)
+        size -= entry_size
+        evicted.append(file)
+    return evicted
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build(session: Session) -> Generator[None, None, None]:
+    """Evict memoized function calls after the build."""
+    try:
+        return (yield)
+    finally:
+        evict_memoized(
+            get_path_to_memoized(session.config["root"]),
+            session.config["julia_cache_max_size"],
+        )
@@ -0,0 +1,168 @@
+"""Contains code to report runtime metrics of Julia scripts.
+
+With ``julia_metrics``, the runner measures the time Julia spends compiling and
+collecting garbage, the number of collections, the allocated bytes and the number of
+packages whose caches were compiled instead of loaded while a script runs. The metrics
+are written to a file next to the serialized arguments and summarized at the end of the
+run, where tasks which spend most of their time compiling or collecting garbage are
+flagged.
+
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import fields
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytask import PythonNode
+from pytask import TaskOutcome
+from pytask import console
+from pytask import has_mark
+from pytask import hookimpl
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from pytask import ExecutionReport
+    from pytask import PTask
+    from pytask import Session
+
+__all__ = ["RuntimeMetrics", "get_path_to_metrics", "read_metrics"]
+
+
+_DOMINANT_SHARE: float = 0.5
+"""float: Share of the runtime above which compilation or GC dominates a task."""
+
+
+@dataclass
+class RuntimeMetrics:
+    """The runtime metrics of a Julia script.
+
+    Attributes
+    ----------
+    elapsed
+        Seconds the script ran.
+    compile_time
+        Seconds spent compiling code, including recompilation.
+    recompile_time
+        Seconds spent compiling code again after it was invalidated.
+    gc_time
+        Seconds spent collecting garbage.
+    gc_count
+        Number of garbage collections.
+    allocated
+        Number of allocated bytes.
+    compiled_packages
+        Number of packages whose caches were compiled instead of loaded.
+
+    """
+
+    elapsed: float = 0.0
+    compile_time: float = 0.0
+    recompile_time: float = 0.0
+    gc_time: float = 0.0
+    gc_count: int = 0
+    allocated: int = 0
+    compiled_packages: int = 0
+
+    @property
+    def compile_share(self) -> float:
+        """The share of the runtime spent compiling code."""
+        return self.compile_time / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def gc_share(self) -> float:
+        """The share of the runtime spent collecting garbage."""
+        return self.gc_time / self.elapsed if self.elapsed > 0 else 0.0
+
+    def get_dominant_phases(self) -> list[str]:
+        """Get the phases which take more than half of the runtime."""
+        phases = []
+        if self.compile_share > _DOMINANT_SHARE:
+            phases.append("compilation")
+        if self.gc_share > _DOMINANT_SHARE:
+            phases.append("GC")
+        return phases
+
+
+def get_path_to_metrics(path_to_serialized: Path) -> Path:
+    """Get the path to the metrics which sit next to the serialized arguments."""
+    return path_to_serialized.with_suffix(".metrics")
+
+
+def read_metrics(path: Path) -> RuntimeMetrics:
+    """Read the metrics written by the runner.
+
+    Every line contains the name and the value of a metric separated by a tab. Unknown
+    names and malformed lines are ignored.
+
+    """
+    types = {field.name: field.type for field in fields(RuntimeMetrics)}
+    values: dict[str, float | int] = {}
+    for line in path.read_text().splitlines():
+        name, _, value = line.partition("\t")
+        if name not in types:
+            continue
+        try:
+            values[name] = int(value) if types[name] == "int" else float(value)
+        except ValueError:
+            continue
+    return RuntimeMetrics(**values)  # ty: ignore[invalid-argument-type]
+
+
+@hookimpl
+def pytask_execute_log_end(session: Session, reports: list[ExecutionReport]) -> None:
+    """Log the runtime metrics of executed Julia tasks."""
+    if not session.config["julia_metrics"]:
+        return
+
+    metrics = {}
+    for report in reports:
+        if report.outcome not in (TaskOutcome.SUCCESS, TaskOutcome.FAIL):
+            continue
+        path = _get_metrics_of_task(report.task)
+        if path is not None:
+            metrics[report.task.name] = read_metrics(path)
+
+    if not metrics:
+        return
+
+    table = Table(title="Runtime metrics of Julia tasks")
+    table.add_column("Task", overflow="fold")
+    table.add_column("Time", justify="right")
+    table.add_column("Compilation", justify="right")
+    table.add_column("GC", justify="right")
+    table.add_column("Collections", justify="right")
+    table.add_column("Allocated", justify="right")
+    table.add_column("Compiled packages", justify="right")
+    table.add_column("Dominated by")
+    ranked = sorted(metrics.items(), key=lambda item: item[1].elapsed, reverse=True)
+    for name, task_metrics in ranked[: session.config["n_entries_in_table"]]:
+        table.add_row(
+            name,
+            f"{task_metrics.elapsed:.2f}s",
+            f"{task_metrics.compile_share:.1%}",
+            f"{task_metrics.gc_share:.1%}",
+            str(task_metrics.gc_count),
+            f"{task_metrics.allocated / 1024**2:.1f} MiB",
+            str(task_metrics.compiled_packages),
+            "[warning]" + ", ".join(task_metrics.get_dominant_phases()) + "[/]",
+        )
+
+    console.print()
+    console.print(table)
+    console.print()
+
+
+def _get_metrics_of_task(task: PTask) -> Path | None:
+    """Get the path to the metrics of a task if the task was measured."""
+    if not has_mark(task, "julia"):
+        return None
+    serialized_node = task.depends_on.get("_serialized")
+    if not isinstance(serialized_node, PythonNode) or not isinstance(
+        serialized_node.value, Path
+    ):
+        return None
+    path = get_path_to_metrics(serialized_node.value)
+    return path if path.exists() else None
@@ -0,0 +1,48 @@
+"""Contains nodes for data exchanged between Julia tasks and other tasks."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from pytask import PathNode
+
+from pytask_julia.sessions import get_token
+
+__all__ = ["JuliaObjectNode"]
+
+
+@dataclass(kw_only=True)
+class JuliaObjectNode(PathNode):
+    """A node for a Julia object which can stay in the memory of a Julia session.
+
+    Julia scripts store the object with ``PytaskJulia.keep(config, name, object)`` and
+    retrieve it with ``PytaskJulia.take(config, name)``. With ``julia_session``, the
+    object is handed by reference to later Julia tasks in the same session and written
+    to :attr:`path` only when a task outside of the session needs it or the session
+    ends. Other tasks receive the path.
+
+    Attributes
+    ----------
+    name
+        Name of the node which makes it identifiable in the DAG.
+    path
+        The path to which the object is written.
+
+    """
+
+    def state(self) -> str | None:
+        """Calculate the state of the node.
+
+        The state is given by the token of an object kept in a session or by the
+        modification time of the file. Both are equal after an object is written, and
+        the file is never read to compute the state.
+
+        """
+        token = get_token(self.path) if isinstance(self.path, Path) else None
+        if token is not None:
+            return str(token)
+        try:
+            return str(self.path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            return None
@@ -6,9 +6,29 @@ from typing import TYPE_CHECKING
 
 from pytask import hookimpl
 
+from pytask_julia import arrow
+from pytask_julia import build
+from pytask_julia import checkpoints
+from pytask_julia import checks
+from pytask_julia import checksums
+from pytask_julia import cluster
 from pytask_julia import collect
 from pytask_julia import config
+from pytask_julia import daemon
+from pytask_julia import depots
 from pytask_julia import execute
+from pytask_julia import memoization
+from pytask_julia import metrics
+from pytask_julia import prewarm
+from pytask_julia import profiling
+from pytask_julia import progress
+from pytask_julia import results
+from pytask_julia import sessions
+from pytask_julia import shards
+from pytask_julia import staging
+from pytask_julia import tables
+from pytask_julia import tracing
+from pytask_julia import watch
 
 if TYPE_CHECKING:
     from pluggy import PluginManager
@@ -17,6 +37,26 @@ if TYPE_CHECKING:
 @hookimpl
 def pytask_add_hooks(pm: PluginManager) -> None:
     """Register hook implementations."""
+    pm.register(arrow)
+    pm.register(build)
+    pm.register(checkpoints)
+    pm.register(checks)
+    pm.register(checksums)
+    pm.register(cluster)
     pm.register(collect)
     pm.register(config)
+    pm.register(daemon)
+    pm.register(depots)
     pm.register(execute)
+    pm.register(memoization)
+    pm.register(metrics)
+    pm.register(prewarm)
+    pm.register(profiling)
+    pm.register(progress)
+    pm.register(results)
+    pm.register(sessions)
+    pm.register(shards)
+    pm.register(staging)
+    pm.register(tables)
+    pm.register(tracing)
+    pm.register(watch)
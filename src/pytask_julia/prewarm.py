@@ -0,0 +1,203 @@
+"""Contains code to pre-warm Julia processes for tasks which are about to be executed.
+
+Starting Julia and loading packages often takes longer than the script of a task. With
+``julia_prewarm = n``, pytask-julia starts up to ``n`` Julia processes speculatively for
+Julia tasks whose upstream tasks are running, and the processes load the packages of
+the scripts while they wait. Once the task is executed, its script is run in the
+pre-warmed process instead of a new process.
+
+Pre-warmed processes which are not used are stopped at the end of the build.
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import ExecutionReport
+from pytask import PathNode
+from pytask import PTask
+from pytask import PythonNode
+from pytask import Session
+from pytask import get_marks
+from pytask import hookimpl
+
+from pytask_julia.sessions import JuliaSession
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterator
+    from pathlib import Path
+
+__all__ = ["prewarm", "run_prewarmed", "stop_prewarmed", "take_prewarmed"]
+
+
+_PREWARMED: dict[tuple[str, ...], list[JuliaSession]] = {}
+"""dict[tuple[str, ...], list[JuliaSession]]: Pre-warmed processes by their commands."""
+
+_PREWARMED_TASKS: dict[str, JuliaSession] = {}
+"""dict[str, JuliaSession]: Processes pre-warmed for tasks by their signatures."""
+
+_FINISHED_TASKS: set[str] = set()
+"""set[str]: Signatures of tasks which are finished in the current build."""
+
+
+def prewarm(cmd: list[str], script: str) -> JuliaSession:
+    """Start a Julia process which loads the packages of a script."""
+    process = JuliaSession(cmd, transient=True)
+    process.send("load", script)
+    _PREWARMED.setdefault(tuple(cmd), []).append(process)
+    return process
+
+
+def _stop(process: JuliaSession) -> None:
+    process.process.kill()
+    process.process.wait()
+
+
+def take_prewarmed(cmd: list[str]) -> JuliaSession | None:
+    """Take a pre-warmed process for a command or return ``None``.
+
+    The process has finished loading packages when it is returned.
+
+    """
+    processes = _PREWARMED.get(tuple(cmd), [])
+    while processes:
+        process = processes.pop(0)
+        if process.process.poll() is not None:
+            continue
+        try:
+            process.receive("load")
+        except RuntimeError:
+            _stop(process)
+            continue
+        return process
+    return None
+
+
+def run_prewarmed(cmd: list[str], script: Path, serialized: Path) -> bool:
+    """Run a script in a pre-warmed process if one is available for the command."""
+    process = take_prewarmed(cmd)
+    if process is None:
+        return False
+
+    print("Executing " + " ".join(cmd) + " in a pre-warmed process.")  # noqa: T201
+    try:
+        process.run(script, serialized)
+    finally:
+        process.close()
+    return True
+
+
+def stop_prewarmed() -> None:
+    """Stop all pre-warmed processes which were not used."""
+    for processes in _PREWARMED.values():
+        for process in processes:
+            _stop(process)
+    _PREWARMED.clear()
+    _PREWARMED_TASKS.clear()
+    _FINISHED_TASKS.clear()
+
+
+def get_command(task: PTask) -> list[str] | None:
+    """Get the command of a Julia task if it can run in a pre-warmed process.
+
+    Tasks which are profiled or measured, whose output is captured, which can stall or
+    which run in sessions, in the daemon, on a cluster, with a depot or with pinned
+    cores need their own process.
+
+    """
+    values: dict[str, Any] = {
+        name: node.value
+        for name, node in task.depends_on.items()
+        if isinstance(node, PythonNode)
+    }
+    settings = values["_settings"]
+    if any(
+        settings[name]
+        for name in (
+            "profile",
+            "metrics",
+            "stall_timeout",
+            "log_tail",
+            "depot",
+            "session",
+            "checksums",
+            "cluster",
+            "daemon",
+            "cores",
+        )
+    ):
+        return None
+    return [settings["executable"], *(values["_options"] or []), *values["_project"]]
+
+
+def _iter_neighbor_tasks(
+    session: Session, signature: str, *, downstream: bool
+) -> Iterator[PTask]:
+    """Iterate over the tasks which directly depend on a task or which it depends on."""
+    dag = session.dag
+    neighbors = dag.successors if downstream else dag.predecessors
+    for node in neighbors(signature):
+        for other in neighbors(node):
+            task = dag.nodes[other]
+            if isinstance(task, PTask):
+                yield task
+
+
+@hookimpl
+def pytask_execute_task_setup(session: Session, task: PTask) -> None:
+    """Pre-warm processes for Julia tasks which wait only for this task."""
+    limit = session.config["julia_prewarm"]
+    if not limit or session.config.get("n_workers", 1) > 1:
+        return
+
+    for downstream in _iter_neighbor_tasks(session, task.signature, downstream=True):
+        if (
+            downstream.signature in _PREWARMED_TASKS
+            or sum(map(len, _PREWARMED.values())) >= limit
+        ):
+            continue
+        marks = get_marks(downstream, "julia")
+        if not marks:
+            continue
+        if any(
+            upstream.signature not in _FINISHED_TASKS
+            and upstream.signature != task.signature
+            for upstream in _iter_neighbor_tasks(
+                session, downstream.signature, downstream=False
+            )
+        ):
+            continue
+        cmd = get_command(downstream)
+        script = downstream.depends_on["_script"]
+        if cmd is not None and isinstance(script, PathNode):
+            _PREWARMED_TASKS[downstream.signature] = prewarm(cmd, str(script.path))
+
+
+@hookimpl
+def pytask_execute_task_process_report(report: ExecutionReport) -> None:
+    """Remember finished tasks and stop their processes if they were not used.
+
+    A process is not used if the task was skipped, for example, because it did not
+    change, and it frees the slot for another task.
+
+    """
+    _FINISHED_TASKS.add(report.task.signature)
+    process = _PREWARMED_TASKS.pop(report.task.signature, None)
+    if process is None:
+        return
+    for processes in _PREWARMED.values():
+        if process in processes:
+            processes.remove(process)
+            _stop(process)
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build() -> Generator[None, None, None]:
+    """Stop unused pre-warmed processes at the end of the build."""
+    try:
+        return (yield)
+    finally:
+        stop_prewarmed()
@@ -0,0 +1,130 @@
+"""Contains code to summarize profiles of Julia scripts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytask import PythonNode
+from pytask import console
+from pytask import has_mark
+from pytask import hookimpl
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from pytask import ExecutionReport
+    from pytask import PTask
+    from pytask import Session
+
+__all__ = ["get_path_to_profile", "summarize_profiles"]
+
+
+@dataclass
+class FrameStatistics:
+    """Samples of a single frame accumulated over all profiled tasks."""
+
+    frame: str
+    self_samples: int = 0
+    total_samples: int = 0
+    tasks: set[str] = field(default_factory=set)
+
+
+def get_path_to_profile(path_to_serialized: Path) -> Path:
+    """Get the path to the profile which sits next to the serialized arguments."""
+    return path_to_serialized.with_suffix(".folded")
+
+
+def read_folded_stacks(path: Path) -> dict[tuple[str, ...], int]:
+    """Read a file with folded stacks.
+
+    Every line contains the frames of a stack from the root to the leaf separated by
+    semicolons, followed by a space and the number of samples.
+
+    """
+    stacks: dict[tuple[str, ...], int] = {}
+    for line in path.read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        if not stack or not count.isdigit():
+            continue
+        frames = tuple(stack.split(";"))
+        stacks[frames] = stacks.get(frames, 0) + int(count)
+    return stacks
+
+
+def summarize_profiles(profiles: dict[str, Path]) -> list[FrameStatistics]:
+    """Rank frames of multiple profiles by the number of samples spent in the frame.
+
+    Self samples count the samples where the frame is the leaf of the stack. Total
+    samples count every sample where the frame appears somewhere on the stack.
+
+    """
+    statistics: dict[str, FrameStatistics] = {}
+    for task_name, path in profiles.items():
+        for frames, count in read_folded_stacks(path).items():
+            for frame in set(frames):
+                stats = statistics.setdefault(frame, FrameStatistics(frame))
+                stats.total_samples += count
+                stats.tasks.add(task_name)
+            statistics[frames[-1]].self_samples += count
+
+    return sorted(
+        statistics.values(),
+        key=lambda stats: (stats.self_samples, stats.total_samples),
+        reverse=True,
+    )
+
+
+@hookimpl
+def pytask_execute_log_end(session: Session, reports: list[ExecutionReport]) -> None:
+    """Log a summary of the hottest frames over all profiled Julia tasks."""
+    if not session.config["julia_profile"]:
+        return
+
+    profiles = {}
+    for report in reports:
+        path = _get_profile_of_task(report.task)
+        if path is not None:
+            profiles[report.task.name] = path
+
+    if not profiles:
+        return
+
+    statistics = summarize_profiles(profiles)
+    n_samples = sum(stats.self_samples for stats in statistics) or 1
+
+    table = Table(title="Hottest frames in Julia tasks")
+    table.add_column("Frame", overflow="fold")
+    table.add_column("Self", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Tasks", justify="right")
+    for stats in statistics[: session.config["n_entries_in_table"]]:
+        table.add_row(
+            stats.frame,
+            f"{stats.self_samples / n_samples:.1%}",
+            f"{stats.total_samples / n_samples:.1%}",
+            str(len(stats.tasks)),
+        )
+
+    console.print()
+    console.print(table)
+    console.print(
+        f"Profiles of {len(profiles)} tasks are stored as folded stacks next to their "
+        "serialized arguments, for example, "
+        f"{next(iter(profiles.values())).as_posix()}."
+    )
+    console.print()
+
+
+def _get_profile_of_task(task: PTask) -> Path | None:
+    """Get the path to the profile of a task if the task was profiled."""
+    if not has_mark(task, "julia"):
+        return None
+    serialized_node = task.depends_on.get("_serialized")
+    if not isinstance(serialized_node, PythonNode) or not isinstance(
+        serialized_node.value, Path
+    ):
+        return None
+    path = get_path_to_profile(serialized_node.value)
+    return path if path.exists() else None
@@ -0,0 +1,219 @@
+"""Contains code to follow the progress which Julia scripts report through a channel.
+
+Each task receives the path to a channel under ``_channel`` in the serialized
+arguments. The channel is an append-only file where the Julia helper module
+``PytaskJulia`` writes one tab-separated message per line. A message starts with a
+timestamp and the kind of the message, followed by the fields of the message.
+
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytask import PythonNode
+from pytask import console
+from pytask import has_mark
+from pytask import hookimpl
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from pytask import ExecutionReport
+    from pytask import PTask
+    from pytask import Session
+
+__all__ = ["Progress", "get_path_to_channel", "read_channel"]
+
+
+_REFRESH_INTERVAL: float = 0.5
+"""float: Seconds between two updates of the progress of running tasks."""
+
+
+@dataclass
+class Progress:
+    """The progress of a task accumulated from the messages in its channel."""
+
+    fraction: float | None = None
+    message: str = ""
+    metrics: dict[str, str] = field(default_factory=dict)
+    last_message: float | None = None
+    offset: int = 0
+
+    def update(self, line: str) -> None:
+        """Update the progress with a single message."""
+        timestamp, _, rest = line.partition("\t")
+        kind, _, rest = rest.partition("\t")
+        try:
+            self.last_message = float(timestamp)
+        except ValueError:
+            return
+
+        if kind == "progress":
+            fraction, _, message = rest.partition("\t")
+            try:
+                self.fraction = float(fraction)
+            except ValueError:
+                return
+            self.message = message
+        elif kind == "metric":
+            name, _, value = rest.partition("\t")
+            self.metrics[name] = value
+
+    def format(self) -> str:
+        """Format the progress for the report in the console."""
+        parts = ["running"]
+        if self.fraction is not None:
+            parts.append(f"{self.fraction:.0%}")
+        if self.message:
+            parts.append(self.message)
+        parts.extend(f"{name}={value}" for name, value in self.metrics.items())
+        return " ".join(parts)
+
+
+def get_path_to_channel(path_to_serialized: Path) -> Path:
+    """Get the path to the channel which sits next to the serialized arguments."""
+    return path_to_serialized.with_suffix(".channel")
+
+
+def read_channel(path: Path, progress: Progress) -> Progress:
+    """Read new messages from the channel and update the progress.
+
+    Only complete lines are consumed. The offset is stored in the progress so that every
+    message is read exactly once.
+
+    """
+    try:
+        with path.open("rb") as f:
+            f.seek(progress.offset)
+            content = f.read()
+    except FileNotFoundError:
+        return progress
+
+    complete, _, _ = content.rpartition(b"\n")
+    if not complete:
+        return progress
+
+    progress.offset += len(complete) + 1
+    for line in complete.decode(errors="replace").splitlines():
+        progress.update(line)
+    return progress
+
+
+def is_stalled(path: Path, stall_timeout: float | None) -> bool:
+    """Check whether a script has not sent any message for too long.
+
+    The clock only starts with the first message so that scripts which do not use the
+    channel are never considered stalled.
+
+    """
+    if stall_timeout is None:
+        return False
+    try:
+        last_modified = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return time.time() - last_modified > stall_timeout
+
+
+@dataclass
+class ProgressMonitor:
+    """Report the progress of running Julia tasks while they run in other processes.
+
+    A background thread polls the channels of running tasks and prints new progress
+    through the console of pytask, which shows it above the table of the live display.
+    The table itself is left to pytask.
+
+    Progress can only be shown while tasks run in other processes with pytask-parallel.
+    Otherwise, pytask captures the output while a task is running and the progress ends
+    up in the captured output of the task.
+
+    """
+
+    running_tasks: dict[str, tuple[str, Path, Progress]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _stop: threading.Event = field(default_factory=threading.Event)
+    _thread: threading.Thread | None = None
+
+    def add(self, task: PTask, path: Path) -> None:
+        with self._lock:
+            self.running_tasks[task.signature] = (task.name, path, Progress())
+
+    def remove(self, task: PTask) -> None:
+        """Stop following a task after reporting the messages of its last poll."""
+        with self._lock:
+            entry = self.running_tasks.pop(task.signature, None)
+            if entry is not None:
+                self._report(*entry)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(_REFRESH_INTERVAL):
+            with self._lock:
+                for entry in self.running_tasks.values():
+                    self._report(*entry)
+
+    @staticmethod
+    def _report(name: str, path: Path, progress: Progress) -> None:
+        old_offset = progress.offset
+        read_channel(path, progress)
+        if progress.offset != old_offset:
+            console.print(f"{name} {progress.format()}", highlight=False)
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build(session: Session) -> Generator[None, None, None]:
+    """Follow the progress of running Julia tasks during the execution."""
+    if session.config.get("n_workers", 1) <= 1:
+        return (yield)
+
+    monitor = ProgressMonitor()
+    session.config["_julia_progress_monitor"] = monitor
+    monitor.start()
+    try:
+        return (yield)
+    finally:
+        monitor.stop()
+        session.config.pop("_julia_progress_monitor")
+
+
+@hookimpl(trylast=True)
+def pytask_execute_task_setup(session: Session, task: PTask) -> None:
+    """Start following the progress of a Julia task."""
+    monitor = session.config.get("_julia_progress_monitor")
+    if monitor is None or not has_mark(task, "julia"):
+        return
+
+    serialized_node = task.depends_on["_serialized"]
+    if isinstance(serialized_node, PythonNode) and isinstance(
+        serialized_node.value, Path
+    ):
+        monitor.add(task, get_path_to_channel(serialized_node.value))
+
+
+@hookimpl
+def pytask_execute_task_process_report(
+    session: Session, report: ExecutionReport
+) -> None:
+    """Report the last progress of a Julia task and stop following it.
+
+    The process of the task has exited, so the channel is drained one last time to show
+    the messages which were sent after the last poll.
+
+    """
+    monitor = session.config.get("_julia_progress_monitor")
+    if monitor is not None:
+        monitor.remove(report.task)
@@ -0,0 +1,121 @@
+"""Contains code to store small values returned by Julia scripts in Python nodes.
+
+Products which are :class:`~pytask.PythonNode` do not need a file. Julia scripts store
+their values with ``PytaskJulia.result(config, name, value)`` in a TOML file next to
+the serialized arguments, whose path is passed under ``_results``. After the script
+finished, the values are read and saved in the nodes, so downstream tasks receive them
+directly.
+
+The name of a result is the name of the product, for example, ``"fit"`` for the argument
+``fit`` or ``"return"`` for the return annotation. For products nested in containers,
+the keys are joined with dots, like ``"produces.mean"``. The serialized arguments map
+every product to its name.
+
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import NodeNotFoundError
+from pytask import PythonNode
+from pytask import has_mark
+from pytask import hookimpl
+from pytask.tree_util import tree_flatten_with_path
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+if TYPE_CHECKING:
+    from pytask import PTask
+    from pytask import Session
+
+__all__ = [
+    "check_return_annotation",
+    "get_path_to_results",
+    "get_result_name",
+    "get_result_nodes",
+    "save_results",
+]
+
+
+def check_return_annotation(name: str, products: dict[str, Any]) -> None:
+    """Check that the return annotation of a Julia task is a single ``PythonNode``.
+
+    pytask stores the return value of the task function in the nodes of the return
+    annotation. Julia tasks return nothing, and only a single ``PythonNode`` receives
+    its value from the results instead.
+
+    """
+    if "return" in products and not isinstance(products["return"], PythonNode):
+        msg = (
+            f"The return annotation of the Julia task {name!r} must be a single "
+            "PythonNode, like '-> Annotated[int, PythonNode(name=\"n\")]'. Use "
+            "products with a PythonNode for every value to return more than one "
+            "value."
+        )
+        raise ValueError(msg)
+
+
+def get_path_to_results(path_to_serialized: Path) -> Path:
+    """Get the path to the results which sit next to the serialized arguments."""
+    return path_to_serialized.with_suffix(".results.toml")
+
+
+def get_result_name(path: tuple[Any, ...]) -> str:
+    """Get the name of a result from the path of its node in the products."""
+    return ".".join(str(key) for key in path)
+
+
+def get_result_nodes(task: PTask) -> dict[str, PythonNode]:
+    """Get the products of a task which receive results by their names."""
+    paths, nodes, _ = tree_flatten_with_path(task.produces)  # ty: ignore[invalid-argument-type]
+    return {
+        get_result_name(path): node
+        for path, node in zip(paths, nodes, strict=True)
+        if isinstance(node, PythonNode)
+    }
+
+
+def save_results(task: PTask, path: Path) -> None:
+    """Read the results written by Julia and save them in the products."""
+    nodes = get_result_nodes(task)
+    if not nodes:
+        return
+
+    results: dict[str, Any] = {}
+    if path.exists():
+        with path.open("rb") as f:
+            results = tomllib.load(f)
+
+    missing = sorted(set(nodes) - set(results))
+    if missing:
+        names = ", ".join(repr(name) for name in missing)
+        msg = (
+            f"The Julia script of task {task.name!r} did not return the results "
+            f"{names}. Store them with 'PytaskJulia.result(config, name, value)'."
+        )
+        raise NodeNotFoundError(msg)
+
+    for name, node in nodes.items():
+        node.save(results[name])
+
+
+@hookimpl(tryfirst=True)
+def pytask_execute_task_teardown(session: Session, task: PTask) -> None:  # noqa: ARG001
+    """Save the results of a Julia task before pytask determines states of products."""
+    if not has_mark(task, "julia"):
+        return
+
+    serialized_node = task.depends_on.get("_serialized")
+    if not isinstance(serialized_node, PythonNode) or not isinstance(
+        serialized_node.value, Path
+    ):
+        return
+
+    save_results(task, get_path_to_results(serialized_node.value))
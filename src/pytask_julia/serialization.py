@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-import uuid
+import math
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
@@ -16,7 +16,12 @@ from pytask import PTaskWithPath
 if TYPE_CHECKING:
     from collections.abc import Callable
 
-__all__ = ["SERIALIZERS", "create_path_to_serialized", "serialize_keyword_arguments"]
+__all__ = [
+    "SERIALIZERS",
+    "create_path_to_serialized",
+    "dumps_toml",
+    "serialize_keyword_arguments",
+]
 
 _HIDDEN_FOLDER = ".pytask/pytask-julia"
 
@@ -26,8 +31,69 @@ class SerializerConfig(TypedDict):
     suffix: str
 
 
+def _format_toml_string(value: str) -> str:
+    """Format a string as a basic string in TOML.
+
+    JSON strings are valid basic strings in TOML if characters outside of ASCII are not
+    escaped, since TOML does not allow the surrogate pairs which JSON uses for them.
+    Only the delete character needs to be escaped in addition.
+
+    """
+    return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+
+
+def _format_toml_value(value: Any, key: str) -> str:
+    """Format a value as a TOML value on a single line."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, float) and not math.isfinite(value):
+        return "nan" if math.isnan(value) else f"{'-' if value < 0 else ''}inf"
+    if isinstance(value, int | float):
+        return repr(value)
+    if isinstance(value, str | Path):
+        return _format_toml_string(str(value))
+    if isinstance(value, dict):
+        items = ", ".join(
+            f"{_format_toml_string(str(k))} = {_format_toml_value(v, f'{key}.{k}')}"
+            for k, v in value.items()
+            if v is not None
+        )
+        return f"{{ {items} }}" if items else "{}"
+    if isinstance(value, list | tuple):
+        values = (_format_toml_value(v, f"{key}[{i}]") for i, v in enumerate(value))
+        return f"[{', '.join(values)}]"
+    if value is None:
+        msg = (
+            f"The argument {key!r} is None, which cannot be serialized to TOML since "
+            "TOML has no null value. Only keys with None are left out."
+        )
+        raise TypeError(msg)
+    msg = (
+        f"The argument {key!r} of type {type(value).__name__} is not TOML "
+        "serializable. Use numbers, strings, booleans, paths, and lists or "
+        "dictionaries of them."
+    )
+    raise TypeError(msg)
+
+
+def dumps_toml(data: dict[str, Any]) -> str:
+    """Serialize keyword arguments to TOML.
+
+    Julia reads TOML with its standard library, so scripts do not need to load a
+    package like JSON.jl to read their arguments. Keys with ``None`` are left out since
+    TOML has no null value.
+
+    """
+    return "".join(
+        f"{_format_toml_string(str(key))} = {_format_toml_value(value, str(key))}\n"
+        for key, value in data.items()
+        if value is not None
+    )
+
+
 SERIALIZERS: dict[str, SerializerConfig] = {
     "json": {"serializer": json.dumps, "suffix": ".json"},
+    "toml": {"serializer": dumps_toml, "suffix": ".toml"},
 }
 
 try:
@@ -43,10 +109,16 @@ else:
 
 
 def create_path_to_serialized(task: PTask, suffix: str) -> Path:
-    """Create path to serialized."""
+    """Create path to serialized.
+
+    The name is the signature of the task, so the serialized arguments and the files
+    next to them, like the log, replace the ones of the previous run of the task instead
+    of accumulating.
+
+    """
     return (
         (task.path.parent if isinstance(task, PTaskWithPath) else Path.cwd())
-        .joinpath(_HIDDEN_FOLDER, str(uuid.uuid4()))
+        .joinpath(_HIDDEN_FOLDER, task.signature)
         .with_suffix(suffix)
     )
 
@@ -66,4 +138,4 @@ def serialize_keyword_arguments(
         raise ValueError(msg)
 
     serialized = serializer_func(kwargs)
-    path_to_serialized.write_text(serialized)
+    path_to_serialized.write_text(serialized, encoding="utf-8")
@@ -0,0 +1,220 @@
+"""Contains code to run Julia tasks in persistent Julia sessions.
+
+With ``julia_session``, scripts of Julia tasks are included one after another into a
+long-running Julia process instead of starting a new process per task. Tasks with the
+same executable, options and project share a session.
+
+Objects of products declared with :class:`~pytask_julia.nodes.JuliaObjectNode` stay in
+the memory of the session and are handed by reference to later Julia tasks in the same
+session. An object is only written to disk when a task outside of the session depends on
+it or when the sessions are closed at the end of the build.
+
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import PPathNode
+from pytask import PTask
+from pytask import Session
+from pytask import has_mark
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+
+from pytask_julia.shared import JULIA_FOLDER
+from pytask_julia.shared import create_environment
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = ["JuliaSession", "close_sessions", "get_session", "get_token"]
+
+_SESSION_SCRIPT: Path = JULIA_FOLDER / "session.jl"
+"""Path: The Julia script which serves requests of a session."""
+
+
+@dataclass
+class _KeptObject:
+    """An object which is kept in the memory of a session."""
+
+    session: JuliaSession
+    token: int
+    spilled: bool = False
+
+
+_KEPT_OBJECTS: dict[Path, _KeptObject] = {}
+"""dict[Path, _KeptObject]: Objects kept in sessions by the paths of their products."""
+
+
+class JuliaSession:
+    """A persistent Julia process which runs scripts of tasks.
+
+    Parameters
+    ----------
+    cmd : list[str]
+        The command without the session script, the executable with options.
+    revise : bool
+        Whether Revise.jl applies changes to code before every script.
+    transient : bool
+        Whether scripts run like in fresh Julia processes. Objects of
+        :class:`~pytask_julia.nodes.JuliaObjectNode` are written immediately then.
+    cwd : Path | None
+        The working directory of the session. By default, the current one.
+    env : dict[str, str] | None
+        The environment of the session. By default, the one of a Julia process.
+
+    """
+
+    def __init__(
+        self,
+        cmd: list[str],
+        *,
+        revise: bool = False,
+        transient: bool = False,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+    ) -> None:
+        flags = [*(["revise"] if revise else []), *(["transient"] if transient else [])]
+        self.process = subprocess.Popen(  # noqa: S603
+            [*cmd, "--", str(_SESSION_SCRIPT), *flags],
+            cwd=cwd,
+            env=create_environment() if env is None else env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+
+    def request(self, *fields: str) -> list[str]:
+        """Send a request and return the fields of the response."""
+        self.send(*fields)
+        return self.receive(*fields)
+
+    def send(self, *fields: str) -> None:
+        """Send a request without waiting for the response."""
+        stdin, _ = self._get_streams()
+        stdin.write("\t".join(fields) + "\n")
+        stdin.flush()
+
+    def receive(self, *fields: str) -> list[str]:
+        """Receive the response to the request with the fields."""
+        _, stdout = self._get_streams()
+        response = stdout.readline()
+        if not response:
+            msg = f"The Julia session {self.process.args} exited unexpectedly."
+            raise RuntimeError(msg)
+
+        status, *values = response.rstrip("\n").split("\t")
+        if status != "ok":
+            msg = f"{fields[0].capitalize()} {fields[1:]} failed in the Julia session."
+            raise RuntimeError(msg + "".join(f"\n\n{value}" for value in values))
+        return values
+
+    def run(self, script: Path, serialized: Path) -> None:
+        """Run a script and register the objects it keeps."""
+        kept = self.request("run", str(script), str(serialized))
+        token = time.time_ns()
+        for path in kept:
+            _KEPT_OBJECTS[Path(path)] = _KeptObject(session=self, token=token)
+
+    def close(self) -> None:
+        """Stop the session after all requests are answered."""
+        stdin, _ = self._get_streams()
+        stdin.close()
+        self.process.wait()
+
+    def _get_streams(self) -> tuple[IO[str], IO[str]]:
+        if self.process.stdin is None or self.process.stdout is None:
+            msg = "The Julia session has no pipes."
+            raise RuntimeError(msg)
+        return self.process.stdin, self.process.stdout
+
+
+_SESSIONS: dict[tuple[str, ...], JuliaSession] = {}
+"""dict[tuple[str, ...], JuliaSession]: Running sessions by their commands."""
+
+
+def get_session(cmd: list[str], *, revise: bool = False) -> JuliaSession:
+    """Get the session for a command and start it if necessary."""
+    key = (*cmd, str(revise))
+    session = _SESSIONS.get(key)
+    if session is None or session.process.poll() is not None:
+        session = _SESSIONS[key] = JuliaSession(cmd, revise=revise)
+    return session
+
+
+def get_token(path: Path) -> int | None:
+    """Get the token of an object kept in a session or ``None``."""
+    kept = _KEPT_OBJECTS.get(path)
+    return None if kept is None else kept.token
+
+
+def spill_object(path: Path) -> None:
+    """Write an object kept in a session to its path.
+
+    The modification time of the file is set to the token of the object so that the
+    state of the product does not change by writing it.
+
+    """
+    kept = _KEPT_OBJECTS[path]
+    if not kept.spilled:
+        kept.session.request("spill", str(path))
+        os.utime(path, ns=(kept.token, kept.token))
+        kept.spilled = True
+
+
+def spill_objects_from_other_sessions(session: JuliaSession, kwargs: Any) -> None:
+    """Spill objects which a task needs, but which are kept in other sessions."""
+    for value in tree_leaves(kwargs):
+        kept = _KEPT_OBJECTS.get(value) if isinstance(value, Path) else None
+        if kept is not None and kept.session is not session:
+            spill_object(value)
+
+
+def close_sessions() -> None:
+    """Spill all kept objects and stop all sessions.
+
+    Objects of sessions which crashed are lost, and their tasks are executed again in
+    the next run.
+
+    """
+    for path in list(_KEPT_OBJECTS):
+        with suppress(OSError, RuntimeError):
+            spill_object(path)
+    _KEPT_OBJECTS.clear()
+
+    for session in _SESSIONS.values():
+        session.close()
+    _SESSIONS.clear()
+
+
+@hookimpl(wrapper=True)
+def pytask_execute_build(session: Session) -> Generator[None, None, None]:
+    """Close all sessions at the end of the build.
+
+    While Julia tasks are watched, sessions are kept alive for the next build.
+
+    """
+    try:
+        return (yield)
+    finally:
+        if not session.config.get("_julia_watch", False):
+            close_sessions()
+
+
+@hookimpl
+def pytask_execute_task_setup(session: Session, task: PTask) -> None:
+    """Spill objects kept in sessions which a task outside of Julia depends on."""
+    if not session.config["julia_session"] or has_mark(task, "julia"):
+        return
+    for node in tree_leaves(task.depends_on):  # ty: ignore[invalid-argument-type]
+        if isinstance(node, PPathNode) and node.path in _KEPT_OBJECTS:
+            spill_object(node.path)
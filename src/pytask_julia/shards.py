@@ -0,0 +1,222 @@
+"""Contains code to split Julia tasks into shards.
+
+A task with ``@pytask.mark.julia(script=..., shards=n)`` is collected like any other
+task and replaced by ``n`` tasks after the collection. Each shard receives its index
+under ``_shard`` and the number of shards under ``_n_shards`` in the serialized
+arguments. ``{shard}`` in the paths of dependencies and products is replaced with the
+index of the shard.
+
+If the mark has a ``merge`` script, another task executes it once all shards are
+finished. It receives the products of all shards under ``_shard_products`` and is
+responsible for all products whose paths do not contain ``{shard}``.
+
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import NodeInfo
+from pytask import PathNode
+from pytask import PTask
+from pytask import PTaskWithPath
+from pytask import PythonNode
+from pytask import Task
+from pytask import get_marks
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+from pytask.tree_util import tree_map
+
+from pytask_julia.serialization import create_path_to_serialized
+
+if TYPE_CHECKING:
+    from pytask import Session
+
+__all__ = ["SHARD_SETTINGS", "expand_sharded_task"]
+
+
+SHARD_SETTINGS: tuple[str, ...] = ("_shard", "_n_shards")
+"""tuple[str, ...]: Names of dependencies which tell a shard which part to process."""
+
+_PLACEHOLDER: str = "{shard}"
+"""str: The placeholder in paths which is replaced with the index of the shard."""
+
+
+@hookimpl(tryfirst=True)
+def pytask_collect_modify_tasks(session: Session, tasks: list[PTask]) -> None:
+    """Replace sharded Julia tasks with their shards and merge tasks."""
+    __tracebackhide__ = True
+
+    expanded: list[PTask] = []
+    for task in tasks:
+        marks = get_marks(task, "julia")
+        n_shards = marks[0].kwargs.get("shards") if marks else None
+        if n_shards is None:
+            expanded.append(task)
+        else:
+            expanded.extend(
+                expand_sharded_task(session, task, n_shards, marks[0].kwargs["merge"])
+            )
+    tasks[:] = expanded
+
+
+def expand_sharded_task(
+    session: Session, task: PTask, n_shards: int, merge: str | Path | None
+) -> list[PTask]:
+    """Expand a sharded task into its shards and an optional merge task."""
+    per_shard = [
+        name for name, products in task.produces.items() if _has_placeholder(products)
+    ]
+    if merge is None and len(per_shard) < len(task.produces):
+        names = [name for name in task.produces if name not in per_shard]
+        msg = (
+            f"The paths of the products {names} of the sharded task {task.name!r} do "
+            f"not contain {_PLACEHOLDER!r}. Either add the placeholder to the paths or "
+            "produce them in a 'merge' script."
+        )
+        raise ValueError(msg)
+
+    serialized_node = task.depends_on["_serialized"]
+    if not isinstance(serialized_node, PythonNode) or not isinstance(
+        serialized_node.value, Path
+    ):
+        msg = "Expected '_serialized' dependency to be a PythonNode containing a Path."
+        raise TypeError(msg)
+    suffix = serialized_node.value.suffix
+
+    depends_on = {
+        name: nodes for name, nodes in task.depends_on.items() if name != "_serialized"
+    }
+
+    shards = []
+    for shard in range(n_shards):
+        shard_task = _create_task(
+            task,
+            f"[shard-{shard}]",
+            depends_on={
+                name: _format_paths(nodes, shard) for name, nodes in depends_on.items()
+            },
+            produces={
+                name: _format_paths(task.produces[name], shard) for name in per_shard
+            },
+        )
+        for arg_name, value in (("_shard", shard), ("_n_shards", n_shards)):
+            _add_dependency(session, shard_task, arg_name, value)
+        _add_dependency(
+            session,
+            shard_task,
+            "_serialized",
+            PythonNode(value=create_path_to_serialized(shard_task, suffix)),
+        )
+        shards.append(shard_task)
+
+    if merge is None:
+        return shards
+
+    merge_task = _create_task(
+        task,
+        "[merge]",
+        depends_on={
+            name: [_format_paths(nodes, shard) for shard in range(n_shards)]
+            if _has_placeholder(nodes)
+            else nodes
+            for name, nodes in depends_on.items()
+        },
+        produces={
+            name: products
+            for name, products in task.produces.items()
+            if name not in per_shard
+        },
+    )
+    _add_dependency(session, merge_task, "_script", Path(merge))
+    script_node = merge_task.depends_on["_script"]
+    if not (isinstance(script_node, PathNode) and script_node.path.suffix == ".jl"):
+        msg = (
+            "The 'merge' keyword of the @pytask.mark.julia decorator must point to "
+            f"Julia file with the .jl suffix, but it is {script_node}."
+        )
+        raise ValueError(msg)
+    merge_task.depends_on["_shard_products"] = [
+        shard_task.produces for shard_task in shards
+    ]
+    _add_dependency(session, merge_task, "_n_shards", n_shards)
+    _add_dependency(
+        session,
+        merge_task,
+        "_serialized",
+        PythonNode(value=create_path_to_serialized(merge_task, suffix)),
+    )
+
+    return [*shards, merge_task]
+
+
+def _has_placeholder(nodes: Any) -> bool:
+    """Check whether any path in the tree of nodes contains the placeholder."""
+    return any(
+        isinstance(node, PathNode) and _PLACEHOLDER in node.path.as_posix()
+        for node in tree_leaves(nodes)
+    )
+
+
+def _format_paths(nodes: Any, shard: int) -> Any:
+    """Replace the placeholder in all paths of the tree of nodes."""
+
+    def _format(node: Any) -> Any:
+        if not (isinstance(node, PathNode) and isinstance(node.path, Path)):
+            return node
+        if _PLACEHOLDER not in node.path.as_posix():
+            return node
+        return replace(
+            node,
+            path=Path(node.path.as_posix().replace(_PLACEHOLDER, str(shard))),
+            name=node.name.replace(_PLACEHOLDER, str(shard)),
+        )
+
+    return tree_map(_format, nodes)
+
+
+def _create_task(
+    task: PTask,
+    suffix: str,
+    depends_on: dict[str, Any],
+    produces: dict[str, Any],
+) -> PTask:
+    """Create a copy of the task whose name ends with the suffix."""
+    if isinstance(task, Task):
+        return replace(
+            task,
+            base_name=task.base_name + suffix,
+            depends_on=depends_on,
+            produces=produces,
+            markers=list(task.markers),
+            report_sections=[],
+            attributes=dict(task.attributes),
+        )
+    return replace(
+        task,  # ty: ignore[invalid-argument-type]
+        name=task.name + suffix,
+        depends_on=depends_on,
+        produces=produces,
+        markers=list(task.markers),
+        report_sections=[],
+        attributes=dict(task.attributes),
+    )
+
+
+def _add_dependency(session: Session, task: PTask, arg_name: str, value: Any) -> None:
+    """Collect a value as a dependency of the task."""
+    path = task.path if isinstance(task, PTaskWithPath) else None
+    task.depends_on[arg_name] = session.hook.pytask_collect_node(
+        session=session,
+        path=Path.cwd() if path is None else path.parent,
+        node_info=NodeInfo(
+            arg_name=arg_name,
+            path=(),
+            value=value,
+            task_path=path,
+            task_name=task.base_name if isinstance(task, Task) else task.name,
+        ),
+    )
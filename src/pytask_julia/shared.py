@@ -2,25 +2,76 @@
 
 from __future__ import annotations
 
+import getpass
+import os
+import sys
+import tempfile
 from collections.abc import Callable
 from collections.abc import Iterable
 from collections.abc import Sequence
 from pathlib import Path
+from stat import S_IMODE
+from stat import S_ISDIR
+from typing import IO
 from typing import Any
 
+from pytask import Mark
 
-def julia(
+from pytask_julia.serialization import SERIALIZERS
+
+JULIA_FOLDER: Path = Path(__file__).parent / "julia"
+"""Path: The folder with Julia code of pytask-julia which is on the load path."""
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def try_lock(file: IO[bytes]) -> bool:
+        """Try to lock a file without waiting and return whether it succeeded.
+
+        The lock is released when the file is closed or the process ends.
+
+        """
+        try:
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+else:
+    import fcntl
+
+    def try_lock(file: IO[bytes]) -> bool:
+        """Try to lock a file without waiting and return whether it succeeded.
+
+        The lock is released when the file is closed or the process ends.
+
+        """
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+
+def julia(  # noqa: PLR0913
     script: str | Path,
     options: str | Iterable[str] | None = None,
     serializer: Callable[..., str] | str | None = None,
     suffix: str | None = None,
     project: str | Path | None = None,
+    shards: int | None = None,
+    merge: str | Path | None = None,
+    executable: str | Path | None = None,
 ) -> tuple[
     str | Path | None,
     str | Iterable[str] | None,
     str | Callable[..., str] | None,
     str | None,
     str | Path | None,
+    int | None,
+    str | Path | None,
+    str | Path | None,
 ]:
     """Parse input to the ``@pytask.mark.julia`` decorator.
 
@@ -40,10 +91,20 @@ def julia(
         ``".json"``.
     project : str | Path | None
         A path to an Julia environment used to execute this task.
+    shards : int | None
+        The number of shards. If the value is not `None`, the task is split into as
+        many tasks which receive the index of their shard under ``_shard`` and the
+        number of shards under ``_n_shards``.
+    merge : str | Path | None
+        The path to a Julia script which is executed once all shards are finished.
+    executable : str | Path | None
+        The name of or the path to the Julia executable which runs the script. If the
+        value is `None`, use the value specified in the configuration file under
+        ``julia_executable`` or fall back to ``"julia"``.
 
     """
     options = [] if options is None else list(map(str, _to_list(options)))
-    return script, options, serializer, suffix, project
+    return script, options, serializer, suffix, project, shards, merge, executable
 
 
 def _to_list(scalar_or_iter: Any) -> list[Any]:
@@ -81,3 +142,140 @@ def parse_relative_path(path: str | Path, root: Path) -> Path:
         path = root / path
 
     return path.resolve()
+
+
+def parse_executable(executable: str | Path, root: Path) -> str:
+    """Parse an executable which is either a name on the PATH or a relative path."""
+    executable = Path(executable).expanduser()
+    if executable.parent == Path():
+        return executable.name
+    return parse_relative_path(executable, root).as_posix()
+
+
+def parse_julia_mark(  # noqa: PLR0913
+    mark: Mark,
+    default_options: list[str] | None,
+    default_serializer: Callable[..., str] | str | None,
+    default_suffix: str | None,
+    default_project: str | None,
+    default_executable: str | None = None,
+) -> Mark:
+    """Parse a Julia mark."""
+    script, options, serializer, suffix, project, shards, merge, executable = julia(
+        **mark.kwargs
+    )
+
+    parsed_kwargs = {}
+    for arg_name, value, default in (
+        ("script", script, None),
+        ("options", options, default_options),
+        ("serializer", serializer, default_serializer),
+    ):
+        parsed_kwargs[arg_name] = value or default
+
+    proposed_suffix = (
+        SERIALIZERS[parsed_kwargs["serializer"]]["suffix"]
+        if isinstance(parsed_kwargs["serializer"], str)
+        and parsed_kwargs["serializer"] in SERIALIZERS
+        else default_suffix
+    )
+    parsed_suffix = suffix or proposed_suffix
+    if parsed_suffix is None:
+        msg = "No file suffix configured for serialized arguments."
+        raise ValueError(msg)
+    parsed_kwargs["suffix"] = parsed_suffix
+
+    if isinstance(project, (str, Path)):
+        parsed_kwargs["project"] = project
+    else:
+        parsed_kwargs["project"] = default_project
+
+    if shards is not None and (
+        not isinstance(shards, int) or isinstance(shards, bool) or shards < 1
+    ):
+        msg = f"'shards' is {shards} and not a positive integer."
+        raise ValueError(msg)
+    parsed_kwargs["shards"] = shards
+    parsed_kwargs["merge"] = merge
+    parsed_kwargs["executable"] = executable or default_executable
+
+    return Mark("julia", (), parsed_kwargs)
+
+
+def parse_project(project: str | Path | None, root: Path) -> list[str]:
+    """Parse the project into the option which activates it."""
+    if project is None:
+        return []
+    project = parse_relative_path(project, root)
+    return ["--project=" + project.as_posix()]
+
+
+def create_environment(depot_path: str | None = None) -> dict[str, str]:
+    """Create the environment of a Julia process.
+
+    The folder with Julia code of pytask-julia is appended to the load path. The empty
+    entry in front expands to the default load path if the variable was not set.
+
+    If ``depot_path`` is given, it replaces ``JULIA_DEPOT_PATH``.
+
+    """
+    load_path = os.environ.get("JULIA_LOAD_PATH", "")
+    environment = {
+        **os.environ,
+        "JULIA_LOAD_PATH": os.pathsep.join((load_path, str(JULIA_FOLDER))),
+    }
+    if depot_path is not None:
+        environment["JULIA_DEPOT_PATH"] = depot_path
+    return environment
+
+
+def get_path_to_temporary_folder() -> Path:
+    """Get the private temporary folder of the current user.
+
+    Files which are shared between processes of the same user, like locks, sockets and
+    depots, are kept in ``$TMPDIR/pytask-julia-<uid>``. The folder is created with
+    access only for the user, so other users cannot read, replace or lock the files.
+
+    Raises
+    ------
+    PermissionError
+        If the folder is not a folder owned by the current user.
+
+    """
+    if not hasattr(os, "getuid"):  # pragma: no cover
+        path = Path(tempfile.gettempdir(), f"pytask-julia-{getpass.getuser()}")
+        path.mkdir(exist_ok=True)
+        return path
+
+    path = Path(tempfile.gettempdir(), f"pytask-julia-{os.getuid()}")
+    path.mkdir(mode=0o700, exist_ok=True)
+    stat = path.lstat()
+    if not S_ISDIR(stat.st_mode) or stat.st_uid != os.getuid():
+        msg = (
+            f"The temporary folder {path} of pytask-julia is not a folder owned by the "
+            "current user. Remove it or set TMPDIR to another folder."
+        )
+        raise PermissionError(msg)
+    if S_IMODE(stat.st_mode) != 0o700:  # noqa: PLR2004
+        path.chmod(0o700)
+    return path
+
+
+def needs_own_process(config: dict[str, Any]) -> bool:
+    """Check whether every task needs its own Julia process.
+
+    Tasks which are profiled or measured, whose output is captured, which can stall, or
+    which run with a depot, checksums, pinned cores, or on a cluster cannot be included
+    into a Julia session or be submitted to the daemon.
+
+    """
+    return (
+        config["julia_profile"]
+        or config["julia_metrics"]
+        or config["julia_stall_timeout"] is not None
+        or config["julia_capture_logs"]
+        or config["julia_checksums"]
+        or config["julia_shared_depot"] is not None
+        or config["julia_cluster"] is not None
+        or config["julia_cores_per_task"] is not None
+    )
@@ -0,0 +1,195 @@
+"""Contains code to stage inputs and products of Julia tasks on a local scratch disk.
+
+Random access from Julia to files on network file systems like NFS or Lustre is much
+slower than to a local disk. With ``julia_scratch``, the files which a task depends on
+are copied to a folder on the scratch disk before the task is executed, and the paths in
+the serialized arguments point to the copies. Products are written to the scratch disk
+as well and moved to their destinations after the task succeeded.
+
+Files are hard-linked instead of copied if the scratch disk is on the same device.
+Dependencies are only copied while their total size stays below
+``julia_scratch_max_size``, and the remaining ones are read from their original paths.
+
+"""
+
+from __future__ import annotations
+
+import errno
+import json
+import shutil
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytask import PPathNode
+from pytask import PTask
+from pytask import PythonNode
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+
+from pytask_julia.nodes import JuliaObjectNode
+
+if TYPE_CHECKING:
+    from pytask import ExecutionReport
+    from pytask import Session
+
+__all__ = ["get_path_to_stage", "remove_stage", "stage_task", "unstage_products"]
+
+
+def get_path_to_stage(path_to_serialized: Path) -> Path:
+    """Get the path to the record of staged products of a task."""
+    return path_to_serialized.with_suffix(".stage.json")
+
+
+def stage_task(
+    task: PTask, path_to_serialized: Path, scratch: Path, max_size: float | None
+) -> dict[Path, Path]:
+    """Stage the dependencies and products of a task on the scratch disk.
+
+    Parameters
+    ----------
+    task : PTask
+        The task whose files are staged.
+    path_to_serialized : Path
+        The path to the serialized arguments of the task. The staged products are
+        recorded next to it.
+    scratch : Path
+        The folder on the scratch disk.
+    max_size : float | None
+        The maximum number of bytes of dependencies which are copied.
+
+    Returns
+    -------
+    dict[Path, Path]
+        A mapping from original paths to staged paths.
+
+    """
+    folder = scratch / path_to_serialized.stem
+    folder.mkdir(parents=True, exist_ok=True)
+    device = folder.stat().st_dev
+
+    staged: dict[Path, Path] = {}
+    budget = float("inf") if max_size is None else max_size
+    for i, path in enumerate(_get_paths(task.depends_on, exclude="_script")):
+        if path in staged or not path.is_file():
+            continue
+        stat = path.stat()
+        target = folder / "dependencies" / str(i) / path.name
+        target.parent.mkdir(parents=True)
+        if stat.st_dev == device and _try_link(path, target):
+            staged[path] = target
+        elif stat.st_size <= budget:
+            shutil.copy2(path, target)
+            budget -= stat.st_size
+            staged[path] = target
+
+    products: list[tuple[str, str]] = []
+    for i, path in enumerate(_get_paths(task.produces)):
+        target = folder / "products" / str(i) / path.name
+        target.parent.mkdir(parents=True)
+        staged[path] = target
+        products.append((target.as_posix(), path.as_posix()))
+
+    get_path_to_stage(path_to_serialized).write_text(
+        json.dumps({"folder": folder.as_posix(), "products": products})
+    )
+    return staged
+
+
+def unstage_products(path_to_serialized: Path) -> None:
+    """Move staged products to their destinations.
+
+    Every product replaces its destination atomically. Products which were not created
+    are skipped so that pytask reports them as missing.
+
+    """
+    record = json.loads(get_path_to_stage(path_to_serialized).read_text())
+    for staged, destination in record["products"]:
+        if Path(staged).exists():
+            _move_atomically(Path(staged), Path(destination))
+
+
+def remove_stage(path_to_serialized: Path) -> None:
+    """Remove the staged files of a task."""
+    path = get_path_to_stage(path_to_serialized)
+    if path.exists():
+        record = json.loads(path.read_text())
+        shutil.rmtree(record["folder"], ignore_errors=True)
+        path.unlink()
+
+
+def _get_paths(nodes: object, exclude: str | None = None) -> list[Path]:
+    """Get the paths of all local path nodes while skipping a top-level argument.
+
+    Objects of Julia sessions are identified by their paths and are never staged.
+
+    """
+    if isinstance(nodes, dict) and exclude is not None:
+        nodes = {key: value for key, value in nodes.items() if key != exclude}
+    return [
+        node.path
+        for node in tree_leaves(nodes)  # ty: ignore[invalid-argument-type]
+        if isinstance(node, PPathNode)
+        and isinstance(node.path, Path)
+        and not isinstance(node, JuliaObjectNode)
+    ]
+
+
+def _try_link(source: Path, target: Path) -> bool:
+    try:
+        target.hardlink_to(source)
+    except OSError:
+        return False
+    return True
+
+
+def _move_atomically(source: Path, destination: Path) -> None:
+    """Move a file so that the destination is never partially written."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        source.replace(destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Copy to the destination's file system first and rename it there.
+        temporary = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}")
+        try:
+            if source.is_dir():
+                shutil.copytree(source, temporary)
+            else:
+                shutil.copy2(source, temporary)
+            temporary.replace(destination)
+        finally:
+            if temporary.is_dir():
+                shutil.rmtree(temporary, ignore_errors=True)
+            else:
+                temporary.unlink(missing_ok=True)
+
+
+def _get_path_to_serialized(task: PTask) -> Path | None:
+    node = task.depends_on.get("_serialized")
+    if isinstance(node, PythonNode) and isinstance(node.value, Path):
+        return node.value
+    return None
+
+
+@hookimpl
+def pytask_execute_task_teardown(session: Session, task: PTask) -> None:
+    """Move the staged products before pytask checks whether they exist."""
+    if session.config["julia_scratch"] is None:
+        return
+    path = _get_path_to_serialized(task)
+    if path is not None and get_path_to_stage(path).exists():
+        unstage_products(path)
+
+
+@hookimpl
+def pytask_execute_task_process_report(
+    session: Session, report: ExecutionReport
+) -> None:
+    """Remove the staged files of a task after it succeeded or failed."""
+    if session.config["julia_scratch"] is None:
+        return
+    path = _get_path_to_serialized(report.task)
+    if path is not None:
+        remove_stage(path)
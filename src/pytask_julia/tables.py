@@ -0,0 +1,322 @@
+"""Contains code to collect Julia tasks from tables of parameters.
+
+Defining thousands of Julia tasks with a loop in a task module creates a decorated
+function per task, and every task goes through the full collection of pytask. Instead,
+a task table is a TOML file like ``task_sweep.toml`` which holds the script and the
+templates of the paths of dependencies and products once, and the parameters of all
+tasks as a table.
+
+.. code-block:: toml
+
+    script = "simulate.jl"
+    project = "."
+    parameters = "parameters.csv"
+
+    [depends_on]
+    data = "data.csv"
+
+    [produces]
+    result = "bld/result_{id}.json"
+
+The parameters are either the path to a CSV, Arrow or Parquet file or a list of tables
+in the TOML file. Every row becomes a task which receives the values of its row in the
+serialized arguments. The nodes which are the same for all tasks are created once and
+shared, and the collection does not call hooks per task.
+
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import sys
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pytask import CollectionOutcome
+from pytask import CollectionReport
+from pytask import Mark
+from pytask import NodeInfo
+from pytask import PathNode
+from pytask import PythonNode
+from pytask import Session
+from pytask import Task
+from pytask import hookimpl
+
+from pytask_julia.arrow import read_table
+from pytask_julia.collect import get_execution_settings
+from pytask_julia.collect import run_jl_script
+from pytask_julia.executable import resolve_executable
+from pytask_julia.serialization import create_path_to_serialized
+from pytask_julia.shared import julia
+from pytask_julia.shared import parse_executable
+from pytask_julia.shared import parse_julia_mark
+from pytask_julia.shared import parse_project
+from pytask_julia.shared import parse_relative_path
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+__all__ = ["TableTask", "collect_task_table", "read_parameters"]
+
+_KEYS: frozenset[str] = frozenset(
+    {
+        "script",
+        "options",
+        "serializer",
+        "suffix",
+        "project",
+        "executable",
+        "parameters",
+        "depends_on",
+        "produces",
+    }
+)
+"""frozenset[str]: The keys which are allowed in a task table."""
+
+
+@dataclass(kw_only=True)
+class TableTask(Task):
+    """A Julia task from a row of a task table.
+
+    The state of a :class:`~pytask.Task` is the state of the file which defines it, so
+    editing one row of a task table would execute all of its tasks again. The state of
+    a table task is the hash of its row and the settings of the table instead.
+
+    """
+
+    digest: str = ""
+
+    def state(self) -> str | None:
+        """Return the state of the task."""
+        return self.digest
+
+
+def read_parameters(parameters: str | list[dict[str, Any]], root: Path) -> list[Any]:
+    """Read the rows of parameters from a file or the task table.
+
+    CSV files are read with :mod:`csv`, so all values are strings. Arrow and Parquet
+    files require pyarrow.
+
+    """
+    if isinstance(parameters, list):
+        return parameters
+
+    path = parse_relative_path(parameters, root)
+    if path.suffix == ".csv":
+        with path.open(newline="") as f:
+            return list(csv.DictReader(f))
+    if path.suffix in (".arrow", ".feather", ".ipc"):
+        return read_table(path).to_pylist()
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq  # noqa: PLC0415
+        except ImportError:
+            msg = f"pyarrow is needed to read the parameters in {path}."
+            raise ImportError(msg) from None
+        return pq.read_table(path).to_pylist()
+
+    msg = (
+        f"The parameters {path} must be a CSV, Arrow or Parquet file or a list of "
+        "tables in the task table."
+    )
+    raise ValueError(msg)
+
+
+def _hash(value: Any) -> str:
+    """Hash a value which can be serialized to JSON."""
+    serialized = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def _shorten_path(path: Path, paths: list[Path]) -> str:
+    """Shorten the path of a node like pytask does for the names of nodes.
+
+    The path is made relative to its closest ancestor among the paths of the project
+    and keeps the name of the ancestor for orientation.
+
+    """
+    ancestors = []
+    for other in paths:
+        # Paths on different drives have no common ancestor.
+        with suppress(ValueError):
+            ancestors.append(Path(os.path.commonpath([path, other])))
+    ancestor = max(ancestors, key=lambda x: len(x.parts), default=path.parents[-1])
+    return Path(ancestor.name, path.relative_to(ancestor)).as_posix()
+
+
+def _read_task_table(path: Path) -> dict[str, Any]:
+    """Read and validate a task table."""
+    with path.open("rb") as f:
+        spec = tomllib.load(f)
+
+    unknown = set(spec) - _KEYS
+    if unknown:
+        msg = f"The task table {path} has unknown keys {sorted(unknown)}."
+        raise ValueError(msg)
+    if "script" not in spec or "parameters" not in spec:
+        msg = f"The task table {path} needs a 'script' and 'parameters'."
+        raise ValueError(msg)
+    return spec
+
+
+def collect_task_table(session: Session, path: Path) -> list[Task]:
+    """Collect the Julia tasks of a task table."""
+    spec = _read_task_table(path)
+    root = path.parent
+    mark = parse_julia_mark(
+        mark=Mark(
+            "julia",
+            (),
+            {
+                key: value
+                for key, value in spec.items()
+                if key not in ("parameters", "depends_on", "produces")
+            },
+        ),
+        default_options=session.config["julia_options"],
+        default_serializer=session.config["julia_serializer"],
+        default_suffix=session.config["julia_suffix"],
+        default_project=session.config["julia_project"],
+        default_executable=session.config["julia_executable"],
+    )
+    _, options, _, suffix, project, _, _, executable = julia(**mark.kwargs)
+    if suffix is None:
+        msg = "No file suffix configured for serialized arguments."
+        raise ValueError(msg)
+    script = parse_relative_path(spec["script"], root)
+    if script.suffix != ".jl":
+        msg = f"The script of the task table {path} must be a Julia file, not {script}."
+        raise ValueError(msg)
+
+    if session.config["julia_track_allocation"]:
+        options = [*(options or []), "--track-allocation=user"]
+
+    # Nodes which are the same for all tasks of the table are created once.
+    shared_values = {
+        "_options": options,
+        "_project": parse_project(project, root),
+        "_settings": {
+            "executable": resolve_executable(
+                parse_executable(executable or "julia", root)
+            ),
+            **get_execution_settings(session),
+        },
+    }
+    shared_nodes: dict[str, Any] = {
+        "_script": PathNode(
+            name=_shorten_path(script, session.config["paths"]), path=script
+        ),
+        **{
+            name: PythonNode(
+                name=name,
+                value=value,
+                node_info=NodeInfo(
+                    arg_name=name,
+                    path=(),
+                    value=value,
+                    task_path=path,
+                    task_name=path.as_posix(),
+                ),
+            )
+            for name, value in shared_values.items()
+        },
+    }
+
+    settings_digest = _hash({k: v for k, v in spec.items() if k != "parameters"})
+    templates = {kind: dict(spec.get(kind, {})) for kind in ("depends_on", "produces")}
+    path_nodes: dict[str, PathNode] = {}
+
+    def _create_path_node(template: str, parameters: dict[str, Any]) -> PathNode:
+        node_path = os.path.normpath(root.joinpath(template.format(**parameters)))
+        node = path_nodes.get(node_path)
+        if node is None:
+            node = path_nodes[node_path] = PathNode(
+                name=_shorten_path(Path(node_path), session.config["paths"]),
+                path=Path(node_path),
+            )
+        return node
+
+    tasks = []
+    ids: set[str] = set()
+    for index, row in enumerate(read_parameters(spec["parameters"], root)):
+        parameters = {"id": index, **row}
+        task_id = str(parameters["id"])
+        if task_id in ids:
+            msg = f"The task table {path} has multiple rows with the id {task_id!r}."
+            raise ValueError(msg)
+        ids.add(task_id)
+        conflicts = set(parameters) & (
+            set(templates["depends_on"]) | set(templates["produces"])
+        )
+        if conflicts:
+            msg = (
+                f"The parameters {sorted(conflicts)} of the task table {path} have the "
+                "same names as dependencies or products."
+            )
+            raise ValueError(msg)
+
+        task = TableTask(
+            base_name=f"{path.stem}[{task_id}]",
+            path=path,
+            function=run_jl_script,
+            depends_on={
+                name: _create_path_node(template, parameters)
+                for name, template in templates["depends_on"].items()
+            }
+            | shared_nodes,
+            produces={
+                name: _create_path_node(template, parameters)
+                for name, template in templates["produces"].items()
+            },
+            markers=[mark],
+            digest=_hash([settings_digest, parameters]),
+        )
+        for name, value in (
+            ("_parameters", parameters),
+            ("_serialized", create_path_to_serialized(task, suffix)),
+        ):
+            task.depends_on[name] = PythonNode(
+                name=name,
+                value=value,
+                node_info=NodeInfo(
+                    arg_name=name,
+                    path=(),
+                    value=value,
+                    task_path=path,
+                    task_name=task.name,
+                ),
+            )
+        tasks.append(task)
+    return tasks
+
+
+@hookimpl
+def pytask_collect_file(
+    session: Session,
+    path: Path,
+    reports: list[CollectionReport],  # noqa: ARG001
+) -> list[CollectionReport] | None:
+    """Collect the Julia tasks of task tables."""
+    if not any(path.match(pattern) for pattern in session.config["julia_task_tables"]):
+        return None
+
+    try:
+        tasks = collect_task_table(session, path)
+    except Exception:  # noqa: BLE001
+        return [
+            CollectionReport.from_exception(
+                outcome=CollectionOutcome.FAIL,
+                node=PathNode(name=path.name, path=path),
+                exc_info=sys.exc_info(),
+            )
+        ]
+    return [
+        CollectionReport(outcome=CollectionOutcome.SUCCESS, node=task) for task in tasks
+    ]
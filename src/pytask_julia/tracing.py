@@ -0,0 +1,271 @@
+"""Contains code to trace the phases of Julia tasks.
+
+With ``--julia-trace <path>``, pytask-julia records a span for the collection, the
+setup, the serialization of arguments, the execution and the teardown of every Julia
+task. The spans are written in the JSON encoding of the OpenTelemetry protocol (OTLP)
+which trace viewers like Jaeger can open.
+
+The hooks which record spans are only registered when tracing is enabled, and
+:func:`span` returns a shared no-op span otherwise, so tracing costs nothing when it is
+disabled.
+
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pytask import PTask
+from pytask import Session
+from pytask import get_marks
+from pytask import has_mark
+from pytask import hookimpl
+
+from pytask_julia.shared import julia
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+__all__ = ["Span", "Tracer", "get_tracer", "span"]
+
+_STATUS_OK: int = 1
+"""int: The status code of spans which succeeded in OTLP."""
+
+_STATUS_ERROR: int = 2
+"""int: The status code of spans which failed in OTLP."""
+
+_KIND_INTERNAL: int = 1
+"""int: The kind of spans for operations within the process in OTLP."""
+
+
+@dataclass
+class Span:
+    """A span which measures the duration of an operation."""
+
+    tracer: Tracer
+    name: str
+    attributes: dict[str, Any]
+    span_id: str = field(default_factory=lambda: os.urandom(8).hex())
+    parent_span_id: str | None = None
+    start: int = 0
+    end: int = 0
+    error: str | None = None
+    _token: contextvars.Token[Span | None] | None = None
+
+    def is_recording(self) -> bool:
+        """Return whether the span is recorded."""
+        return True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> Self:
+        """Start the span as a child of the current span."""
+        parent = _CURRENT_SPAN.get()
+        self.parent_span_id = None if parent is None else parent.span_id
+        self._token = _CURRENT_SPAN.set(self)
+        self.start = time.time_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """End the span and record an error if one occurred."""
+        self.end = time.time_ns()
+        if exc_value is not None:
+            self.error = f"{type(exc_value).__name__}: {exc_value}"
+        if self._token is not None:
+            _CURRENT_SPAN.reset(self._token)
+        self.tracer.spans.append(self)
+
+
+class _NoOpSpan:
+    """A span which records nothing."""
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+_CURRENT_SPAN: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "_CURRENT_SPAN", default=None
+)
+
+
+@dataclass
+class Tracer:
+    """Collect spans and export them as OTLP JSON."""
+
+    trace_id: str = field(default_factory=lambda: os.urandom(16).hex())
+    spans: list[Span] = field(default_factory=list)
+
+    def export(self, path: Path) -> None:
+        """Write the spans to a file in the JSON encoding of OTLP."""
+        from pytask_julia import __version__  # noqa: PLC0415
+
+        data = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _encode_attributes({"service.name": "pytask"})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "pytask-julia", "version": __version__},
+                            "spans": [self._encode_span(s) for s in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data))
+
+    def _encode_span(self, span: Span) -> dict[str, Any]:
+        encoded = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _KIND_INTERNAL,
+            "startTimeUnixNano": str(span.start),
+            "endTimeUnixNano": str(span.end),
+            "attributes": _encode_attributes(span.attributes),
+            "status": {"code": _STATUS_OK}
+            if span.error is None
+            else {"code": _STATUS_ERROR, "message": span.error},
+        }
+        if span.parent_span_id is not None:
+            encoded["parentSpanId"] = span.parent_span_id
+        return encoded
+
+
+def _encode_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    """Encode attributes as OTLP key-value pairs."""
+    encoded = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            encoded_value: dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            # OTLP JSON encodes 64-bit integers as strings.
+            encoded_value = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded_value = {"doubleValue": value}
+        else:
+            encoded_value = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": encoded_value})
+    return encoded
+
+
+_TRACER: Tracer | None = None
+"""Tracer | None: The tracer of the current build if tracing is enabled."""
+
+
+def get_tracer() -> Tracer | None:
+    """Get the tracer of the current build or ``None`` if tracing is disabled."""
+    return _TRACER
+
+
+def span(name: str, /, **attributes: Any) -> Span | _NoOpSpan:
+    """Create a span which records an operation if tracing is enabled."""
+    if _TRACER is None:
+        return _NO_OP_SPAN
+    return Span(tracer=_TRACER, name=name, attributes=attributes)
+
+
+def _get_task_attributes(task: PTask) -> dict[str, Any]:
+    """Get the attributes of spans of a task."""
+    attributes: dict[str, Any] = {"pytask.task": task.name}
+    script = task.depends_on.get("_script")
+    if script is not None:
+        attributes["pytask_julia.script"] = str(getattr(script, "path", script))
+    project = task.depends_on.get("_project")
+    if project is not None:
+        attributes["pytask_julia.project"] = " ".join(getattr(project, "value", []))
+    marks = get_marks(task, "julia")
+    if marks:
+        _, _, serializer, *_ = julia(**marks[0].kwargs)
+        attributes["pytask_julia.serializer"] = getattr(
+            serializer, "__name__", serializer
+        )
+    return attributes
+
+
+class _TracingHooks:
+    """Hooks which record spans of the phases of Julia tasks."""
+
+    @hookimpl(wrapper=True)
+    def pytask_collect_task(self, name: str, obj: Any) -> Generator[None, Any, Any]:
+        if not has_mark(obj, "julia"):
+            return (yield)
+        with span("pytask_julia.collect", **{"pytask.task": name}) as current:
+            task = yield
+            if task is not None:
+                for key, value in _get_task_attributes(task).items():
+                    current.set_attribute(key, value)
+            return task
+
+    @hookimpl(wrapper=True)
+    def pytask_execute_task_setup(self, task: PTask) -> Generator[None, Any, Any]:
+        if not has_mark(task, "julia"):
+            return (yield)
+        with span("pytask_julia.setup", **_get_task_attributes(task)):
+            return (yield)
+
+    @hookimpl(wrapper=True)
+    def pytask_execute_task(self, task: PTask) -> Generator[None, Any, Any]:
+        if not has_mark(task, "julia"):
+            return (yield)
+        with span("pytask_julia.execute", **_get_task_attributes(task)):
+            return (yield)
+
+    @hookimpl(wrapper=True)
+    def pytask_execute_task_teardown(self, task: PTask) -> Generator[None, Any, Any]:
+        if not has_mark(task, "julia"):
+            return (yield)
+        with span("pytask_julia.teardown", **_get_task_attributes(task)):
+            return (yield)
+
+
+@hookimpl
+def pytask_post_parse(config: dict[str, Any]) -> None:
+    """Start tracing and register the hooks which record spans."""
+    global _TRACER  # noqa: PLW0603
+    if config["julia_trace"] is not None:
+        _TRACER = Tracer()
+        config["pm"].register(_TracingHooks(), name="pytask_julia_tracing")
+
+
+@hookimpl
+def pytask_unconfigure(session: Session) -> None:
+    """Export the spans and stop tracing."""
+    global _TRACER  # noqa: PLW0603
+    if _TRACER is None:
+        return
+    _TRACER.export(session.config["julia_trace"])
+    _TRACER = None
+    session.config["pm"].unregister(name="pytask_julia_tracing")
@@ -0,0 +1,122 @@
+"""Contains code to watch files and execute Julia tasks again when they change.
+
+``pytask watch-julia`` builds the project, waits until a file in the project or a
+dependency of a task changes, and builds the project again. Only tasks affected by the
+change are executed since pytask skips unchanged tasks.
+
+Julia tasks run in sessions with Revise.jl which stay alive between builds. Packages are
+loaded and code is compiled only once, and changes to packages and files tracked by
+Revise.jl are applied before every script.
+
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from pytask import PPathNode
+from pytask import Session
+from pytask import build
+from pytask import hookimpl
+from pytask.tree_util import tree_leaves
+
+from pytask_julia.sessions import close_sessions
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ["get_watched_files", "take_snapshot", "wait_for_changes", "watch_julia"]
+
+_IGNORED_FOLDERS: frozenset[str] = frozenset({"__pycache__", "node_modules"})
+"""frozenset[str]: Names of folders whose files are not watched besides hidden ones."""
+
+
+def get_watched_files(paths: Iterable[Path], session: Session) -> set[Path]:
+    """Get the files in the paths of the project and the dependencies of tasks."""
+    files = set()
+    for path in paths:
+        if path.is_file():
+            files.add(path)
+        else:
+            files.update(
+                p
+                for p in path.rglob("*")
+                if p.is_file()
+                and not any(
+                    part.startswith(".") or part in _IGNORED_FOLDERS
+                    for part in p.relative_to(path).parts
+                )
+            )
+    for task in session.tasks:
+        files.update(
+            node.path
+            for node in tree_leaves(task.depends_on)  # ty: ignore[invalid-argument-type]
+            if isinstance(node, PPathNode) and isinstance(node.path, Path)
+        )
+    return files
+
+
+def take_snapshot(files: Iterable[Path]) -> dict[Path, int | None]:
+    """Take the modification times of files or ``None`` for missing files."""
+    return {file: _get_modification_time(file) for file in files}
+
+
+def _get_modification_time(file: Path) -> int | None:
+    try:
+        return file.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def wait_for_changes(
+    files: Iterable[Path], snapshot: dict[Path, int | None], interval: float
+) -> list[Path]:
+    """Wait until files change and return the changed files."""
+    while True:
+        time.sleep(interval)
+        current = take_snapshot(files)
+        changed = [file for file, value in current.items() if snapshot[file] != value]
+        if changed:
+            return changed
+
+
+@click.command(name="watch-julia")
+@click.argument(
+    "paths", nargs=-1, type=click.Path(exists=True, resolve_path=True, path_type=Path)
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=0.5,
+    show_default=True,
+    help="Seconds between two checks whether files changed.",
+)
+def watch_julia(paths: tuple[Path, ...], interval: float) -> None:
+    """Execute tasks again whenever files change.
+
+    Julia tasks run in sessions with Revise.jl which stay alive between builds. Stop
+    watching with Ctrl+C.
+
+    """
+    try:
+        paths = paths or (Path.cwd(),)
+        while True:
+            session = build(paths=list(paths), _julia_watch=True)
+            files = get_watched_files(paths, session)
+            snapshot = take_snapshot(files)
+            click.echo("Waiting for changes. Stop watching with Ctrl+C.")
+            changed = wait_for_changes(files, snapshot, interval)
+            click.echo("Changed: " + ", ".join(str(file) for file in changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_sessions()
+
+
+@hookimpl
+def pytask_extend_command_line_interface(cli: click.Group) -> None:
+    """Extend the command line interface."""
+    cli.add_command(watch_julia)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
 import shutil
 import sys
+import textwrap
 from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Any
 
 import pytest
 from click.testing import CliRunner
@@ -22,15 +25,41 @@ needs_julia = pytest.mark.skipif(
 )
 
 
+needs_posix_shell = pytest.mark.skipif(
+    sys.platform == "win32", reason="Uses a shell script as a fake julia."
+)
+
+
 parametrize_parse_code_serializer_suffix = pytest.mark.parametrize(
     ("parse_config_code", "serializer", "suffix"),
     [
         ("import JSON; config = JSON.parse(read(ARGS[1], String))", "json", ".json"),
         ("import YAML; config = YAML.load_file(ARGS[1])", "yaml", ".yaml"),
+        ("import TOML; config = TOML.parsefile(ARGS[1])", "toml", ".toml"),
+        ("using PytaskJulia; config = load_config()", "toml", ".toml"),
     ],
 )
 
 
+def create_execution_settings(**overrides: Any) -> dict[str, Any]:
+    """Create the settings of ``run_jl_script`` for a plain Julia process."""
+    return {
+        "executable": "julia",
+        "profile": False,
+        "metrics": False,
+        "stall_timeout": None,
+        "log_tail": None,
+        "depot": None,
+        "session": False,
+        "revise": False,
+        "checksums": False,
+        "cluster": None,
+        "daemon": None,
+        "cores": None,
+        **overrides,
+    }
+
+
 class SysPathsSnapshot:
     """A snapshot for sys.path."""
 
@@ -93,3 +122,25 @@ class CustomCliRunner(CliRunner):
 @pytest.fixture
 def runner():
     return CustomCliRunner()
+
+
+@pytest.fixture
+def fake_julia(tmp_path, monkeypatch):
+    """Put a fake julia executable on the PATH which runs the given shell script.
+
+    The last argument passed to julia, the path to the serialized arguments, is
+    available as ``$last``.
+
+    """
+
+    def _fake_julia(script: str) -> Path:
+        path = tmp_path.joinpath("bin", "julia")
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(
+            "#!/bin/sh\nfor last; do true; done\n" + textwrap.dedent(script)
+        )
+        path.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{path.parent}{os.pathsep}{os.environ['PATH']}")
+        return path
+
+    return _fake_julia
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+
+from pytask_julia.affinity import acquire_cores
+from pytask_julia.affinity import add_threads_option
+from pytask_julia.affinity import format_cpu_list
+from pytask_julia.affinity import get_numa_nodes
+from pytask_julia.affinity import parse_cpu_list
+from pytask_julia.affinity import pin_command
+from pytask_julia.affinity import split_into_core_sets
+from tests.conftest import needs_posix_shell
+
+needs_affinity = pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="Pinning needs sched_setaffinity."
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("0-3,8,10-11\n", [0, 1, 2, 3, 8, 10, 11]), ("5", [5]), ("", [])],
+)
+def test_parse_cpu_list(value, expected):
+    assert parse_cpu_list(value) == expected
+    assert parse_cpu_list(format_cpu_list(expected)) == expected
+
+
+@pytest.mark.parametrize(
+    ("n_cores", "expected"),
+    [
+        (2, [[0, 1], [2, 3], [8, 9], [10, 11]]),
+        (3, [[0, 1, 2], [8, 9, 10]]),
+        (8, [[0, 1, 2, 3], [8, 9, 10, 11]]),
+    ],
+)
+def test_split_into_core_sets(n_cores, expected):
+    nodes = [[0, 1, 2, 3], [8, 9, 10, 11]]
+    assert split_into_core_sets(nodes, n_cores) == expected
+
+
+@needs_affinity
+def test_get_numa_nodes(tmp_path):
+    available = sorted(os.sched_getaffinity(0))
+    for i, cpus in enumerate(([available[0]], available[1:], [max(available) + 1])):
+        tmp_path.joinpath(f"node{i}").mkdir()
+        tmp_path.joinpath(f"node{i}", "cpulist").write_text(format_cpu_list(cpus))
+
+    nodes = get_numa_nodes(tmp_path)
+
+    assert nodes == [node for node in ([available[0]], available[1:]) if node]
+    assert get_numa_nodes(tmp_path / "missing") == [available]
+
+
+@needs_affinity
+def test_acquire_disjoint_cores(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    nodes = [[0, 1], [2, 3]]
+
+    with acquire_cores(2, nodes) as first, acquire_cores(2, nodes) as second:
+        assert first == [0, 1]
+        assert second == [2, 3]
+
+    # The cores are released when the task finishes.
+    with acquire_cores(2, nodes) as third:
+        assert third == [0, 1]
+
+
+@pytest.mark.parametrize(
+    ("cmd", "expected"),
+    [
+        (["julia", "--", "s.jl"], ["julia", "--threads=4", "--", "s.jl"]),
+        (["julia", "-t", "2", "--", "s.jl"], ["julia", "-t", "2", "--", "s.jl"]),
+        (["julia", "--threads=auto"], ["julia", "--threads=auto"]),
+        (["julia", "-t", "2", "s.jl"], ["julia", "-t", "2", "s.jl"]),
+        (
+            ["julia", "--project=.", "s.jl", "-t"],
+            ["julia", "--threads=4", "--project=.", "s.jl", "-t"],
+        ),
+        (
+            ["julia", "-e", "1", "s.jl", "--threads=2"],
+            ["julia", "--threads=4", "-e", "1", "s.jl", "--threads=2"],
+        ),
+    ],
+)
+def test_add_threads_option(cmd, expected):
+    assert add_threads_option(cmd, 4) == expected
+
+
+def test_pin_command(monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda name: f"/usr/bin/{name}")
+    assert pin_command(["julia"], [0, 1, 2, 4]) == [
+        "/usr/bin/taskset",
+        "--cpu-list",
+        "0-2,4",
+        "julia",
+    ]
+
+    monkeypatch.setattr("shutil.which", lambda name: None)  # noqa: ARG005
+    assert pin_command(["julia"], [0]) == ["julia"]
+
+
+@needs_affinity
+@needs_posix_shell
+def test_pin_julia_task(tmp_path, fake_julia, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    fake_julia(
+        'echo "$1" > "$(dirname "$last")/../../out.txt"\n'
+        'grep Cpus_allowed_list /proc/self/status >> "$(dirname "$last")/../../out.txt"'
+    )
+    source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_cores_per_task = 1"
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    threads, allowed = tmp_path.joinpath("out.txt").read_text().splitlines()
+    assert threads == "--threads=1"
+    (core,) = parse_cpu_list(allowed.split(":")[1])
+    assert core in os.sched_getaffinity(0)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import PathNode
+from pytask import PythonNode
+from pytask import Task
+from pytask import build
+
+from pytask_julia.arrow import ArrowNode
+from pytask_julia.arrow import check_schema
+from pytask_julia.arrow import read_table
+from pytask_julia.arrow import write_table
+from pytask_julia.execute import collect_keyword_arguments
+from tests.conftest import create_execution_settings
+from tests.conftest import needs_posix_shell
+
+
+def test_arrow_nodes_are_serialized_with_schema(tmp_path):
+    task = Task(
+        base_name="task_example",
+        path=tmp_path / "task_example.py",
+        function=lambda: None,
+        depends_on={
+            "_script": PathNode(path=tmp_path / "script.jl"),
+            "_options": PythonNode(value=[]),
+            "_project": PythonNode(value=[]),
+            "_serialized": PythonNode(value=tmp_path / "serialized.json"),
+            "_settings": PythonNode(value=create_execution_settings()),
+        },
+        produces={
+            "table": ArrowNode(path=tmp_path / "table.arrow", schema={"a": "int64"})
+        },
+    )
+
+    kwargs = collect_keyword_arguments(task)
+
+    assert kwargs["table"] == {
+        "path": str(tmp_path / "table.arrow"),
+        "schema": {"a": "int64"},
+    }
+
+
+def test_read_and_write_table(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "table.arrow"
+
+    write_table(path, {"a": [1, 2], "b": ["x", "y"]})
+    table = read_table(path)
+
+    assert table.column("a").to_pylist() == [1, 2]
+    assert table.schema.field("b").type == pa.string()
+
+
+def test_read_arrow_stream(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "table.arrow"
+    table = pa.table({"a": [1, 2]})
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_stream(sink, table.schema) as f:
+        f.write_table(table)
+
+    assert read_table(path).equals(table)
+
+
+def test_check_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "table.arrow"
+    write_table(path, {"a": [1, 2], "b": [1.0, 2.0]})
+
+    assert check_schema(path, {"a": "int64", "b": "float64"}) == []
+    assert check_schema(path, {"a": "string", "c": "int64"}) == [
+        "The column 'a' has type int64, but string is expected.",
+        "The column 'c' is missing.",
+    ]
+
+
+def test_check_schema_of_stream(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "table.arrow"
+    table = pa.table({"a": [1, 2]})
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_stream(sink, table.schema) as f:
+        f.write_table(table)
+
+    assert check_schema(path, {"a": "int64"}) == []
+    assert check_schema(path, {"a": "string"}) == [
+        "The column 'a' has type int64, but string is expected."
+    ]
+
+
+# The fake julia writes the table with pyarrow.
+_FAKE_JULIA = f"""
+"{sys.executable}" - "$last" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+
+config = json.loads(Path(sys.argv[1]).read_text())
+table = pa.table({{"a": [1, 2, 3], "b": [0.5, 1.5, 2.5]}})
+with pa.OSFile(config["table"]["path"], "wb") as sink:
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+EOF
+"""
+
+
+@needs_posix_shell
+@pytest.mark.parametrize(
+    ("schema", "is_valid"),
+    [('{"a": "int64", "b": "double"}', True), ('{"a": "string"}', False)],
+)
+def test_python_task_reads_table_from_julia(tmp_path, fake_julia, schema, is_valid):
+    pytest.importorskip("pyarrow")
+    fake_julia(_FAKE_JULIA)
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+    from pytask import Product
+    from pytask_julia import ArrowNode
+    from typing import Annotated
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_write_table(
+        table: Annotated[Path, Product] = ArrowNode(
+            path=Path("table.arrow"), schema={schema}
+        ),
+    ):
+        pass
+
+    def task_sum(
+        table=ArrowNode(path=Path("table.arrow")), produces=Path("sum.txt")
+    ):
+        produces.write_text(str(sum(table.column("a").to_pylist())))
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+
+    session = build(paths=tmp_path)
+
+    if is_valid:
+        assert session.exit_code == ExitCode.OK
+        assert tmp_path.joinpath("sum.txt").read_text() == "6"
+    else:
+        assert session.exit_code == ExitCode.FAILED
+        exc_info = session.execution_reports[0].exc_info
+        assert exc_info is not None
+        assert "does not match its schema" in str(exc_info[1])
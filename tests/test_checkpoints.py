@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+from pytask import ExitCode
+from pytask import build
+
+from tests.conftest import needs_posix_shell
+
+# The fake julia saves a checkpoint and fails unless it finds one from a previous run.
+_FAKE_JULIA = f"""
+"{sys.executable}" -c "
+import json, sys
+from pathlib import Path
+config = json.load(open(sys.argv[1]))
+state = Path(config['_checkpoint']) / 'state.txt'
+if not state.exists():
+    state.write_text('half')
+    sys.exit(1)
+Path(config['produces']).write_text(state.read_text() + ' resumed')
+" "$last"
+"""
+
+_TASK_SOURCE = """
+import pytask
+from pathlib import Path
+
+@pytask.mark.julia(script=Path("script.jl"))
+def task_run_jl_script(depends_on=Path("in.txt"), produces=Path("out.txt")):
+    pass
+"""
+
+
+def _create_project(tmp_path):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(_TASK_SOURCE))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("in.txt").write_text("input")
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_checkpoints = true"
+    )
+
+
+def _get_checkpoints(tmp_path):
+    root = tmp_path / ".pytask" / "pytask-julia" / "checkpoints"
+    return sorted(root.glob("*/*"))
+
+
+@needs_posix_shell
+def test_resume_from_checkpoint(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    (checkpoint,) = _get_checkpoints(tmp_path)
+    assert checkpoint.joinpath("state.txt").read_text() == "half"
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "half resumed"
+    assert not checkpoint.parent.exists()
+
+
+@needs_posix_shell
+def test_checkpoint_is_reset_when_dependencies_change(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.FAILED
+    (first,) = _get_checkpoints(tmp_path)
+
+    tmp_path.joinpath("in.txt").write_text("changed input")
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    (second,) = _get_checkpoints(tmp_path)
+    assert second != first
+
+
+@needs_posix_shell
+def test_no_checkpoints_by_default(tmp_path, fake_julia):
+    fake_julia(
+        f'"{sys.executable}" -c "import json, sys; '
+        "assert '_checkpoint' not in json.load(open(sys.argv[1]))\" "
+        '"$last" || exit 1\n'
+        'echo done > "$(dirname "$last")/../../out.txt"'
+    )
+    _create_project(tmp_path)
+    tmp_path.joinpath("pyproject.toml").unlink()
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert not _get_checkpoints(tmp_path)
+
+
+@needs_posix_shell
+def test_checkpoint_is_kept_when_products_are_missing(tmp_path, fake_julia):
+    # The script succeeds, but the task fails because the product is missing.
+    fake_julia(
+        f'"{sys.executable}" -c "import json, sys, pathlib; '
+        "config = json.load(open(sys.argv[1])); "
+        "pathlib.Path(config['_checkpoint'], 'state.txt').write_text('done')\" "
+        '"$last"'
+    )
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    (checkpoint,) = _get_checkpoints(tmp_path)
+    assert checkpoint.joinpath("state.txt").read_text() == "done"
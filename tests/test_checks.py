@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import cli
+
+from pytask_julia.checks import ScriptCheck
+from pytask_julia.checks import check_scripts
+from pytask_julia.checks import get_path_to_cache
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+_FAKE_CHECKER = """
+if [ "$1" = "--version" ]; then echo "julia version 1.10.0"; exit 0; fi
+echo "$3" >> "$(dirname "$0")/calls"
+: > "$4"
+tab="$(printf '\\t')"
+while read -r line; do
+    path="${line%%"$tab"*}"
+    project="${line#*"$tab"}"
+    project="${project%%"$tab"*}"
+    case "$path" in
+        *broken*) printf '%s\\0%s\\0%s\\0' "$path" "$project" "line 1: error" >> "$4";;
+    esac
+done < "$3"
+"""
+
+
+def test_key_of_script_check_changes_with_project_and_version(tmp_path):
+    script = tmp_path.joinpath("script.jl")
+    script.write_text("x = 1")
+    tmp_path.joinpath("Project.toml").write_text("")
+    check = ScriptCheck(script, tmp_path.as_posix(), check_packages=True)
+
+    key = check.compute_key("1.10.0")
+    assert key != ScriptCheck(script, tmp_path.as_posix()).compute_key("1.10.0")
+    assert key != check.compute_key("1.11.0")
+
+    tmp_path.joinpath("Project.toml").write_text("[deps]")
+    assert key != check.compute_key("1.10.0")
+
+
+@needs_posix_shell
+def test_check_scripts_caches_scripts_without_problems(tmp_path, fake_julia):
+    fake_julia(_FAKE_CHECKER)
+    calls = tmp_path.joinpath("bin", "calls")
+    ok = ScriptCheck(tmp_path.joinpath("ok.jl"))
+    ok.path.write_text("x = 1")
+    broken = ScriptCheck(tmp_path.joinpath("broken.jl"))
+    broken.path.write_text("x = (")
+    path_to_cache = get_path_to_cache(tmp_path)
+
+    assert check_scripts([ok, broken], path_to_cache) == {broken: "line 1: error"}
+    assert check_scripts([ok, broken], path_to_cache) == {broken: "line 1: error"}
+    assert check_scripts([ok], path_to_cache) == {}
+    assert len(calls.read_text().splitlines()) == len([ok, broken])
+
+    ok.path.write_text("x = 2")
+    assert check_scripts([ok], path_to_cache) == {}
+    assert len(calls.read_text().splitlines()) == len([ok, broken, ok])
+
+
+@needs_posix_shell
+def test_collection_fails_for_script_with_problem(runner, tmp_path, fake_julia):
+    fake_julia(_FAKE_CHECKER)
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("broken.jl"))
+    def task_run_jl_script():
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("broken.jl").write_text("x = (")
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_check_syntax = true"
+    )
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.COLLECTION_FAILED
+    assert "Some Julia scripts have problems." in result.output
+    assert "line 1: error" in result.output
+
+
+@needs_julia
+@pytest.mark.parametrize(
+    ("julia_script", "expected"),
+    [
+        ("x = (1,\ny = 2 +", "line"),
+        ("using NotAnInstalledPackage", "NotAnInstalledPackage"),
+    ],
+)
+def test_check_scripts_with_julia(runner, tmp_path, julia_script, expected):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"), project="{ROOT.as_posix()}")
+    def task_run_jl_script():
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").write_text(julia_script)
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_check_packages = true"
+    )
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.COLLECTION_FAILED
+    assert "Some Julia scripts have problems." in result.output
+    assert expected in result.output
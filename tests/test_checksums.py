@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import textwrap
+
+import pytest
+from _pytask.path import HashPathCache
+from _pytask.path import hash_path
+from pytask import ExitCode
+from pytask import TaskOutcome
+from pytask import build
+from pytask import cli
+
+from pytask_julia.checksums import _get_cache_key
+from pytask_julia.checksums import _is_cache_supported
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+
+def test_cache_of_pytask_is_supported():
+    # Fails if a new version of pytask changes how it caches the hashes of files.
+    assert _is_cache_supported()
+
+
+def test_cache_key_matches_hash_path(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("data")
+    modification_time = path.stat().st_mtime
+
+    HashPathCache.add(_get_cache_key(path, modification_time), "from julia")
+
+    assert hash_path(path, modification_time) == "from julia"
+
+
+# The fake runner writes the product and the checksums like runner.jl.
+_FAKE_JULIA = f"""
+"{sys.executable}" - "$@" <<'EOF'
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+settings = dict(arg.split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+products = Path(settings["products"]).read_text().splitlines()
+lines = []
+for index, product in enumerate(products):
+    Path(product).write_text("product")
+    stat = os.stat(product)
+    digest = DIGEST
+    lines.append(f"{{index}}\\t{{stat.st_size}}\\t{{stat.st_mtime!r}}\\t{{digest}}\\n")
+Path(settings["checksums"]).write_text("".join(lines))
+EOF
+"""
+
+_CORRECT_DIGEST = 'hashlib.sha256(b"product").hexdigest()'
+_WRONG_DIGEST = '"0" * 64'
+
+
+def _create_project(tmp_path):
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_checksums = true"
+    )
+
+
+@needs_posix_shell
+@pytest.mark.parametrize(
+    ("digest", "outcome"),
+    [
+        (_CORRECT_DIGEST, TaskOutcome.SKIP_UNCHANGED),
+        (_WRONG_DIGEST, TaskOutcome.SUCCESS),
+    ],
+)
+def test_checksums_from_julia(runner, tmp_path, fake_julia, digest, outcome):
+    fake_julia(_FAKE_JULIA.replace("DIGEST", digest))
+    _create_project(tmp_path)
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "product"
+    is_wrong = "checksums computed by Julia for some products are wrong" in (
+        result.output
+    )
+    assert is_wrong is (digest == _WRONG_DIGEST)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert session.execution_reports[0].outcome == outcome
+
+
+@needs_posix_shell
+def test_checksums_are_turned_off_without_support(
+    runner, tmp_path, fake_julia, monkeypatch
+):
+    monkeypatch.setattr("pytask_julia.checksums._is_cache_supported", lambda: False)
+    fake_julia('echo product > "$(dirname "$last")/../../out.txt"')
+    _create_project(tmp_path)
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert "'julia_checksums' is turned off" in result.output
+
+
+@needs_julia
+def test_checksums_with_julia(tmp_path):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"), project="{ROOT.as_posix()}")
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").write_text(
+        "import JSON; config = JSON.parse(read(ARGS[1], String))\n"
+        'write(config["produces"], "product")\n'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_checksums = true"
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    path = tmp_path / "out.txt"
+    assert hash_path(path, path.stat().st_mtime) == (
+        hashlib.sha256(b"product").hexdigest()
+    )
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+
+from pytask_julia.cluster import parse_machines
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        (2, ["2"]),
+        (["user@host", ["user@other", 8]], ["user@host", "user@other=8"]),
+    ],
+)
+def test_parse_machines(value, expected):
+    assert parse_machines(value) == expected
+
+
+@pytest.mark.parametrize("value", [0, True, "host", [], [["host"]], [["host", 0]]])
+def test_parse_invalid_machines(value):
+    with pytest.raises(ValueError, match="'julia_cluster' is"):
+        parse_machines(value)
+
+
+# The fake manager runs the scripts in threads and records the executable for remote
+# workers, the machines and the requests. Scripts write their product or fail if their
+# name says so.
+_FAKE_JULIA = f"""
+case "$2" in
+*cluster.jl)
+    cat > "$(dirname "$0")/manager.py" <<'EOF'
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+julia = Path(__file__).with_name("julia")
+log = Path(__file__).with_name("manager.txt")
+log.write_text(" ".join(sys.argv[2:]) + "\\n")
+server = socket.socket(socket.AF_UNIX)
+server.bind(sys.argv[1])
+server.listen()
+
+
+def serve(connection):
+    with connection, connection.makefile("rw") as f:
+        script, serialized, n, *rest = f.readline().rstrip("\\n").split("\\t")
+        options, settings = rest[: int(n)], rest[int(n) :]
+        with log.open("a") as file:
+            file.write(Path(serialized).suffix + "\\n")
+        cmd = [julia, *options, "--", script, serialized, *settings]
+        returncode = subprocess.run(cmd).returncode
+        f.write("ok\\n" if returncode == 0 else f"error\\t{{returncode}}\\n")
+
+
+def accept():
+    while True:
+        connection, _ = server.accept()
+        threading.Thread(target=serve, args=(connection,), daemon=True).start()
+
+
+threading.Thread(target=accept, daemon=True).start()
+sys.stdin.read()
+EOF
+    exec "{sys.executable}" "$(dirname "$0")/manager.py" "$3" "$4" "$5";;
+*fail.jl) exit 3;;
+esac
+"{sys.executable}" -c "
+import json, sys
+config = json.load(open(sys.argv[1]))
+open(config['produces'], 'w').write('done')
+" "$last"
+"""
+
+
+def _create_project(tmp_path, script="script.jl"):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    for i in range(2):
+
+        @pytask.task(id=str(i))
+        @pytask.mark.julia(script=Path("{script}"))
+        def task_run_jl_script(produces=Path(f"out_{{i}}.txt")):
+            pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath(script).touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_cluster = 2"
+    )
+
+
+@needs_posix_shell
+def test_run_tasks_on_cluster(tmp_path, fake_julia):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out_0.txt").read_text() == "done"
+    assert tmp_path.joinpath("out_1.txt").read_text() == "done"
+    log = path_to_julia.parent.joinpath("manager.txt").read_text().splitlines()
+    assert log == ["julia 2", ".json", ".json"]
+
+
+@needs_posix_shell
+def test_failing_task_on_cluster(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path, script="fail.jl")
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    exc_info = session.execution_reports[0].exc_info
+    assert exc_info is not None
+    exception = exc_info[1]
+    assert isinstance(exception, subprocess.CalledProcessError)
+    assert "exit status 3" in str(exception)
+
+
+@needs_posix_shell
+def test_cluster_fails_to_start(tmp_path, fake_julia):
+    fake_julia("exit 1")
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+
+
+@needs_julia
+def test_run_tasks_on_cluster_with_julia(tmp_path):
+    _create_project(tmp_path)
+    tmp_path.joinpath("script.jl").write_text(
+        "import JSON; config = JSON.parse(read(ARGS[1], String))\n"
+        'write(config["produces"], "done")\n'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f'[tool.pytask.ini_options]\njulia_cluster = 2\njulia_project = "{ROOT}"'
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out_0.txt").read_text() == "done"
+    assert tmp_path.joinpath("out_1.txt").read_text() == "done"
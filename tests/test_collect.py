@@ -5,9 +5,9 @@ from contextlib import ExitStack as does_not_raise  # noqa: N813
 import pytest
 from pytask import Mark
 
-from pytask_julia.collect import SERIALIZERS
-from pytask_julia.collect import _parse_julia_mark
-from pytask_julia.collect import _parse_project
+from pytask_julia.serialization import SERIALIZERS
+from pytask_julia.shared import parse_julia_mark
+from pytask_julia.shared import parse_project
 from tests.conftest import ROOT
 
 
@@ -38,6 +38,9 @@ from tests.conftest import ROOT
                     "serializer": None,
                     "suffix": ".json",
                     "project": "some_path",
+                    "shards": None,
+                    "merge": None,
+                    "executable": None,
                 },
             ),
         ),
@@ -65,9 +68,21 @@ from tests.conftest import ROOT
                     "serializer": "json",
                     "suffix": SERIALIZERS["json"]["suffix"],
                     "project": "some_path",
+                    "shards": None,
+                    "merge": None,
+                    "executable": None,
                 },
             ),
         ),
+        (
+            Mark("julia", (), {"script": "script.jl", "shards": 0}),
+            [],
+            None,
+            ".json",
+            None,
+            pytest.raises(ValueError, match="'shards' is 0"),
+            None,
+        ),
     ],
 )
 def test_parse_julia_mark(  # noqa: PLR0913
@@ -80,7 +95,7 @@ def test_parse_julia_mark(  # noqa: PLR0913
     expected,
 ):
     with expectation:
-        out = _parse_julia_mark(
+        out = parse_julia_mark(
             mark,
             default_options,
             default_serializer,
@@ -97,5 +112,5 @@ def test_parse_julia_mark(  # noqa: PLR0913
     ],
 )
 def test_parse_project(project, root, expected):
-    result = _parse_project(project, root)
+    result = parse_project(project, root)
     assert result == expected
@@ -1,8 +1,30 @@
 from __future__ import annotations
 
+import pytest
+from pytask import ExitCode
 from pytask import build
 
 
 def test_marker_is_configured(tmp_path):
     session = build(paths=tmp_path)
     assert "julia" in session.config["markers"]
+
+
+def test_profiling_is_disabled_by_default(tmp_path):
+    session = build(paths=tmp_path)
+    assert session.config["julia_profile"] is False
+    assert session.config["julia_metrics"] is False
+    assert session.config["julia_cores_per_task"] is None
+    assert session.config["julia_cache_max_size"] == 10 * 1024**3
+    assert session.config["julia_track_allocation"] is False
+    assert session.config["julia_stall_timeout"] is None
+    assert session.config["julia_capture_logs"] is False
+
+
+@pytest.mark.parametrize("value", ["0", "-1", '"10"', "true"])
+def test_invalid_stall_timeout(tmp_path, value):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f"[tool.pytask.ini_options]\njulia_stall_timeout = {value}"
+    )
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.CONFIGURATION_FAILED
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from contextlib import suppress
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+from pytask import cli
+
+from pytask_julia.daemon import _Daemon
+from pytask_julia.daemon import get_path_to_socket
+from pytask_julia.daemon import request_daemon
+from pytask_julia.shared import create_environment
+from tests.conftest import needs_posix_shell
+
+# The fake session records its arguments and executes scripts as Python code.
+_FAKE_JULIA = f"""
+echo "$@" >> "$(dirname "$0")/processes.txt"
+cat > "$(dirname "$0")/session.py" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+for line in sys.stdin:
+    command, *args = line.rstrip("\\n").split("\\t")
+    if command == "run":
+        config = json.loads(Path(args[1]).read_text())
+        try:
+            exec(Path(args[0]).read_text(), {{"Path": Path, "config": config}})
+        except Exception as e:
+            print("error", repr(e), sep="\\t", flush=True)
+            continue
+    print("ok", flush=True)
+EOF
+exec "{sys.executable}" "$(dirname "$0")/session.py"
+"""
+
+_TASK_SOURCE = """
+import pytask
+from pathlib import Path
+
+@pytask.mark.julia(script=Path("script.jl"))
+def task_julia(produces=Path("out.txt")):
+    pass
+"""
+
+
+@pytest.fixture
+def daemon_socket(tmp_path, monkeypatch):
+    """Use a socket in the temporary directory and stop the daemon after the test."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    path = get_path_to_socket()
+    yield path
+    with suppress(RuntimeError):
+        request_daemon(path, "stop")
+
+
+def _create_project(tmp_path, text="first", config="julia_daemon = true"):
+    tmp_path.joinpath("task_example.py").write_text(_TASK_SOURCE)
+    tmp_path.joinpath("script.jl").write_text(
+        f'Path(config["produces"]).write_text("{text}")'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f"[tool.pytask.ini_options]\n{config}"
+    )
+
+
+def _read_processes(path_to_julia):
+    return path_to_julia.parent.joinpath("processes.txt").read_text().splitlines()
+
+
+@needs_posix_shell
+def test_daemon_keeps_sessions_between_builds(
+    runner, tmp_path, fake_julia, daemon_socket
+):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    result = runner.invoke(cli, ["julia-daemon", "start"])
+    assert result.exit_code == ExitCode.OK
+    assert daemon_socket.exists()
+
+    for text in ("first", "second"):
+        _create_project(tmp_path, text)
+        session = build(paths=tmp_path)
+        assert session.exit_code == ExitCode.OK
+        assert tmp_path.joinpath("out.txt").read_text() == text
+
+    (arguments,) = _read_processes(path_to_julia)
+    assert arguments.endswith("session.jl transient")
+
+    result = runner.invoke(cli, ["julia-daemon", "status"])
+    assert "is running" in result.output
+    result = runner.invoke(cli, ["julia-daemon", "stop"])
+    assert "Stopped" in result.output
+
+
+@needs_posix_shell
+def test_daemon_restarts_sessions_after_manifest_changes(
+    runner, tmp_path, fake_julia, daemon_socket
+):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    runner.invoke(cli, ["julia-daemon", "start"])
+    tmp_path.joinpath("Manifest.toml").write_text("# first")
+
+    config = 'julia_daemon = true\njulia_project = "."'
+    _create_project(tmp_path, "first", config)
+    assert build(paths=tmp_path).exit_code == ExitCode.OK
+    tmp_path.joinpath("Manifest.toml").write_text("# second")
+    _create_project(tmp_path, "second", config)
+    assert build(paths=tmp_path).exit_code == ExitCode.OK
+
+    assert len(_read_processes(path_to_julia)) == 2  # noqa: PLR2004
+    assert daemon_socket.exists()
+
+
+@needs_posix_shell
+def test_failing_script_in_daemon(runner, tmp_path, fake_julia, daemon_socket):  # noqa: ARG001
+    fake_julia(_FAKE_JULIA)
+    runner.invoke(cli, ["julia-daemon", "start"])
+    _create_project(tmp_path)
+    tmp_path.joinpath("script.jl").write_text("raise ValueError('broken')")
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    exc_info = session.execution_reports[0].exc_info
+    assert exc_info is not None
+    assert "broken" in str(exc_info[1])
+
+
+@needs_posix_shell
+def test_daemon_runs_scripts_in_cwd_and_env_of_build(
+    runner,
+    tmp_path,
+    fake_julia,
+    daemon_socket,  # noqa: ARG001
+    monkeypatch,
+):
+    fake_julia(_FAKE_JULIA)
+    runner.invoke(cli, ["julia-daemon", "start"])
+    _create_project(tmp_path)
+    tmp_path.joinpath("script.jl").write_text(
+        "import os\n"
+        'Path(config["produces"]).write_text(os.environ["VALUE"] + " " + os.getcwd())'
+    )
+    monkeypatch.setenv("VALUE", "forwarded")
+    monkeypatch.chdir(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == f"forwarded {tmp_path}"
+
+
+@needs_posix_shell
+def test_daemon_rejects_malformed_requests(runner, fake_julia, daemon_socket):
+    fake_julia(_FAKE_JULIA)
+    runner.invoke(cli, ["julia-daemon", "start"])
+
+    with pytest.raises(RuntimeError, match="malformed"):
+        request_daemon(daemon_socket, "run", script="script.jl", cmd=["sh"])
+
+
+@needs_posix_shell
+def test_daemon_with_other_executable_is_not_used(
+    runner,
+    tmp_path,
+    fake_julia,
+    daemon_socket,  # noqa: ARG001
+):
+    path_to_julia = fake_julia(
+        'echo "$@" >> "$(dirname "$0")/processes.txt"\n'
+        'echo first > "$(dirname "$last")/../../out.txt"'
+    )
+    other = tmp_path / "other" / "julia"
+    other.parent.mkdir()
+    other.write_text(
+        f"#!/bin/sh\nexec {sys.executable} -c 'import sys; sys.stdin.read()'"
+    )
+    other.chmod(0o755)
+    result = runner.invoke(cli, ["julia-daemon", "start", f"--executable={other}"])
+    assert result.exit_code == ExitCode.OK
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    (arguments,) = _read_processes(path_to_julia)
+    assert "session.jl" not in arguments
+
+
+@needs_posix_shell
+def test_fall_back_without_daemon(tmp_path, fake_julia, daemon_socket):  # noqa: ARG001
+    path_to_julia = fake_julia(
+        'echo "$@" >> "$(dirname "$0")/processes.txt"\n'
+        'echo first > "$(dirname "$last")/../../out.txt"'
+    )
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    (arguments,) = _read_processes(path_to_julia)
+    assert "session.jl" not in arguments
+
+
+@needs_posix_shell
+def test_daemon_stops_idle_and_large_sessions(tmp_path, fake_julia, monkeypatch):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+    serialized = tmp_path / "args.json"
+    serialized.write_text(f'{{"produces": "{(tmp_path / "out.txt").as_posix()}"}}')
+    script = str(tmp_path / "script.jl")
+
+    args = (script, str(serialized), [], str(tmp_path), create_environment())
+    daemon = _Daemon("julia", idle_timeout=0.01, memory_limit=None)
+    daemon.run(*args)
+    assert daemon.idle
+    time.sleep(0.05)
+    daemon.stop_idle_sessions()
+    assert not any(daemon.idle.values())
+    assert daemon.is_idle()
+
+    monkeypatch.setattr("pytask_julia.daemon._get_memory", lambda pid: 2 * 1024**2)  # noqa: ARG005
+    daemon = _Daemon("julia", idle_timeout=60, memory_limit=1024**2)
+    daemon.run(*args)
+    assert not any(daemon.idle.values())
+    daemon.close()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+import textwrap
+
+from pytask import ExitCode
+from pytask import cli
+
+from pytask_julia.depots import acquire_depot
+from pytask_julia.depots import create_depot_path
+from tests.conftest import needs_posix_shell
+
+
+def test_create_depot_path(tmp_path):
+    local, shared = tmp_path / "local", tmp_path / "shared"
+    assert create_depot_path(local, shared) == os.pathsep.join(
+        [str(local), str(shared), ""]
+    )
+
+
+def test_acquire_depot_gives_free_slots(tmp_path):
+    with acquire_depot(tmp_path) as first, acquire_depot(tmp_path) as second:
+        assert first == tmp_path / "worker-0"
+        assert second == tmp_path / "worker-1"
+
+    with acquire_depot(tmp_path) as depot:
+        assert depot == tmp_path / "worker-0"
+
+
+@needs_posix_shell
+def test_run_jl_script_w_shared_depot(runner, tmp_path, fake_julia):
+    fake_julia('printf "%s" "$JULIA_DEPOT_PATH" > "$(dirname "$last")/../../out.txt"')
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\n"
+        'julia_shared_depot = "shared"\n'
+        'julia_local_depot = "local"'
+    )
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == create_depot_path(
+        tmp_path.joinpath("local", "worker-0"), tmp_path.joinpath("shared")
+    )
+
+
+@needs_posix_shell
+def test_prime_julia_depot(runner, tmp_path, fake_julia):
+    fake_julia(
+        'printf "%s %s" "$JULIA_DEPOT_PATH" "$2" > "${JULIA_DEPOT_PATH%:}/out.txt"'
+    )
+    depot = tmp_path / "depot"
+
+    result = runner.invoke(
+        cli,
+        ["prime-julia-depot", depot.as_posix(), "--project", tmp_path.as_posix()],
+    )
+
+    assert result.exit_code == ExitCode.OK
+    assert depot.joinpath("out.txt").read_text() == (
+        f"{create_depot_path(depot)} --project={tmp_path.as_posix()}"
+    )
+
+
+@needs_posix_shell
+def test_prime_julia_depot_fails(runner, tmp_path, fake_julia):
+    fake_julia("exit 1")
+
+    result = runner.invoke(cli, ["prime-julia-depot", tmp_path.as_posix()])
+
+    assert result.exit_code == 1
+    assert "Priming the depot" in result.output
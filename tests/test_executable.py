@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import shutil
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import cli
+
+from pytask_julia.executable import get_julia_version
+from pytask_julia.executable import resolve_executable
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+
+def test_resolve_missing_executable(monkeypatch):
+    monkeypatch.setenv("PATH", "")
+    with pytest.raises(RuntimeError, match="'julia' is not found"):
+        resolve_executable("julia")
+
+
+@needs_posix_shell
+def test_resolve_executable_once(monkeypatch, fake_julia):
+    path = fake_julia('echo "julia version 1.10.0"')
+    calls = []
+    which = shutil.which
+
+    def _which(*args, **kwargs):
+        calls.append(args)
+        return which(*args, **kwargs)
+
+    monkeypatch.setattr("pytask_julia.executable.shutil.which", _which)
+
+    assert resolve_executable("julia") == str(path)
+    assert resolve_executable("julia") == str(path)
+    assert resolve_executable(path) == str(path)
+    assert len(calls) == len(["julia", path])
+    # On Windows, shutil.which only accepts strings before Python 3.12.
+    assert all(isinstance(cmd, str) for cmd, *_ in calls)
+    assert get_julia_version(str(path)) == "1.10.0"
+
+
+@needs_posix_shell
+@pytest.mark.parametrize("in_config", [False, True])
+def test_run_jl_script_w_custom_executable(runner, tmp_path, fake_julia, in_config):
+    # The fake julia is removed from the PATH.
+    path = fake_julia('printf done > "$(dirname "$last")/../../out.txt"')
+    path.rename(tmp_path.joinpath("bin", "custom-julia"))
+
+    mark_kwargs = "" if in_config else ', executable="bin/custom-julia"'
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"){mark_kwargs})
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+    if in_config:
+        tmp_path.joinpath("pyproject.toml").write_text(
+            '[tool.pytask.ini_options]\njulia_executable = "bin/custom-julia"'
+        )
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "done"
+
+
+@needs_julia
+def test_get_julia_version():
+    major, minor, *_ = get_julia_version(resolve_executable("julia")).split(".")
+    assert major.isdigit()
+    assert minor.isdigit()
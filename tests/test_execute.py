@@ -8,34 +8,14 @@ from typing import cast
 
 import pytest
 from pytask import ExitCode
-from pytask import Mark
-from pytask import Task
 from pytask import build
 from pytask import cli
 
-from pytask_julia.execute import pytask_execute_task_setup
 from tests.conftest import ROOT
 from tests.conftest import needs_julia
 from tests.conftest import parametrize_parse_code_serializer_suffix
 
 
-def test_pytask_execute_task_setup_missing_julia(monkeypatch):
-    """Make sure that the task setup raises errors."""
-    # Act like julia is installed since we do not test this.
-    monkeypatch.setattr(
-        "pytask_julia.execute.shutil.which",
-        lambda x: None,  # noqa: ARG005
-    )
-    task = Task(
-        base_name="example",
-        path=Path(),
-        function=lambda: None,
-        markers=[Mark("julia", (), {})],
-    )
-    with pytest.raises(RuntimeError, match="julia is needed"):
-        pytask_execute_task_setup(task)
-
-
 @needs_julia
 @parametrize_parse_code_serializer_suffix
 @pytest.mark.parametrize(
@@ -161,16 +141,13 @@ def test_raise_error_if_julia_is_not_found(
     tmp_path.joinpath("script.jl").write_text(textwrap.dedent(julia_script))
 
     # Hide julia if available.
-    monkeypatch.setattr(
-        "pytask_julia.execute.shutil.which",
-        lambda x: None,  # noqa: ARG005
-    )
+    monkeypatch.setenv("PATH", "")
 
     session = build(paths=tmp_path)
 
-    assert session.exit_code == ExitCode.FAILED
-    execution_reports = cast("list", session.execution_reports)
-    assert isinstance(execution_reports[0].exc_info[1], RuntimeError)
+    assert session.exit_code == ExitCode.COLLECTION_FAILED
+    collection_reports = cast("list", session.collection_reports)
+    assert isinstance(collection_reports[0].exc_info[1], RuntimeError)
 
 
 @needs_julia
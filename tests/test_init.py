@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import pytask_julia",
+        "from pytask_julia import ArrowNode, JuliaObjectNode",
+        "import pytask_julia.arrow",
+        "import pytask_julia.collect",
+        "import pytask_julia.nodes",
+    ],
+)
+def test_import_in_fresh_interpreter(statement):
+    # pytask loads the plugin through its entry point, which must not cause a cycle.
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", statement], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
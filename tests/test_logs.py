@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import gzip
+import io
+import subprocess
+import textwrap
+from pathlib import Path
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+
+from pytask_julia.collect import run_jl_script
+from pytask_julia.logs import RingBuffer
+from pytask_julia.logs import capture_log
+from pytask_julia.logs import get_path_to_log
+from tests.conftest import create_execution_settings
+from tests.conftest import needs_posix_shell
+
+
+def test_ring_buffer_keeps_last_bytes():
+    buffer = RingBuffer(max_size=10)
+    for i in range(100):
+        buffer.write(f"line {i}\n".encode())
+
+    assert len(buffer.getvalue()) == buffer.max_size
+    assert buffer.getvalue().endswith(b"line 99\n")
+    assert buffer.get_tail() == "line 99\n"
+
+
+def test_ring_buffer_w_short_output():
+    buffer = RingBuffer(max_size=100)
+    buffer.write(b"first\nsecond\n")
+    assert buffer.get_tail() == "first\nsecond\n"
+
+
+def test_log_capture(tmp_path):
+    content = b"".join(f"line {i}\n".encode() for i in range(100_000))
+    stream = io.BufferedReader(io.BytesIO(content))
+    path = tmp_path.joinpath("logs", "task.log.gz")
+
+    with capture_log(stream, path, max_size=100) as capture:
+        pass
+
+    assert gzip.decompress(path.read_bytes()) == content
+    assert capture.tail.get_tail().endswith("line 99999\n")
+    assert path.as_posix() in capture.format_tail()
+
+
+def test_get_path_to_log():
+    path = get_path_to_log(Path(".pytask", "pytask-julia", "abc.json"))
+    assert path == Path(".pytask", "pytask-julia", "logs", "abc.log.gz")
+
+
+@needs_posix_shell
+def test_run_jl_script_w_captured_logs(tmp_path, fake_julia, capsys):
+    fake_julia(
+        """
+        i=0
+        while [ $i -lt 2000 ]; do echo "output $i"; i=$((i+1)); done
+        echo "error message" >&2
+        exit 1
+        """
+    )
+    serialized = tmp_path.joinpath("task.json")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        run_jl_script(
+            _script=Path("script.jl"),
+            _options=[],
+            _serialized=serialized,
+            _project=[],
+            _settings=create_execution_settings(log_tail=100),
+        )
+
+    captured = capsys.readouterr()
+    assert "output 0\n" not in captured.out
+    assert "output 1999\nerror message\n" in captured.err
+    assert "output 0\n" not in captured.err
+
+    log = gzip.decompress(get_path_to_log(serialized).read_bytes()).decode()
+    assert log.startswith("output 0\n")
+    assert log.endswith("output 1999\nerror message\n")
+
+
+@needs_posix_shell
+def test_only_log_of_latest_run_is_kept(tmp_path, fake_julia):
+    fake_julia('echo "run $(date +%s%N)"')
+    source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_first():
+        pass
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_second():
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_capture_logs = true"
+    )
+
+    for _ in range(3):
+        session = build(paths=tmp_path, force=True)
+        assert session.exit_code == ExitCode.OK
+
+    logs = sorted(tmp_path.joinpath(".pytask", "pytask-julia", "logs").iterdir())
+    assert len(logs) == 2  # noqa: PLR2004
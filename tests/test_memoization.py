@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import sys
+import textwrap
+
+from pytask import ExitCode
+from pytask import build
+
+from pytask_julia.memoization import evict_memoized
+from pytask_julia.memoization import get_path_to_memoized
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+
+def _create_entry(root, name, size, last_used):
+    path = root.joinpath(name[:2], f"{name}.jls")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (last_used, last_used))
+    return path
+
+
+def test_evict_least_recently_used_entries(tmp_path):
+    oldest = _create_entry(tmp_path, "aa1", 10, 1)
+    old = _create_entry(tmp_path, "bb1", 10, 2)
+    recent = _create_entry(tmp_path, "aa2", 10, 3)
+
+    evicted = evict_memoized(tmp_path, 15)
+
+    assert evicted == [oldest, old]
+    assert not oldest.exists()
+    assert not old.exists()
+    assert recent.exists()
+
+
+def test_evict_skips_temporary_files(tmp_path):
+    entry = _create_entry(tmp_path, "aa1", 10, 1)
+    # Julia writes entries to a temporary file in the same folder and renames it.
+    temporary = tmp_path.joinpath("aa", "jl_AbCdEf")
+    temporary.write_bytes(b"x" * 10)
+    os.utime(temporary, (0, 0))
+
+    assert evict_memoized(tmp_path, 0) == [entry]
+    assert temporary.exists()
+
+
+def test_evict_missing_cache(tmp_path):
+    assert evict_memoized(tmp_path / "missing", 1) == []
+
+
+@needs_posix_shell
+def test_cache_is_passed_and_evicted(tmp_path, fake_julia):
+    # The fake julia fills the cache with an entry which is larger than allowed.
+    fake_julia(
+        f"""
+        "{sys.executable}" -c "
+        import json, sys
+        from pathlib import Path
+        config = json.load(open(sys.argv[1]))
+        entry = Path(config['_cache'], 'ab', 'abc.jls')
+        entry.parent.mkdir(parents=True)
+        entry.write_bytes(bytes(100))
+        Path(config['produces']).write_text(config['_cache'])
+        " "$last"
+        """
+    )
+    source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_cache_max_size = 10"
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    cache = get_path_to_memoized(tmp_path)
+    assert tmp_path.joinpath("out.txt").read_text() == str(cache)
+    assert not cache.joinpath("ab", "abc.jls").exists()
+
+
+@needs_julia
+def test_memoize_calls_across_tasks(tmp_path):
+    source = f"""
+    import pytask
+    from pathlib import Path
+
+    for i in range(2):
+
+        @pytask.task(id=str(i))
+        @pytask.mark.julia(script=Path("script.jl"), project="{ROOT.as_posix()}")
+        def task_run_jl_script(produces=Path(f"out-{{i}}.txt")):
+            pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    script = """
+    import JSON; config = JSON.parse(read(ARGS[1], String))
+    using PytaskJulia
+
+    function preprocess(n; offset = 0)
+        open(io -> println(io, "called"), joinpath(@__DIR__, "calls.txt"), "a")
+        return collect(1:n) .+ offset
+    end
+
+    data = @pytask_cache preprocess(3; offset = 1)
+    write(config["produces"], string(sum(data)))
+    """
+    tmp_path.joinpath("script.jl").write_text(textwrap.dedent(script))
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out-0.txt").read_text() == "9"
+    assert tmp_path.joinpath("out-1.txt").read_text() == "9"
+    assert tmp_path.joinpath("calls.txt").read_text().splitlines() == ["called"]
+    assert len(list(get_path_to_memoized(tmp_path).glob("*/*.jls"))) == 1
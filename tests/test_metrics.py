@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import textwrap
+
+from pytask import ExitCode
+from pytask import cli
+
+from pytask_julia.metrics import RuntimeMetrics
+from pytask_julia.metrics import read_metrics
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+_TASK_SOURCE = """
+import pytask
+from pathlib import Path
+
+@pytask.mark.julia(script=Path("script.jl"){project})
+def task_run_jl_script(produces=Path("out.txt")):
+    pass
+"""
+
+
+def test_read_metrics(tmp_path):
+    path = tmp_path.joinpath("task.metrics")
+    path.write_text(
+        "elapsed\t2.0\ncompile_time\t1.5\ngc_time\t0.1\ngc_count\t3\n"
+        "allocated\t1024\nunknown\t1\ncompiled_packages\tmany\nmalformed\n"
+    )
+
+    metrics = read_metrics(path)
+
+    assert metrics == RuntimeMetrics(
+        elapsed=2.0, compile_time=1.5, gc_time=0.1, gc_count=3, allocated=1024
+    )
+    assert metrics.compile_share == 0.75  # noqa: PLR2004
+    assert metrics.get_dominant_phases() == ["compilation"]
+
+
+def test_dominant_phases_without_runtime():
+    assert RuntimeMetrics(gc_time=1.0).get_dominant_phases() == []
+
+
+@needs_posix_shell
+def test_report_metrics(runner, tmp_path, fake_julia):
+    # The runner is not executed, so the fake julia writes the metrics itself.
+    fake_julia(
+        """
+        for arg; do case "$arg" in metrics=*) metrics="${arg#metrics=}";; esac; done
+        printf 'elapsed\\t2.0\\ngc_time\\t1.5\\ngc_count\\t7\\n' > "$metrics"
+        echo done > "$(dirname "$metrics")/../../out.txt"
+        """
+    )
+    tmp_path.joinpath("task_example.py").write_text(
+        textwrap.dedent(_TASK_SOURCE.format(project=""))
+    )
+    tmp_path.joinpath("script.jl").touch()
+
+    result = runner.invoke(cli, [tmp_path.as_posix(), "--julia-metrics"])
+
+    assert result.exit_code == ExitCode.OK
+    assert "Runtime metrics of Julia tasks" in result.output
+    assert "75.0%" in result.output
+    assert "compilation" not in result.output
+
+
+@needs_julia
+def test_run_jl_script_w_metrics(runner, tmp_path):
+    project = f', project="{ROOT.as_posix()}"'
+    tmp_path.joinpath("task_example.py").write_text(
+        textwrap.dedent(_TASK_SOURCE.format(project=project))
+    )
+    tmp_path.joinpath("script.jl").write_text(
+        textwrap.dedent(
+            """
+            import JSON; config = JSON.parse(read(ARGS[1], String))
+            data = [rand(100) for _ in 1:10_000]
+            write(config["produces"], string(sum(sum, data)))
+            """
+        )
+    )
+
+    result = runner.invoke(cli, [tmp_path.as_posix(), "--julia-metrics"])
+
+    assert result.exit_code == ExitCode.OK
+    (path,) = tmp_path.joinpath(".pytask", "pytask-julia").glob("*.metrics")
+    metrics = read_metrics(path)
+    assert metrics.elapsed > 0
+    assert metrics.allocated > 0
+    assert "Runtime metrics of Julia tasks" in result.output
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sys
+
+from pytask import ExitCode
+from pytask import TaskOutcome
+from pytask import build
+
+from tests.conftest import needs_posix_shell
+
+# The fake process records its arguments and requests and executes scripts as Python.
+_FAKE_JULIA = f"""
+echo "$@" >> "$(dirname "$0")/processes.txt"
+cat > "$(dirname "$0")/session.py" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+log = Path(sys.argv[1])
+for line in sys.stdin:
+    command, *args = line.rstrip("\\n").split("\\t")
+    with log.open("a") as f:
+        f.write(command + "\\n")
+    if command == "run":
+        config = json.loads(Path(args[1]).read_text())
+        exec(Path(args[0]).read_text(), {{"Path": Path, "config": config}})
+    print("ok", flush=True)
+EOF
+exec "{sys.executable}" "$(dirname "$0")/session.py" "$(dirname "$0")/requests.txt"
+"""
+
+_PYTHON_TASK_SOURCE = """
+from pathlib import Path
+
+def task_python(produces=Path("data.txt")):
+    # Keep the product unchanged so that the Julia task is skipped.
+    if not produces.exists():
+        produces.write_text("data")
+"""
+
+_TASK_SOURCE = """
+import pytask
+from pathlib import Path
+
+@pytask.mark.julia(script=Path("script.jl"))
+def task_julia(depends_on=Path("data.txt"), produces=Path("out.txt")):
+    pass
+"""
+
+
+def _create_project(tmp_path, prewarm=1):
+    tmp_path.joinpath("task_python.py").write_text(_PYTHON_TASK_SOURCE)
+    tmp_path.joinpath("task_example.py").write_text(_TASK_SOURCE)
+    tmp_path.joinpath("script.jl").write_text(
+        'Path(config["produces"]).write_text(Path(config["depends_on"]).read_text())'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f"[tool.pytask.ini_options]\njulia_prewarm = {prewarm}"
+    )
+
+
+@needs_posix_shell
+def test_run_script_in_prewarmed_process(tmp_path, fake_julia):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "data"
+    (arguments,) = (
+        path_to_julia.parent.joinpath("processes.txt").read_text().splitlines()
+    )
+    assert arguments.endswith("session.jl transient")
+    requests = path_to_julia.parent.joinpath("requests.txt").read_text().splitlines()
+    assert requests == ["load", "run"]
+
+
+@needs_posix_shell
+def test_unused_prewarmed_process_is_stopped(tmp_path, fake_julia):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.OK
+
+    # Only the Python task is executed again and the Julia task is unchanged.
+    tmp_path.joinpath("task_python.py").write_text(_PYTHON_TASK_SOURCE + "\n")
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    outcomes = {
+        report.task.name.rsplit("::", 1)[1]: report.outcome
+        for report in session.execution_reports
+    }
+    assert outcomes["task_julia"] == TaskOutcome.SKIP_UNCHANGED
+    processes = path_to_julia.parent.joinpath("processes.txt").read_text().splitlines()
+    assert len(processes) == 2  # noqa: PLR2004
+    requests = path_to_julia.parent.joinpath("requests.txt").read_text().splitlines()
+    assert requests.count("run") == 1
+
+
+@needs_posix_shell
+def test_prewarm_is_disabled_by_default(tmp_path, fake_julia):
+    path_to_julia = fake_julia(
+        'echo "$@" >> "$(dirname "$0")/processes.txt"\n'
+        'echo data > "$(dirname "$last")/../../out.txt"'
+    )
+    _create_project(tmp_path)
+    tmp_path.joinpath("pyproject.toml").unlink()
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    (arguments,) = (
+        path_to_julia.parent.joinpath("processes.txt").read_text().splitlines()
+    )
+    assert "session.jl" not in arguments
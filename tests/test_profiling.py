@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import textwrap
+
+from pytask import ExitCode
+from pytask import cli
+
+from pytask_julia.profiling import read_folded_stacks
+from pytask_julia.profiling import summarize_profiles
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+
+
+def test_read_folded_stacks(tmp_path):
+    path = tmp_path.joinpath("profile.folded")
+    path.write_text("main;f 3\nmain;f;g 2\nmain;f 1\n\nbroken line\n")
+
+    result = read_folded_stacks(path)
+
+    assert result == {("main", "f"): 4, ("main", "f", "g"): 2}
+
+
+def test_summarize_profiles(tmp_path):
+    tmp_path.joinpath("a.folded").write_text("main;f 3\nmain;f;g 1\n")
+    tmp_path.joinpath("b.folded").write_text("main;g;g 4\n")
+
+    result = summarize_profiles(
+        {"a": tmp_path.joinpath("a.folded"), "b": tmp_path.joinpath("b.folded")}
+    )
+
+    assert [stats.frame for stats in result] == ["g", "f", "main"]
+    g, f, main = result
+    assert (g.self_samples, g.total_samples, g.tasks) == (5, 5, {"a", "b"})
+    assert (f.self_samples, f.total_samples, f.tasks) == (3, 4, {"a"})
+    assert (main.self_samples, main.total_samples) == (0, 8)
+
+
+@needs_julia
+def test_run_jl_script_w_profile(runner, tmp_path):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script="script.jl", project="{ROOT.as_posix()}")
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+
+    julia_script = """
+    import JSON; config = JSON.parse(read(ARGS[1], String))
+    function busy(n)
+        s = 0.0
+        for i in 1:n
+            s += sin(i)
+        end
+        return s
+    end
+    write(config["produces"], string(busy(50_000_000)))
+    """
+    tmp_path.joinpath("script.jl").write_text(textwrap.dedent(julia_script))
+
+    result = runner.invoke(cli, [tmp_path.as_posix(), "--julia-profile"])
+
+    assert result.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").exists()
+    assert "Hottest frames in Julia tasks" in result.output
+    assert list(tmp_path.joinpath(".pytask", "pytask-julia").glob("*.folded"))
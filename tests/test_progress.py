@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from pytask import ExitCode
+from pytask import cli
+
+from pytask_julia.collect import run_jl_script
+from pytask_julia.progress import Progress
+from pytask_julia.progress import ProgressMonitor
+from pytask_julia.progress import is_stalled
+from pytask_julia.progress import read_channel
+from tests.conftest import ROOT
+from tests.conftest import create_execution_settings
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+
+def test_read_channel(tmp_path):
+    path = tmp_path.joinpath("task.channel")
+    path.write_text(
+        "1.0\tprogress\t0.25\tseed 1\n"
+        "2.0\tmetric\tloss\t0.5\n"
+        "3.0\theartbeat\n"
+        "4.0\tprogress\t0.5"
+    )
+
+    progress = read_channel(path, Progress())
+
+    assert (progress.fraction, progress.message) == (0.25, "seed 1")
+    assert (progress.metrics, progress.last_message) == ({"loss": "0.5"}, 3.0)
+    assert progress.format() == "running 25% seed 1 loss=0.5"
+
+    # The incomplete line is consumed once it is finished.
+    with path.open("a") as f:
+        f.write("\tseed 2\n")
+    progress = read_channel(path, progress)
+
+    assert (progress.fraction, progress.message) == (0.5, "seed 2")
+    assert progress.offset == path.stat().st_size
+
+
+def test_read_missing_channel(tmp_path):
+    progress = read_channel(tmp_path.joinpath("task.channel"), Progress())
+    assert progress == Progress()
+
+
+def test_monitor_reports_messages_after_the_last_poll(tmp_path, capsys):
+    class _Task:
+        name = "task_julia"
+        signature = "abc"
+
+    path = tmp_path.joinpath("task.channel")
+    monitor = ProgressMonitor()
+    monitor.add(_Task(), path)  # ty: ignore[invalid-argument-type]
+
+    # The script sends its last message after the last poll and exits.
+    path.write_text("1.0\tprogress\t1.0\tdone\n")
+    monitor.remove(_Task())  # ty: ignore[invalid-argument-type]
+
+    assert "task_julia running 100% done" in capsys.readouterr().out
+    assert monitor.running_tasks == {}
+
+
+def test_is_stalled(tmp_path):
+    path = tmp_path.joinpath("task.channel")
+    assert not is_stalled(path, 1)
+
+    path.write_text("1.0\theartbeat\n")
+    assert not is_stalled(path, None)
+    assert not is_stalled(path, 60)
+
+    past = time.time() - 120
+    os.utime(path, (past, past))
+    assert is_stalled(path, 60)
+
+
+@needs_posix_shell
+def test_run_jl_script_stops_stalled_script(tmp_path, fake_julia):
+    fake_julia(
+        """
+        printf '0\\theartbeat\\n' > "${last%.json}.channel"
+        sleep 30
+        """
+    )
+
+    with pytest.raises(RuntimeError, match="did not send any message"):
+        run_jl_script(
+            _script=Path("script.jl"),
+            _options=[],
+            _serialized=tmp_path.joinpath("task.json"),
+            _project=[],
+            _settings=create_execution_settings(stall_timeout=0.1),
+        )
+
+
+@needs_julia
+def test_run_jl_script_w_progress(runner, tmp_path):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script="script.jl", project="{ROOT.as_posix()}")
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+
+    julia_script = """
+    import JSON; config = JSON.parse(read(ARGS[1], String))
+    using PytaskJulia
+    for i in 1:1_000
+        progress(config, i / 1_000; message = "step $i")
+    end
+    metric(config, "loss", 0.1)
+    PytaskJulia.close_channels()
+    write(config["produces"], read(config["_channel"], String))
+    """
+    tmp_path.joinpath("script.jl").write_text(textwrap.dedent(julia_script))
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    progress = Progress()
+    progress.update(tmp_path.joinpath("out.txt").read_text().splitlines()[-2])
+    assert progress.fraction == 1.0
+    assert progress.message == "step 1000"
+
+
+@needs_julia
+def test_throttled_messages_are_flushed_while_script_runs(runner, tmp_path):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script="script.jl", project="{ROOT.as_posix()}")
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+
+    julia_script = """
+    import JSON; config = JSON.parse(read(ARGS[1], String))
+    using PytaskJulia
+    progress(config, 0.5; message = "first")
+    progress(config, 1.0; message = "second")
+    sleep(1)
+    write(config["produces"], read(config["_channel"], String))
+    """
+    tmp_path.joinpath("script.jl").write_text(textwrap.dedent(julia_script))
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    progress = Progress()
+    progress.update(tmp_path.joinpath("out.txt").read_text().splitlines()[-1])
+    assert progress.message == "second"
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import NodeNotFoundError
+from pytask import PythonNode
+from pytask import build
+
+from pytask_julia.results import get_result_nodes
+from pytask_julia.results import save_results
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+# The fake julia stores the results given as TOML in the results of the task.
+_FAKE_JULIA = """
+"{executable}" -c "
+import json, sys
+from pathlib import Path
+config = json.load(open(sys.argv[1]))
+Path(config['_results']).write_text(sys.argv[2])
+" "$last" '{results}'
+"""
+
+_TASK_SOURCE = """
+import pytask
+from pathlib import Path
+from typing import Annotated
+from pytask import Product
+from pytask import PythonNode
+
+node = PythonNode(name="fit")
+
+@pytask.mark.julia(script=Path("script.jl"))
+def task_julia(fit: Annotated[PythonNode, Product] = node):
+    pass
+
+def task_report(
+    fit: Annotated[dict, node], path: Annotated[Path, Product] = Path("report.txt")
+):
+    path.write_text(f"{fit['mean']} {fit['converged']}")
+"""
+
+
+def _create_project(tmp_path, source=_TASK_SOURCE):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("script.jl").touch()
+
+
+@needs_posix_shell
+def test_results_are_passed_to_downstream_tasks(tmp_path, fake_julia):
+    fake_julia(
+        _FAKE_JULIA.format(
+            executable=sys.executable, results="fit = {mean = 0.5, converged = true}"
+        )
+    )
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("report.txt").read_text() == "0.5 True"
+
+
+@needs_posix_shell
+def test_results_from_return_annotation(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA.format(executable=sys.executable, results="return = 3"))
+    source = """
+    import pytask
+    from pathlib import Path
+    from typing import Annotated
+    from pytask import Product
+    from pytask import PythonNode
+
+    node = PythonNode(name="n_iterations", hash=True)
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_julia() -> Annotated[int, node]:
+        pass
+
+    def task_report(
+        n: Annotated[int, node], path: Annotated[Path, Product] = Path("report.txt")
+    ):
+        path.write_text(str(n + 1))
+    """
+    _create_project(tmp_path, source)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("report.txt").read_text() == "4"
+
+
+@needs_posix_shell
+def test_missing_result_fails(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA.format(executable=sys.executable, results="other = 1"))
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    exc_info = session.execution_reports[0].exc_info
+    assert exc_info is not None
+    assert isinstance(exc_info[1], NodeNotFoundError)
+    assert "'fit'" in str(exc_info[1])
+
+
+@pytest.mark.parametrize(
+    "annotation",
+    [
+        'dict, {"a": PythonNode(name="a"), "b": PythonNode(name="b")}',
+        'tuple[int, int], (PythonNode(name="a"), PythonNode(name="b"))',
+    ],
+)
+def test_container_return_annotation_fails_at_collection(
+    tmp_path, fake_julia, annotation
+):
+    fake_julia("")
+    source = f"""
+    import pytask
+    from pathlib import Path
+    from typing import Annotated
+    from pytask import PythonNode
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_julia() -> Annotated[{annotation}]:
+        pass
+    """
+    _create_project(tmp_path, source)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.COLLECTION_FAILED
+    exc_info = session.collection_reports[0].exc_info
+    assert exc_info is not None
+    assert "must be a single PythonNode" in str(exc_info[1])
+
+
+def test_save_results_in_nested_products(tmp_path):
+    mean = PythonNode()
+    returned = PythonNode()
+
+    class _Task:
+        name = "task_julia"
+        produces = {  # noqa: RUF012
+            "produces": {"mean": mean, "data": object()},
+            "return": returned,
+        }
+
+    task = _Task()
+    path = tmp_path / "task.results.toml"
+    path.write_text('"produces.mean" = 1.5\nreturn = [1, 2]\n')
+
+    assert set(get_result_nodes(task)) == {"produces.mean", "return"}  # ty: ignore[invalid-argument-type]
+    save_results(task, path)  # ty: ignore[invalid-argument-type]
+
+    assert mean.value == 1.5  # noqa: PLR2004
+    assert returned.value == [1, 2]
+
+
+@needs_julia
+def test_run_jl_script_w_results(tmp_path):
+    source = f"""
+    import pytask
+    from pathlib import Path
+    from typing import Annotated
+    from pytask import Product
+    from pytask import PythonNode
+
+    node = PythonNode(name="fit")
+
+    @pytask.mark.julia(script=Path("script.jl"), project="{ROOT.as_posix()}")
+    def task_julia(fit: Annotated[PythonNode, Product] = node):
+        pass
+
+    def task_report(
+        fit: Annotated[dict, node], path: Annotated[Path, Product] = Path("report.txt")
+    ):
+        path.write_text(f"{{fit['mean']}} {{fit['converged']}}")
+    """
+    _create_project(tmp_path, source)
+    tmp_path.joinpath("script.jl").write_text(
+        textwrap.dedent(
+            """
+            import JSON; config = JSON.parse(read(ARGS[1], String))
+            using PytaskJulia
+            result(config, "fit", Dict("mean" => 0.5, "converged" => true))
+            """
+        )
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("report.txt").read_text() == "0.5 True"
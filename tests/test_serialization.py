@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+from pytask_julia.serialization import SERIALIZERS
+from pytask_julia.serialization import dumps_toml
+from pytask_julia.serialization import serialize_keyword_arguments
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+def test_toml_is_a_serializer():
+    assert SERIALIZERS["toml"] == {"serializer": dumps_toml, "suffix": ".toml"}
+
+
+def test_dumps_toml_round_trip(tmp_path):
+    kwargs = {
+        "produces": str(tmp_path / "out.txt"),
+        "depends_on": {"a": "in_1.txt", "nested": ["in_2.txt", 'quote " and \\']},
+        "_shard": 1,
+        "alpha": 0.5,
+        "flag": True,
+        "empty": {},
+        "missing": None,
+        "text": "line\nbreak\ttab é",
+        "non_bmp": "emoji 😀 and 𝄞",
+        "control": "bell \a and delete \x7f",
+        "dotted.key": "value",
+    }
+    path = tmp_path / "args.toml"
+
+    serialize_keyword_arguments("toml", path, kwargs)
+
+    loaded = tomllib.loads(path.read_text(encoding="utf-8"))
+    assert loaded == {k: v for k, v in kwargs.items() if k != "missing"}
+
+
+def test_dumps_toml_special_floats():
+    loaded = tomllib.loads(dumps_toml({"a": math.inf, "b": -math.inf, "c": math.nan}))
+
+    assert loaded["a"] == math.inf
+    assert loaded["b"] == -math.inf
+    assert math.isnan(loaded["c"])
+
+
+def test_dumps_toml_converts_paths():
+    assert tomllib.loads(dumps_toml({"path": Path("out.txt")})) == {"path": "out.txt"}
+
+
+def test_dumps_toml_fails_for_unknown_types():
+    with pytest.raises(TypeError, match=r"'value\.a' of type object is not TOML"):
+        dumps_toml({"value": {"a": object()}})
+
+
+def test_dumps_toml_fails_for_none_in_list():
+    with pytest.raises(TypeError, match=r"'value\[1\]' is None.*TOML has no null"):
+        dumps_toml({"value": [1, None]})
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import TaskOutcome
+from pytask import build
+
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+# The fake session executes the scripts as Python code with a minimal keep and take.
+_FAKE_JULIA = f"""
+echo started >> "$(dirname "$0")/sessions.txt"
+cat > "$(dirname "$0")/session.py" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+objects = {{}}
+for line in sys.stdin:
+    command, *args = line.rstrip("\\n").split("\\t")
+    if command == "run":
+        config = json.loads(Path(args[1]).read_text())
+        kept = []
+
+        def keep(name, value):
+            objects[config[name]] = value
+            kept.append(config[name])
+
+        def take(name):
+            path = config[name]
+            return objects[path] if path in objects else Path(path).read_text()
+
+        try:
+            exec(
+                Path(args[0]).read_text(),
+                {{"Path": Path, "config": config, "keep": keep, "take": take}},
+            )
+        except Exception as e:
+            print("error", repr(e), sep="\\t", flush=True)
+        else:
+            print("ok", *kept, sep="\\t", flush=True)
+    elif command == "spill":
+        Path(args[0]).write_text(objects[args[0]])
+        print("ok", flush=True)
+EOF
+exec "{sys.executable}" "$(dirname "$0")/session.py"
+"""
+
+_TASK_SOURCE = """
+import pytask
+from pathlib import Path
+from pytask_julia import JuliaObjectNode
+
+@pytask.mark.julia(script=Path("produce.jl"))
+def task_produce(produces=JuliaObjectNode(path=Path("object.txt"))):
+    pass
+
+@pytask.mark.julia(script=Path("consume.jl"))
+def task_consume(
+    depends_on=JuliaObjectNode(path=Path("object.txt")), produces=Path("out.txt")
+):
+    pass
+"""
+
+
+def _create_project(tmp_path, task_source=_TASK_SOURCE):
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("produce.jl").write_text('keep("produces", "object")')
+    tmp_path.joinpath("consume.jl").write_text(
+        'Path(config["produces"]).write_text(take("depends_on") + " in memory: "'
+        ' + str(not Path(config["depends_on"]).exists()))'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_session = true"
+    )
+
+
+@needs_posix_shell
+def test_objects_stay_in_session(tmp_path, fake_julia):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "object in memory: True"
+    assert tmp_path.joinpath("object.txt").read_text() == "object"
+    sessions = path_to_julia.parent.joinpath("sessions.txt")
+    assert sessions.read_text().splitlines() == ["started"]
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert all(
+        report.outcome == TaskOutcome.SKIP_UNCHANGED
+        for report in session.execution_reports
+    )
+
+
+@needs_posix_shell
+def test_objects_are_written_for_python_tasks(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    task_source = """
+    import pytask
+    from pathlib import Path
+    from pytask_julia import JuliaObjectNode
+
+    @pytask.mark.julia(script=Path("produce.jl"))
+    def task_produce(produces=JuliaObjectNode(path=Path("object.txt"))):
+        pass
+
+    def task_copy(
+        path=JuliaObjectNode(path=Path("object.txt")), produces=Path("copy.txt")
+    ):
+        produces.write_text(path.read_text())
+    """
+    _create_project(tmp_path, task_source)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("copy.txt").read_text() == "object"
+
+
+@needs_posix_shell
+def test_failing_script_in_session(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+    tmp_path.joinpath("produce.jl").write_text("raise ValueError('broken')")
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.FAILED
+    exc_info = session.execution_reports[0].exc_info
+    assert exc_info is not None
+    exception = exc_info[1]
+    assert isinstance(exception, RuntimeError)
+    assert "broken" in str(exception)
+
+
+@needs_posix_shell
+@pytest.mark.parametrize(
+    "setting", ["julia_capture_logs = true", "julia_stall_timeout = 60"]
+)
+def test_session_is_disabled_for_features_which_need_own_process(
+    tmp_path, fake_julia, setting
+):
+    # The fake julia does not serve sessions, so the task only succeeds in a process.
+    fake_julia('echo done > "$(dirname "$last")/../../out.txt"')
+    source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f"[tool.pytask.ini_options]\njulia_session = true\n{setting}"
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "done\n"
+
+
+@needs_julia
+def test_objects_stay_in_session_with_julia(tmp_path):
+    _create_project(tmp_path)
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f'[tool.pytask.ini_options]\njulia_session = true\njulia_project = "{ROOT}"'
+    )
+    tmp_path.joinpath("produce.jl").write_text(
+        "import JSON; config = JSON.parse(read(ARGS[1], String))\n"
+        "using PytaskJulia\n"
+        'keep(config, "produces", "object"; write = write)\n'
+    )
+    tmp_path.joinpath("consume.jl").write_text(
+        "import JSON; config = JSON.parse(read(ARGS[1], String))\n"
+        "using PytaskJulia\n"
+        'object = take(config, "depends_on"; read = path -> read(path, String))\n'
+        'in_memory = isfile(config["depends_on"]) ? "False" : "True"\n'
+        'write(config["produces"], "$object in memory: $in_memory")\n'
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "object in memory: True"
+    assert tmp_path.joinpath("object.txt").read_text() == "object"
+
+
+@needs_julia
+def test_program_file_is_set_in_session(tmp_path):
+    source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("script.jl").write_text(
+        "import JSON; config = JSON.parse(read(ARGS[1], String))\n"
+        'write(config["produces"], string(abspath(PROGRAM_FILE) == @__FILE__))\n'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f'[tool.pytask.ini_options]\njulia_session = true\njulia_project = "{ROOT}"'
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "true"
+
+
+@needs_julia
+def test_scripts_can_include_files_and_eval_in_session(tmp_path):
+    source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(source))
+    tmp_path.joinpath("helpers.jl").write_text('greet() = "hello"\n')
+    tmp_path.joinpath("script.jl").write_text(
+        "import JSON; config = JSON.parse(read(ARGS[1], String))\n"
+        'include("helpers.jl")\n'
+        'eval(:(name = "world"))\n'
+        'write(config["produces"], "$(greet()) $name")\n'
+    )
+    tmp_path.joinpath("pyproject.toml").write_text(
+        f'[tool.pytask.ini_options]\njulia_session = true\njulia_project = "{ROOT}"'
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out.txt").read_text() == "hello world"
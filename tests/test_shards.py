@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+from pytask import ExitCode
+from pytask import build
+from pytask import cli
+
+from tests.conftest import ROOT
+from tests.conftest import needs_julia
+from tests.conftest import needs_posix_shell
+
+_FAKE_JULIA = f"""
+"{sys.executable}" - "$last" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+config = json.loads(Path(sys.argv[1]).read_text())
+if "_shard_products" in config:
+    parts = [Path(p["produces"]).read_text() for p in config["_shard_products"]]
+    Path(config["merged"]).write_text(" ".join(parts))
+else:
+    text = f"{{config['_shard']}}/{{config['_n_shards']}}"
+    Path(config["produces"]).write_text(text)
+EOF
+"""
+
+
+@needs_posix_shell
+def test_sharded_task_with_merge(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    task_source = """
+    import pytask
+    from pathlib import Path
+    from pytask import Product
+    from typing import Annotated
+
+    @pytask.mark.julia(script=Path("script.jl"), shards=3, merge=Path("merge.jl"))
+    def task_run_jl_script(
+        produces=Path("out-{shard}.txt"),
+        merged: Annotated[Path, Product] = Path("merged.txt"),
+    ):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("merge.jl").touch()
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert [task.name.rsplit("::")[-1] for task in session.tasks] == [
+        "task_run_jl_script[shard-0]",
+        "task_run_jl_script[shard-1]",
+        "task_run_jl_script[shard-2]",
+        "task_run_jl_script[merge]",
+    ]
+    assert tmp_path.joinpath("out-1.txt").read_text() == "1/3"
+    assert tmp_path.joinpath("merged.txt").read_text() == "0/3 1/3 2/3"
+
+
+@needs_posix_shell
+def test_sharded_task_without_merge(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"), shards=2)
+    def task_run_jl_script(produces=Path("out-{shard}.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out-0.txt").read_text() == "0/2"
+    assert tmp_path.joinpath("out-1.txt").read_text() == "1/2"
+
+
+@needs_posix_shell
+def test_products_of_shards_need_placeholder(runner, tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"), shards=2)
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.COLLECTION_FAILED
+    assert "do not contain '{shard}'" in result.output
+
+
+@needs_julia
+def test_sharded_task_with_julia(runner, tmp_path):
+    task_source = f"""
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(
+        script=Path("script.jl"), project="{ROOT.as_posix()}", shards=2
+    )
+    def task_run_jl_script(produces=Path("out-{{shard}}.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+
+    julia_script = """
+    import JSON; config = JSON.parse(read(ARGS[1], String))
+    using PytaskJulia
+    write(config["produces"], join(shard(config, 1:5), " "))
+    """
+    tmp_path.joinpath("script.jl").write_text(textwrap.dedent(julia_script))
+
+    result = runner.invoke(cli, [tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert tmp_path.joinpath("out-0.txt").read_text() == "1 3 5"
+    assert tmp_path.joinpath("out-1.txt").read_text() == "2 4"
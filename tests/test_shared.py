@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import os
+import stat
+import tempfile
 from contextlib import ExitStack as does_not_raise  # noqa: N813
 
 import pytest
 
+from pytask_julia.shared import get_path_to_temporary_folder
 from pytask_julia.shared import julia
+from pytask_julia.shared import try_lock
 
 
 @pytest.mark.parametrize(
@@ -20,7 +25,7 @@ from pytask_julia.shared import julia
                 "project": "some_path",
             },
             does_not_raise(),
-            ("script.jl", ["--option"], "json", ".json", "some_path"),
+            ("script.jl", ["--option"], "json", ".json", "some_path", None, None, None),
         ),
         (
             (),
@@ -32,7 +37,13 @@ from pytask_julia.shared import julia
                 "project": "some_path",
             },
             does_not_raise(),
-            ("script.jl", ["1"], "yaml", ".yaml", "some_path"),
+            ("script.jl", ["1"], "yaml", ".yaml", "some_path", None, None, None),
+        ),
+        (
+            (),
+            {"script": "script.jl", "shards": 4, "merge": "merge.jl"},
+            does_not_raise(),
+            ("script.jl", [], None, None, None, 4, "merge.jl", None),
         ),
     ],
 )
@@ -40,3 +51,33 @@ def test_julia(args, kwargs, expectation, expected):
     with expectation:
         result = julia(*args, **kwargs)
         assert result == expected
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="Needs user ids.")
+def test_temporary_folder_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    tmp_path.joinpath(f"pytask-julia-{os.getuid()}").mkdir(mode=0o755)
+
+    path = get_path_to_temporary_folder()
+
+    assert path == tmp_path / f"pytask-julia-{os.getuid()}"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o700  # noqa: PLR2004
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="Needs user ids.")
+def test_temporary_folder_must_not_be_a_symlink(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    tmp_path.joinpath("other").mkdir()
+    tmp_path.joinpath(f"pytask-julia-{os.getuid()}").symlink_to(tmp_path / "other")
+
+    with pytest.raises(PermissionError, match="not a folder owned by the current"):
+        get_path_to_temporary_folder()
+
+
+def test_try_lock(tmp_path):
+    path = tmp_path / "slot.lock"
+    with path.open("ab") as first, path.open("ab") as second:
+        assert try_lock(first)
+        assert not try_lock(second)
+    with path.open("ab") as third:
+        assert try_lock(third)
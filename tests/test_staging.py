@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import errno
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+from pytask import ExitCode
+from pytask import PathNode
+from pytask import PythonNode
+from pytask import Task
+from pytask import build
+
+from pytask_julia import staging
+from pytask_julia.staging import get_path_to_stage
+from pytask_julia.staging import remove_stage
+from pytask_julia.staging import stage_task
+from pytask_julia.staging import unstage_products
+from tests.conftest import needs_posix_shell
+
+
+def _create_task(tmp_path):
+    for name, content in (("a.txt", "a" * 10), ("b.txt", "b" * 10)):
+        tmp_path.joinpath(name).write_text(content)
+    return Task(
+        base_name="task_example",
+        path=tmp_path / "task_example.py",
+        function=lambda: None,
+        depends_on={
+            "_script": PathNode(path=tmp_path / "script.jl"),
+            "inputs": [
+                PathNode(path=tmp_path / "a.txt"),
+                PathNode(path=tmp_path / "b.txt"),
+            ],
+            "value": PythonNode(value=1),
+        },
+        produces={"produces": PathNode(path=tmp_path / "out" / "out.txt")},
+    )
+
+
+def test_stage_and_unstage_task(tmp_path):
+    task = _create_task(tmp_path)
+    serialized = tmp_path / "serialized.json"
+
+    staged = stage_task(task, serialized, tmp_path / "scratch", max_size=None)
+
+    assert set(staged) == {
+        tmp_path / "a.txt",
+        tmp_path / "b.txt",
+        tmp_path / "out" / "out.txt",
+    }
+    assert all(path.is_relative_to(tmp_path / "scratch") for path in staged.values())
+    assert staged[tmp_path / "a.txt"].read_text() == "a" * 10
+
+    staged[tmp_path / "out" / "out.txt"].write_text("done")
+    unstage_products(serialized)
+    assert tmp_path.joinpath("out", "out.txt").read_text() == "done"
+
+    remove_stage(serialized)
+    assert not get_path_to_stage(serialized).exists()
+    assert not tmp_path.joinpath("scratch", "serialized").exists()
+
+
+def test_stage_task_copies_up_to_max_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(staging, "_try_link", lambda source, target: False)  # noqa: ARG005
+    task = _create_task(tmp_path)
+
+    staged = stage_task(task, tmp_path / "serialized.json", tmp_path / "scratch", 15)
+
+    assert tmp_path / "a.txt" in staged
+    assert tmp_path / "b.txt" not in staged
+
+
+def test_unstage_products_across_devices(tmp_path, monkeypatch):
+    replace = Path.replace
+
+    def _replace(self, target):
+        if self.is_relative_to(tmp_path / "scratch"):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return replace(self, target)
+
+    task = _create_task(tmp_path)
+    serialized = tmp_path / "serialized.json"
+    staged = stage_task(task, serialized, tmp_path / "scratch", max_size=None)
+    staged[tmp_path / "out" / "out.txt"].write_text("done")
+
+    monkeypatch.setattr(Path, "replace", _replace)
+    unstage_products(serialized)
+
+    assert tmp_path.joinpath("out", "out.txt").read_text() == "done"
+    assert list(tmp_path.joinpath("out").iterdir()) == [tmp_path / "out" / "out.txt"]
+
+
+_FAKE_JULIA = f"""
+"{sys.executable}" - "$last" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+config = json.loads(Path(sys.argv[1]).read_text())
+assert Path(config["depends_on"]).read_text() == "input"
+Path(config["produces"]).write_text(config["depends_on"] + " " + config["produces"])
+EOF
+"""
+
+
+@needs_posix_shell
+def test_run_jl_script_w_scratch(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(
+        depends_on=Path("in.txt"), produces=Path("out.txt")
+    ):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath("in.txt").write_text("input")
+    tmp_path.joinpath("pyproject.toml").write_text(
+        '[tool.pytask.ini_options]\njulia_scratch = "scratch"'
+    )
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    depends_on, produces = tmp_path.joinpath("out.txt").read_text().split()
+    assert Path(depends_on).is_relative_to(tmp_path / "scratch")
+    assert Path(produces).is_relative_to(tmp_path / "scratch")
+    assert list(tmp_path.joinpath("scratch").iterdir()) == []
+    assert not list(tmp_path.joinpath(".pytask", "pytask-julia").glob("*.stage.json"))
+
+
+def test_invalid_scratch_max_size(tmp_path):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        '[tool.pytask.ini_options]\njulia_scratch_max_size = "1GB"'
+    )
+    session = build(paths=tmp_path)
+    assert session.exit_code == ExitCode.CONFIGURATION_FAILED
+
+
+def test_record_of_staged_products(tmp_path):
+    task = _create_task(tmp_path)
+    serialized = tmp_path / "serialized.json"
+    stage_task(task, serialized, tmp_path / "scratch", max_size=None)
+
+    record = json.loads(get_path_to_stage(serialized).read_text())
+
+    assert [destination for _, destination in record["products"]] == [
+        tmp_path.joinpath("out", "out.txt").as_posix()
+    ]
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import TaskOutcome
+from pytask import build
+
+from pytask_julia.arrow import write_table
+from pytask_julia.tables import read_parameters
+from tests.conftest import needs_posix_shell
+
+
+def test_read_parameters_from_csv(tmp_path):
+    tmp_path.joinpath("parameters.csv").write_text("id,alpha\na,0.5\nb,1.5\n")
+
+    assert read_parameters("parameters.csv", tmp_path) == [
+        {"id": "a", "alpha": "0.5"},
+        {"id": "b", "alpha": "1.5"},
+    ]
+
+
+def test_read_parameters_from_list(tmp_path):
+    rows = [{"alpha": 0.5}]
+    assert read_parameters(rows, tmp_path) is rows
+
+
+@pytest.mark.parametrize("suffix", [".arrow", ".parquet"])
+def test_read_parameters_from_table(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"parameters{suffix}"
+    if suffix == ".arrow":
+        write_table(path, {"alpha": [0.5, 1.5]})
+    else:
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        pq.write_table(pa.table({"alpha": [0.5, 1.5]}), path)
+
+    assert read_parameters(path.name, tmp_path) == [{"alpha": 0.5}, {"alpha": 1.5}]
+
+
+def test_read_parameters_with_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="must be a CSV, Arrow or Parquet file"):
+        read_parameters("parameters.xlsx", tmp_path)
+
+
+# The fake julia writes the serialized arguments into the product.
+_FAKE_JULIA = f"""
+"{sys.executable}" -c "
+import json, shutil, sys
+config = json.load(open(sys.argv[1]))
+shutil.copyfile(sys.argv[1], config['result'])
+" "$last"
+"""
+
+_TASK_TABLE = """
+script = "simulate.jl"
+parameters = [
+    {{ id = "low", alpha = {alpha} }},
+    {{ id = "high", alpha = 1.5 }},
+]
+
+[depends_on]
+data = "data.csv"
+
+[produces]
+result = "result_{{id}}.json"
+"""
+
+
+def _enable_task_tables(tmp_path):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        '[tool.pytask.ini_options]\njulia_task_tables = ["task_*.toml"]'
+    )
+
+
+def _create_project(tmp_path, alpha=0.5):
+    _enable_task_tables(tmp_path)
+    tmp_path.joinpath("task_sweep.toml").write_text(
+        textwrap.dedent(_TASK_TABLE.format(alpha=alpha))
+    )
+    tmp_path.joinpath("simulate.jl").touch()
+    tmp_path.joinpath("data.csv").touch()
+
+
+@needs_posix_shell
+def test_collect_tasks_from_task_table(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert sorted(task.name for task in session.tasks) == [
+        "task_sweep.toml::task_sweep[high]",
+        "task_sweep.toml::task_sweep[low]",
+    ]
+    first, second = session.tasks
+    assert first.depends_on["_script"] is second.depends_on["_script"]
+    assert first.depends_on["data"] is second.depends_on["data"]
+    config = json.loads(tmp_path.joinpath("result_low.json").read_text())
+    assert config["alpha"] == 0.5  # noqa: PLR2004
+    assert config["id"] == "low"
+    assert config["data"] == str(tmp_path / "data.csv")
+
+    _create_project(tmp_path, alpha=0.75)
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    outcomes = {
+        report.task.name.rsplit("::", 1)[1]: report.outcome
+        for report in session.execution_reports
+    }
+    assert outcomes == {
+        "task_sweep[low]": TaskOutcome.SUCCESS,
+        "task_sweep[high]": TaskOutcome.SKIP_UNCHANGED,
+    }
+    config = json.loads(tmp_path.joinpath("result_low.json").read_text())
+    assert config["alpha"] == 0.75  # noqa: PLR2004
+
+
+@needs_posix_shell
+def test_ids_default_to_row_numbers(tmp_path, fake_julia):
+    fake_julia(_FAKE_JULIA)
+    _enable_task_tables(tmp_path)
+    tmp_path.joinpath("task_sweep.toml").write_text(
+        'script = "simulate.jl"\nparameters = "parameters.csv"\n\n'
+        '[produces]\nresult = "result_{id}.json"\n'
+    )
+    tmp_path.joinpath("parameters.csv").write_text("alpha\n0.5\n1.5\n")
+    tmp_path.joinpath("simulate.jl").touch()
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    config = json.loads(tmp_path.joinpath("result_1.json").read_text())
+    assert config["alpha"] == "1.5"
+
+
+@needs_posix_shell
+@pytest.mark.parametrize(
+    ("task_table", "message"),
+    [
+        ('script = "simulate.jl"\nparameters = []\nshards = 2', "unknown keys"),
+        ("parameters = []", "needs a 'script'"),
+        ('script = "simulate.py"\nparameters = []', "must be a Julia file"),
+        (
+            'script = "simulate.jl"\nparameters = [{ id = 1 }, { id = 1 }]',
+            "multiple rows with the id '1'",
+        ),
+        (
+            (
+                'script = "simulate.jl"\nparameters = [{ result = 1 }]\n'
+                '[produces]\nresult = "result.json"'
+            ),
+            "same names as dependencies or products",
+        ),
+    ],
+)
+def test_invalid_task_tables(tmp_path, fake_julia, task_table, message):
+    fake_julia("")
+    _enable_task_tables(tmp_path)
+    tmp_path.joinpath("task_sweep.toml").write_text(task_table)
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.COLLECTION_FAILED
+    report = session.collection_reports[0]
+    assert report.exc_info is not None
+    assert message in str(report.exc_info[1])
+
+
+def test_task_tables_are_not_collected_by_default(tmp_path):
+    tmp_path.joinpath("task_sweep.toml").write_text("invalid")
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert session.config["julia_task_tables"] == []
+
+
+def test_task_tables_can_be_configured(tmp_path):
+    tmp_path.joinpath("pyproject.toml").write_text(
+        '[tool.pytask.ini_options]\njulia_task_tables = ["sweep_*.toml"]'
+    )
+    tmp_path.joinpath("task_sweep.toml").write_text("invalid")
+
+    session = build(paths=tmp_path)
+
+    assert session.exit_code == ExitCode.OK
+    assert session.config["julia_task_tables"] == ["sweep_*.toml"]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import textwrap
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+
+from pytask_julia import tracing
+from pytask_julia.tracing import Span
+from pytask_julia.tracing import Tracer
+from pytask_julia.tracing import get_tracer
+from pytask_julia.tracing import span
+from tests.conftest import needs_posix_shell
+
+
+def test_span_is_no_op_without_tracer():
+    with span("name", key="value") as current:
+        current.set_attribute("other", 1)
+
+    assert not current.is_recording()
+    assert get_tracer() is None
+
+
+def test_export_spans(tmp_path, monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(tracing, "_TRACER", tracer)
+
+    with (
+        span("outer", flag=True, size=1, ratio=0.5, name="x") as outer,
+        pytest.raises(ValueError, match="failed"),
+        span("inner"),
+    ):
+        raise ValueError("failed")  # noqa: EM101
+    tracer.export(tmp_path / "trace.json")
+
+    data = json.loads(tmp_path.joinpath("trace.json").read_text())
+    inner, exported_outer = data["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert inner["name"] == "inner"
+    assert isinstance(outer, Span)
+    assert inner["parentSpanId"] == outer.span_id
+    assert inner["traceId"] == tracer.trace_id
+    assert inner["status"] == {"code": 2, "message": "ValueError: failed"}
+    assert "parentSpanId" not in exported_outer
+    assert exported_outer["status"] == {"code": 1}
+    assert exported_outer["attributes"] == [
+        {"key": "flag", "value": {"boolValue": True}},
+        {"key": "size", "value": {"intValue": "1"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "name", "value": {"stringValue": "x"}},
+    ]
+    assert int(exported_outer["startTimeUnixNano"]) <= int(inner["startTimeUnixNano"])
+
+
+@needs_posix_shell
+def test_trace_julia_task(tmp_path, fake_julia):
+    fake_julia('echo done > "$(dirname "$last")/../../out.txt"')
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").touch()
+
+    session = build(paths=tmp_path, julia_trace="trace.json")
+
+    assert session.exit_code == ExitCode.OK
+    assert get_tracer() is None
+    assert session.config["pm"].get_plugin("pytask_julia_tracing") is None
+    data = json.loads(tmp_path.joinpath("trace.json").read_text())
+    spans = {
+        span["name"]: span
+        for span in data["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    }
+    assert set(spans) == {
+        "pytask_julia.collect",
+        "pytask_julia.setup",
+        "pytask_julia.serialize",
+        "pytask_julia.execute",
+        "pytask_julia.teardown",
+    }
+    assert (
+        spans["pytask_julia.serialize"]["parentSpanId"]
+        == (spans["pytask_julia.setup"]["spanId"])
+    )
+    attributes = {
+        attribute["key"]: attribute["value"]
+        for attribute in spans["pytask_julia.collect"]["attributes"]
+    }
+    assert attributes["pytask_julia.script"] == {
+        "stringValue": str(tmp_path / "script.jl")
+    }
+    assert attributes["pytask_julia.serializer"] == {"stringValue": "json"}
+    assert any(
+        attribute["key"] == "pytask_julia.payload_size"
+        for attribute in spans["pytask_julia.serialize"]["attributes"]
+    )
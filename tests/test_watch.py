@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+from pytask import ExitCode
+from pytask import build
+from pytask import cli
+
+from pytask_julia import watch
+from pytask_julia.sessions import close_sessions
+from pytask_julia.watch import get_watched_files
+from pytask_julia.watch import take_snapshot
+from pytask_julia.watch import wait_for_changes
+from tests.conftest import needs_posix_shell
+
+
+def test_wait_for_changes(tmp_path):
+    path = tmp_path / "script.jl"
+    path.write_text("1")
+    missing = tmp_path / "missing.jl"
+    snapshot = take_snapshot([path, missing])
+    assert snapshot[missing] is None
+
+    def _change():
+        time.sleep(0.1)
+        missing.write_text("2")
+
+    thread = threading.Thread(target=_change)
+    thread.start()
+    changed = wait_for_changes([path, missing], snapshot, interval=0.01)
+    thread.join()
+
+    assert changed == [missing]
+
+
+def test_hidden_files_are_not_watched(tmp_path):
+    tmp_path.joinpath("script.jl").touch()
+    tmp_path.joinpath(".pytask").mkdir()
+    tmp_path.joinpath(".pytask", "serialized.json").touch()
+    tmp_path.joinpath("__pycache__").mkdir()
+    tmp_path.joinpath("__pycache__", "task_example.pyc").touch()
+    session = build(paths=tmp_path)
+
+    files = get_watched_files([tmp_path], session)
+
+    assert files == {tmp_path / "script.jl"}
+
+
+# The fake session records its arguments and runs the scripts as Python code.
+_FAKE_JULIA = f"""
+echo "$@" >> "$(dirname "$0")/sessions.txt"
+cat > "$(dirname "$0")/session.py" <<'EOF'
+import json
+import sys
+from pathlib import Path
+
+for line in sys.stdin:
+    _, script, serialized = line.rstrip("\\n").split("\\t")
+    config = json.loads(Path(serialized).read_text())
+    exec(Path(script).read_text(), {{"Path": Path, "config": config}})
+    print("ok", flush=True)
+EOF
+exec "{sys.executable}" "$(dirname "$0")/session.py"
+"""
+
+
+def _create_project(tmp_path):
+    task_source = """
+    import pytask
+    from pathlib import Path
+
+    @pytask.mark.julia(script=Path("script.jl"))
+    def task_run_jl_script(produces=Path("out.txt")):
+        pass
+    """
+    tmp_path.joinpath("task_example.py").write_text(textwrap.dedent(task_source))
+    tmp_path.joinpath("script.jl").write_text(
+        'Path(config["produces"]).write_text("1")'
+    )
+
+
+@needs_posix_shell
+def test_sessions_stay_alive_between_builds(tmp_path, fake_julia):
+    path_to_julia = fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+    tmp_path.joinpath("pyproject.toml").write_text(
+        "[tool.pytask.ini_options]\njulia_session = false"
+    )
+
+    try:
+        for content in ("1", "2"):
+            tmp_path.joinpath("script.jl").write_text(
+                f'Path(config["produces"]).write_text("{content}")'
+            )
+            session = build(paths=tmp_path, _julia_watch=True)
+            assert session.exit_code == ExitCode.OK
+            assert tmp_path.joinpath("out.txt").read_text() == content
+    finally:
+        close_sessions()
+
+    sessions = path_to_julia.parent.joinpath("sessions.txt").read_text().splitlines()
+    assert len(sessions) == 1
+    assert sessions[0].endswith("session.jl revise")
+
+
+@needs_posix_shell
+def test_watch_julia(runner, tmp_path, fake_julia, monkeypatch):
+    fake_julia(_FAKE_JULIA)
+    _create_project(tmp_path)
+    watched = []
+
+    def _wait_for_changes(files, snapshot, interval):  # noqa: ARG001
+        watched.append(files)
+        if len(watched) == 1:
+            return [tmp_path / "script.jl"]
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch, "wait_for_changes", _wait_for_changes)
+
+    result = runner.invoke(cli, ["watch-julia", tmp_path.as_posix()])
+
+    assert result.exit_code == ExitCode.OK
+    assert "Changed:" in result.output
+    first, second = watched
+    assert tmp_path / "script.jl" in first
+    assert second == first
+    assert tmp_path.joinpath("out.txt").read_text() == "1"
+
+
+@pytest.mark.parametrize("interval", ["0", "-1"])
+def test_watch_julia_with_invalid_interval(runner, interval):
+    result = runner.invoke(cli, ["watch-julia", "--interval", interval])
+
+    assert result.exit_code == 2  # noqa: PLR2004